@@ -0,0 +1,317 @@
+"""Local stand-in for the ThreatConnect Batch API used by the Batch benchmarks.
+
+Usage:
+    python benchmarks/batch_api_stand_in.py --port 8042 --latency 0.05 --job-seconds 1
+
+The stand-in implements just enough of the v2 API for Batch to run end to end:
+
+    GET  /api/v2/types/indicatorTypes           - the default types plus a custom "Hashtag" type
+    GET  /api/v2/types/associationTypes         - no custom associations
+    POST /api/v2/batch                          - create a batch job
+    POST /api/v2/batch/{id}                     - upload the data for a batch job
+    POST /api/v2/batch/createAndUpload          - create a batch job and upload the data
+    GET  /api/v2/batch/{id}                     - the batch status (Completed after job-seconds)
+    GET  /api/v2/batch/{id}/errors              - the errors for a batch job
+    POST /api/v2/groups/{branch}/{xid}/upload   - upload the file for a Document or Report
+
+Every request is delayed by *latency* seconds and a configurable fraction of the entities in
+each job is reported as an error.
+"""
+# standard library
+import argparse
+import json
+import re
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Optional
+
+INDICATOR_TYPES = [
+    {'name': 'Address', 'apiBranch': 'addresses', 'apiEntity': 'address', 'custom': 'false'},
+    {'name': 'ASN', 'apiBranch': 'asns', 'apiEntity': 'asn', 'custom': 'true'},
+    {'name': 'CIDR', 'apiBranch': 'cidrBlocks', 'apiEntity': 'cidrBlock', 'custom': 'true'},
+    {
+        'name': 'EmailAddress',
+        'apiBranch': 'emailAddresses',
+        'apiEntity': 'emailAddress',
+        'custom': 'false',
+    },
+    {'name': 'File', 'apiBranch': 'files', 'apiEntity': 'file', 'custom': 'false'},
+    {
+        'name': 'Hashtag',
+        'apiBranch': 'hashtags',
+        'apiEntity': 'hashtag',
+        'custom': 'true',
+        'parsable': 'true',
+        'value1Label': 'Hashtag',
+        'value1Type': 'text',
+        'regex1': '^#[A-Za-z0-9_]+$',
+    },
+    {'name': 'Host', 'apiBranch': 'hosts', 'apiEntity': 'host', 'custom': 'false'},
+    {'name': 'Mutex', 'apiBranch': 'mutexes', 'apiEntity': 'mutex', 'custom': 'true'},
+    {
+        'name': 'Registry Key',
+        'apiBranch': 'registryKeys',
+        'apiEntity': 'registryKey',
+        'custom': 'true',
+    },
+    {'name': 'URL', 'apiBranch': 'urls', 'apiEntity': 'url', 'custom': 'false'},
+    {'name': 'User Agent', 'apiBranch': 'userAgents', 'apiEntity': 'userAgent', 'custom': 'true'},
+]
+
+
+class BatchApiStandInHandler(BaseHTTPRequestHandler):
+    """Request handler for the BatchApiStandIn server."""
+
+    protocol_version = 'HTTP/1.1'
+    server: 'BatchApiStandIn'
+
+    def _body(self) -> bytes:
+        """Return the request body, reading chunked transfer encoding if required."""
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if size == 0:
+                    # read trailers up to the final empty line
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return bytes(body)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def _content(self, body: bytes) -> dict:
+        """Return the batch content from a multipart createAndUpload body."""
+        message = BytesParser(policy=HTTP).parsebytes(
+            f'Content-Type: {self.headers.get("Content-Type")}\r\n\r\n'.encode() + body
+        )
+        for part in message.iter_parts():
+            if part.get_param('name', header='content-disposition') == 'content':
+                return json.loads(part.get_content())
+        return {}
+
+    def _respond(self, data: object, status: Optional[int] = 200) -> None:
+        """Send a JSON response."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        self.server.delay()
+        path = self.path.split('?')[0]
+        self.server.count('GET', path)
+        match = re.match(r'^/api/v2/batch/(\d+)(/errors)?$', path)
+        if path == '/api/v2/types/indicatorTypes':
+            self._respond(
+                {
+                    'status': 'Success',
+                    'data': {'resultCount': len(INDICATOR_TYPES), 'indicatorType': INDICATOR_TYPES},
+                }
+            )
+        elif path == '/api/v2/types/associationTypes':
+            self._respond({'status': 'Success', 'data': {'resultCount': 0, 'associationType': []}})
+        elif match and match.group(2):
+            self._respond(self.server.job_errors(int(match.group(1))))
+        elif match:
+            status = self.server.job_status(int(match.group(1)))
+            if status is None:
+                self._respond({'status': 'Failure', 'message': 'Batch not found.'}, 404)
+            else:
+                self._respond({'status': 'Success', 'data': {'batchStatus': status}})
+        else:
+            self._respond({'status': 'Failure', 'message': 'Not found.'}, 404)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST requests."""
+        self.server.delay()
+        path = self.path.split('?')[0]
+        body = self._body()
+        self.server.count('POST', path, len(body))
+        match = re.match(r'^/api/v2/batch/(\d+)$', path)
+        if path == '/api/v2/batch':
+            self._respond({'status': 'Success', 'data': {'batchId': self.server.job_create()}})
+        elif path == '/api/v2/batch/createAndUpload':
+            batch_id = self.server.job_create(self._content(body))
+            self._respond(
+                {'status': 'Success', 'data': {'batchStatus': self.server.job_status(batch_id)}}
+            )
+        elif match:
+            batch_id = int(match.group(1))
+            self.server.job_upload(batch_id, json.loads(body or b'{}'))
+            self._respond({'status': 'Queued', 'data': {'batchStatus': {'id': batch_id}}})
+        elif re.match(r'^/api/v2/groups/\w+/[^/]+/upload$', path):
+            self._respond({'status': 'Success'})
+        else:
+            self._respond({'status': 'Failure', 'message': 'Not found.'}, 404)
+
+    do_PUT = do_POST  # noqa: N815
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Do not log requests."""
+
+
+class BatchApiStandIn(ThreadingMixIn, HTTPServer):
+    """A threaded local HTTP server implementing the Batch API endpoints.
+
+    Args:
+        host: The host to listen on.
+        port: The port to listen on, 0 selects a free port.
+        latency: The number of seconds to delay each request.
+        job_seconds: The number of seconds before a batch job is Completed.
+        error_rate: The fraction (0-1) of the entities in each job reported as an error.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: Optional[str] = '127.0.0.1',
+        port: Optional[int] = 0,
+        latency: Optional[float] = 0.0,
+        job_seconds: Optional[float] = 0.0,
+        error_rate: Optional[float] = 0.0,
+    ):
+        """Initialize Class properties."""
+        super().__init__((host, port), BatchApiStandInHandler)
+        self.error_rate = error_rate
+        self.job_seconds = job_seconds
+        self.latency = latency
+
+        # properties
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.bytes_received = 0
+        self.requests = {}  # (method, endpoint) -> count
+
+    def __enter__(self):
+        """Start the server in a background thread."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the server."""
+        self.stop()
+
+    def count(self, method: str, path: str, size: Optional[int] = 0) -> None:
+        """Record a request, replacing ids in the path so requests are grouped by endpoint."""
+        endpoint = re.sub(r'^(/api/v2/batch/)\d+', r'\1{id}', path)
+        endpoint = re.sub(r'^(/api/v2/groups/\w+/)[^/]+', r'\1{xid}', endpoint)
+        with self._lock:
+            self.bytes_received += size
+            self.requests[(method, endpoint)] = self.requests.get((method, endpoint), 0) + 1
+
+    def delay(self) -> None:
+        """Delay the current request by the configured latency."""
+        if self.latency:
+            time.sleep(self.latency)
+
+    def job_create(self, content: Optional[dict] = None) -> int:
+        """Create a batch job, returning the batch id."""
+        with self._lock:
+            batch_id = len(self._jobs) + 1
+            self._jobs[batch_id] = {'errors': [], 'groups': 0, 'indicators': 0, 'ready': None}
+        if content is not None:
+            self.job_upload(batch_id, content)
+        return batch_id
+
+    def job_errors(self, batch_id: int) -> list:
+        """Return the errors for a batch job."""
+        return self._jobs.get(batch_id, {}).get('errors', [])
+
+    def job_status(self, batch_id: int) -> Optional[dict]:
+        """Return the batch status for a batch job."""
+        job = self._jobs.get(batch_id)
+        if job is None:
+            return None
+
+        status = 'Queued'
+        if job.get('ready') is not None:
+            status = 'Completed' if time.time() >= job.get('ready') else 'Running'
+        error_groups = sum(1 for e in job.get('errors') if e.get('type') == 'group')
+        error_indicators = len(job.get('errors')) - error_groups
+        return {
+            'id': batch_id,
+            'status': status,
+            'errorCount': len(job.get('errors')),
+            'errorGroupCount': error_groups,
+            'errorIndicatorCount': error_indicators,
+            'successCount': job.get('groups') + job.get('indicators') - len(job.get('errors')),
+            'successGroupCount': job.get('groups') - error_groups,
+            'successIndicatorCount': job.get('indicators') - error_indicators,
+        }
+
+    def job_upload(self, batch_id: int, content: dict) -> None:
+        """Store the data for a batch job and start processing."""
+        errors = []
+        for entity_type in ['group', 'indicator']:
+            entities = content.get(entity_type) or []
+            step = int(1 / self.error_rate) if self.error_rate else 0
+            for entity in entities[::step] if step else []:
+                name = entity.get('name') or entity.get('summary')
+                errors.append(
+                    {
+                        'errorReason': f'{entity.get("type")} {name} could not be saved.',
+                        'errorSource': f'{entity.get("xid")} is not valid.',
+                        'type': entity_type,
+                    }
+                )
+
+        with self._lock:
+            self._jobs[batch_id].update(
+                {
+                    'errors': errors,
+                    'groups': len(content.get('group') or []),
+                    'indicators': len(content.get('indicator') or []),
+                    'ready': time.time() + self.job_seconds,
+                }
+            )
+
+    def start(self) -> None:
+        """Start the server in a background thread."""
+        self._thread = threading.Thread(
+            name='batch-api-stand-in', target=self.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    @property
+    def url(self) -> str:
+        """Return the API path (tc_api_path) for the server."""
+        return f'http://{self.server_address[0]}:{self.server_address[1]}/api'
+
+
+def main():
+    """Run the stand-in until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1', help='Host to listen on.')
+    parser.add_argument('--port', default=8042, type=int, help='Port to listen on.')
+    parser.add_argument('--latency', default=0.0, type=float, help='Seconds per request.')
+    parser.add_argument('--job-seconds', default=0.0, type=float, help='Seconds per batch job.')
+    parser.add_argument('--error-rate', default=0.0, type=float, help='Fraction of errors.')
+    args = parser.parse_args()
+
+    server = BatchApiStandIn(args.host, args.port, args.latency, args.job_seconds, args.error_rate)
+    print(f'Batch API stand-in listening on {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark Batch chunk assembly (size accounting + upload body) for indicators.
+
+Usage:
+    python benchmarks/batch_chunk_assembly.py --count 1000000
+
+The "before" run replays the previous algorithm, sys.getsizeof(json.dumps(entity)) for every
+entity followed by json.dumps() of the full chunk. The "after" run uses BatchChunk, which encodes
+each entity once and assembles the body from the cached fragments.
+"""
+# standard library
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# first-party
+from tcex.batch.batch_chunk import BatchChunk  # noqa: E402
+
+MAX_CHUNK = 5_000
+MAX_SIZE = 75_000_000
+
+
+def indicators(count: int):
+    """Yield synthetic Address indicator dicts."""
+    for i in range(count):
+        yield {
+            'summary': f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}',
+            'type': 'Address',
+            'xid': f'{i:064x}',
+            'rating': 3.0,
+            'confidence': 50,
+            'associatedGroups': [{'groupXid': f'group-{i % 100}'}],
+            'attribute': [{'type': 'Description', 'value': f'benchmark indicator {i}'}],
+            'tag': [{'name': 'benchmark'}, {'name': f'feed-{i % 10}'}],
+        }
+
+
+def before(count: int) -> int:
+    """Assemble chunks using the previous algorithm, returning the number of chunks."""
+    chunks = 0
+    data = {'group': [], 'indicator': []}
+    size = 0
+    for indicator_data in indicators(count):
+        data['indicator'].append(indicator_data)
+        size += sys.getsizeof(json.dumps(indicator_data))
+        if len(data['indicator']) >= MAX_CHUNK or size >= MAX_SIZE:
+            json.dumps(data)
+            chunks += 1
+            data = {'group': [], 'indicator': []}
+            size = 0
+    if data['indicator']:
+        json.dumps(data)
+        chunks += 1
+    return chunks
+
+
+def after(count: int) -> int:
+    """Assemble chunks using BatchChunk, returning the number of chunks."""
+    chunks = 0
+    data = BatchChunk()
+    for indicator_data in indicators(count):
+        data.append('indicator', indicator_data)
+        if len(data['indicator']) >= MAX_CHUNK or data.size >= MAX_SIZE:
+            data.json()
+            chunks += 1
+            data = BatchChunk()
+    if data['indicator']:
+        data.json()
+        chunks += 1
+    return chunks
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', default=1_000_000, type=int, help='Number of indicators.')
+    args = parser.parse_args()
+
+    # baseline for generating the synthetic data, subtracted from both results
+    start = time.perf_counter()
+    for _ in indicators(args.count):
+        pass
+    generate = time.perf_counter() - start
+
+    results = {}
+    for name, method in [('before', before), ('after', after)]:
+        start = time.perf_counter()
+        chunks = method(args.count)
+        elapsed = time.perf_counter() - start - generate
+        results[name] = elapsed
+        print(
+            f'{name:>6}: indicators={args.count:,}, chunks={chunks:,}, '
+            f'seconds={elapsed:.2f}, indicators/sec={args.count / elapsed:,.0f}'
+        )
+    print(f'speedup: {results["before"] / results["after"]:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
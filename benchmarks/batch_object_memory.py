@@ -0,0 +1,86 @@
+"""Benchmark the memory footprint of Batch Indicator and Group objects.
+
+Usage:
+    python benchmarks/batch_object_memory.py --count 1000000
+
+For each scenario the objects are created and held in a list while tracemalloc records the
+memory and the number of allocations still held, reported per object along with the time
+taken to create the objects.
+"""
+# standard library
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# first-party
+from tcex.batch.group import Adversary  # noqa: E402
+from tcex.batch.indicator import Address  # noqa: E402
+
+
+def address(i: int) -> Address:
+    """Return an Address indicator with no child objects."""
+    return Address(f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}', xid=f'{i:032x}')
+
+
+def address_tagged(i: int) -> Address:
+    """Return an Address indicator with a rating, confidence, and two tags."""
+    indicator = Address(
+        f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}',
+        confidence=50,
+        rating=3,
+        xid=f'{i:032x}',
+    )
+    indicator.tag('benchmark')
+    indicator.tag(f'feed-{i % 10}')
+    return indicator
+
+
+def adversary(i: int) -> Adversary:
+    """Return an Adversary group with no child objects."""
+    return Adversary(f'adversary-{i}', xid=f'{i:032x}')
+
+
+def measure(factory, count: int) -> dict:
+    """Return the memory, allocations, and time to hold *count* objects."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = [factory(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = snapshot.statistics('filename')
+    size = sum(s.size for s in stats)
+    blocks = sum(s.count for s in stats)
+    del objects
+    return {'blocks': blocks, 'seconds': elapsed, 'size': size}
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', default=1_000_000, type=int, help='Number of objects.')
+    args = parser.parse_args()
+
+    for name, factory in [
+        ('address', address),
+        ('address-tagged', address_tagged),
+        ('adversary', adversary),
+    ]:
+        result = measure(factory, args.count)
+        print(
+            f'{name:>14}: objects={args.count:,}, MiB={result["size"] / 1_048_576:,.1f}, '
+            f'bytes/object={result["size"] / args.count:,.0f}, '
+            f'allocations/object={result["blocks"] / args.count:,.1f}, '
+            f'seconds={result["seconds"]:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark spilling Batch Group and Indicator objects to disk and reloading them.
+
+Usage:
+    python benchmarks/batch_spill.py --entities 1000000
+
+Synthetic groups (Incident) and indicators (Address, File, and Host) with tags, an attribute,
+and a security label are written to the EntityStore used by Batch.save() (the groups/indicators
+shelf) and then read back, materializing the batch data of each entity as Batch.data does.
+Entities are generated in pages so only one page is held in memory. For each phase the
+entities/sec (excluding generation), the size of the store per entity, and the peak RSS are
+reported.
+"""
+# standard library
+import argparse
+import hashlib
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# first-party
+from tcex.batch.entity_store import EntityStore  # noqa: E402
+from tcex.batch.group import Incident  # noqa: E402
+from tcex.batch.indicator import Address, File, Host  # noqa: E402
+
+
+def generate(start: int, count: int, group_ratio: int) -> list:
+    """Return a page of synthetic groups and indicators."""
+    entities = []
+    for i in range(start, start + count):
+        xid = f'entity-{i}'
+        if i % group_ratio == 0:
+            entity = Incident(f'incident-{i}', xid=xid)
+        elif i % 3 == 0:
+            entity = Address(f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}', xid=xid)
+        elif i % 3 == 1:
+            entity = File(sha256=hashlib.sha256(str(i).encode()).hexdigest(), xid=xid)
+        else:
+            entity = Host(f'host-{i}.example.com', xid=xid)
+        entity.tag(f'feed-{i % 10}')
+        entity.tag('benchmark')
+        entity.attribute('Source', f'feed-{i % 10}')
+        entity.security_label('TLP:GREEN')
+        entities.append(entity)
+    return entities
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entities', default=1_000_000, type=int, help='Number of entities.')
+    parser.add_argument('--group-ratio', default=10, type=int, help='One group per N entities.')
+    parser.add_argument('--page-size', default=10_000, type=int, help='Entities per page.')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='tcex-batch-spill-') as temp_path:
+        store = EntityStore(os.path.join(temp_path, 'entities'))
+
+        spill_seconds = 0.0
+        for start in range(0, args.entities, args.page_size):
+            entities = generate(start, min(args.page_size, args.entities - start), args.group_ratio)
+            spill_start = time.perf_counter()
+            for entity in entities:
+                store[entity.xid] = entity
+            store.flush()
+            spill_seconds += time.perf_counter() - spill_start
+
+        store_bytes = sum(
+            os.path.getsize(os.path.join(temp_path, f))
+            for f in os.listdir(temp_path)
+            if f.startswith('entities')
+        )
+
+        reload_start = time.perf_counter()
+        reloaded = 0
+        for _, entity in store.items():
+            entity.data  # pylint: disable=pointless-statement
+            reloaded += 1
+        reload_seconds = time.perf_counter() - reload_start
+        store.delete()
+
+    result = {
+        'entities': args.entities,
+        'reloaded': reloaded,
+        'spill_seconds': spill_seconds,
+        'reload_seconds': reload_seconds,
+        'bytes_per_entity': store_bytes / args.entities,
+        # ru_maxrss is reported in KiB on Linux and bytes on macOS
+        'peak_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / (1_048_576 if sys.platform == 'darwin' else 1_024),
+    }
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(
+        f'entities={result["entities"]:,}, '
+        f'spill-entities/sec={result["entities"] / result["spill_seconds"]:,.0f}, '
+        f'reload-entities/sec={result["reloaded"] / result["reload_seconds"]:,.0f}, '
+        f'spill-seconds={result["spill_seconds"]:.2f}, '
+        f'reload-seconds={result["reload_seconds"]:.2f}, '
+        f'bytes/entity={result["bytes_per_entity"]:,.0f}, '
+        f'peak-RSS-MiB={result["peak_rss_mib"]:,.1f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""Benchmark Batch throughput end to end against a local stand-in for the Batch API.
+
+Usage:
+    python benchmarks/batch_throughput.py --indicators 100000 --groups 10000 --latency 0.05
+
+Synthetic groups (associated in clusters, with Document attachments) and indicators (Address,
+EmailAddress, File hashes, Host, URL, and the custom Hashtag type, each with a tag, attribute,
+and group association) are added to a Batch, which is then submitted to the stand-in API in
+benchmarks/batch_api_stand_in.py. Each scenario runs in its own process so the peak RSS is
+reported per scenario:
+
+    submit_all       Batch.submit_all() with --concurrency jobs in flight
+    submit_callback  Batch.submit_callback() until all data is submitted
+    dump             BatchWriter.dump() to gzip compressed batch JSON files (--output-workers
+                     threads compressing and writing files)
+
+For each scenario the entities/sec (excluding generation), the number of chunks (batch jobs or
+output files), the time spent serializing (chunk assembly for the submit scenarios, encoding
+and compression for dump), the API requests made, and the peak RSS are reported.
+"""
+# standard library
+import argparse
+import hashlib
+import json
+import os
+import resource
+import shutil
+import subprocess  # nosec
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# first-party
+from benchmarks.batch_api_stand_in import BatchApiStandIn  # noqa: E402
+from tcex import TcEx  # noqa: E402
+from tcex.batch import Batch  # noqa: E402
+from tcex.batch.batch_writer import BatchWriter  # noqa: E402
+
+GROUP_TYPES = ['Adversary', 'Campaign', 'Incident', 'Intrusion Set', 'Threat']
+SCENARIOS = ['submit_all', 'submit_callback', 'dump']
+
+
+class TimedBatch(Batch):
+    """Batch that records the time spent assembling chunks."""
+
+    serialize_seconds = 0.0
+
+    @property
+    def data(self):
+        """Return the next chunk, recording the time taken."""
+        start = time.perf_counter()
+        data = Batch.data.fget(self)
+        self.serialize_seconds += time.perf_counter() - start
+        return data
+
+
+class TimedBatchWriter(BatchWriter):
+    """BatchWriter that records the time spent encoding and compressing entities."""
+
+    serialize_seconds = 0.0
+
+    def json_writer(self, max_count=None, max_size=None):
+        """Return a writer that records the time taken by each write."""
+        writer = super().json_writer(max_count, max_size)
+        write = writer.write
+
+        def timed_write(*args, **kwargs):
+            start = time.perf_counter()
+            write(*args, **kwargs)
+            self.serialize_seconds += time.perf_counter() - start
+
+        writer.write = timed_write
+        return writer
+
+
+def generate(batch: Batch, args: argparse.Namespace) -> int:
+    """Add the synthetic groups and indicators to the batch, returning the entity count."""
+    content = os.urandom(args.file_size)
+    for i in range(args.groups):
+        group_type = GROUP_TYPES[i % len(GROUP_TYPES)]
+        group = batch.group(group_type, f'{group_type.lower()}-{i}', xid=f'group-{i}')
+        group.tag(f'feed-{i % 10}')
+        group.attribute('Description', f'benchmark group {i}')
+        if i % args.cluster_size:
+            # associate groups in clusters that must be kept in the same chunk
+            group.association(f'group-{i - 1}')
+
+    for i in range(args.documents):
+        document = batch.document(
+            f'document-{i}', f'document-{i}.bin', file_content=content, xid=f'document-{i}'
+        )
+        if args.groups:
+            document.association(f'group-{i % args.groups}')
+
+    for i in range(args.indicators):
+        digest = hashlib.sha256(str(i).encode()).hexdigest()
+        kind = i % 6
+        if kind == 0:
+            indicator = batch.address(
+                f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}', xid=f'indicator-{i}'
+            )
+        elif kind == 1:
+            indicator = batch.email_address(f'user-{i}@example.com', xid=f'indicator-{i}')
+        elif kind == 2:
+            indicator = batch.file(
+                md5=digest[:32], sha1=digest[:40], sha256=digest, xid=f'indicator-{i}'
+            )
+        elif kind == 3:
+            indicator = batch.host(f'host-{i}.example.com', xid=f'indicator-{i}')
+        elif kind == 4:
+            indicator = batch.url(f'https://example.com/{digest[:16]}', xid=f'indicator-{i}')
+        else:
+            indicator = batch.indicator('Hashtag', f'#tag{i}', xid=f'indicator-{i}')
+        indicator.rating = i % 6
+        indicator.confidence = i % 101
+        indicator.tag(f'feed-{i % 10}')
+        indicator.attribute('Description', f'benchmark indicator {i}')
+        if args.groups:
+            indicator.association(f'group-{i % args.groups}')
+
+    return args.groups + args.documents + args.indicators
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Run a single scenario and return the results."""
+    temp_path = tempfile.mkdtemp(prefix='tcex-batch-benchmark-')
+    with BatchApiStandIn(
+        latency=args.latency, job_seconds=args.job_seconds, error_rate=args.error_rate
+    ) as api:
+        tcex = TcEx(
+            config={
+                'api_access_id': 'benchmark',
+                'api_default_org': 'Benchmark',
+                'api_secret_key': 'benchmark',
+                'tc_api_path': api.url,
+                'tc_in_path': temp_path,
+                'tc_log_file': 'benchmark.log',
+                'tc_log_level': 'info',
+                'tc_log_path': temp_path,
+                'tc_log_to_api': False,
+                'tc_out_path': temp_path,
+                'tc_temp_path': temp_path,
+            }
+        )
+
+        files = []
+        if args.scenario == 'dump':
+            batch = TimedBatchWriter(
+                tcex,
+                temp_path,
+                output_max_count=args.chunk_size,
+                output_workers=args.output_workers,
+                write_callback=files.append,
+            )
+        else:
+            batch = TimedBatch(tcex, 'Benchmark', halt_on_error=False)
+            batch.poller.interval = args.poll_interval
+            batch.submit_concurrency = args.concurrency
+        batch._batch_max_chunk = args.chunk_size  # pylint: disable=protected-access
+
+        start = time.perf_counter()
+        entities = generate(batch, args)
+        generate_seconds = time.perf_counter() - start
+
+        statuses = []
+        start = time.perf_counter()
+        if args.scenario == 'dump':
+            batch.dump()
+        elif args.scenario == 'submit_all':
+            statuses = batch.submit_all()
+            batch.close()
+        else:
+            while batch.submit_callback(statuses.append):
+                pass
+            batch.close()
+        seconds = time.perf_counter() - start
+
+    shutil.rmtree(temp_path, ignore_errors=True)
+    chunks = len(files) or api.requests.get(('POST', '/api/v2/batch/createAndUpload'), 0)
+    return {
+        'scenario': args.scenario,
+        'entities': entities,
+        'chunks': chunks,
+        'errors': sum(s.get('errorCount', 0) for s in statuses),
+        'generate_seconds': generate_seconds,
+        'seconds': seconds,
+        'serialize_seconds': batch.serialize_seconds,
+        'requests': sum(api.requests.values()),
+        'request_mib': api.bytes_received / 1_048_576,
+        # ru_maxrss is reported in KiB on Linux and bytes on macOS
+        'peak_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / (1_048_576 if sys.platform == 'darwin' else 1_024),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', choices=SCENARIOS + ['all'], default='all')
+    parser.add_argument('--indicators', default=100_000, type=int, help='Number of indicators.')
+    parser.add_argument('--groups', default=10_000, type=int, help='Number of groups.')
+    parser.add_argument('--documents', default=100, type=int, help='Number of Documents.')
+    parser.add_argument('--file-size', default=65_536, type=int, help='Document size in bytes.')
+    parser.add_argument('--cluster-size', default=5, type=int, help='Associated group cluster.')
+    parser.add_argument('--chunk-size', default=5_000, type=int, help='Max entities per chunk.')
+    parser.add_argument('--concurrency', default=4, type=int, help='Batch jobs in flight.')
+    parser.add_argument('--latency', default=0.05, type=float, help='Seconds per API request.')
+    parser.add_argument('--job-seconds', default=0.5, type=float, help='Seconds per batch job.')
+    parser.add_argument('--poll-interval', default=1.0, type=float, help='First poll seconds.')
+    parser.add_argument('--error-rate', default=0.001, type=float, help='Fraction of errors.')
+    parser.add_argument('--output-workers', default=1, type=int, help='Dump writer threads.')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+    args = parser.parse_args()
+
+    if args.scenario == 'all':
+        # run each scenario in a new process so the peak RSS is measured per scenario
+        for scenario in SCENARIOS:
+            argv = [a for a in sys.argv[1:] if a != '--json']
+            subprocess.run(  # nosec
+                [sys.executable, os.path.abspath(__file__)] + argv + ['--scenario', scenario],
+                check=True,
+            )
+        return
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(
+        f'{result["scenario"]:>15}: entities={result["entities"]:,}, '
+        f'entities/sec={result["entities"] / result["seconds"]:,.0f}, '
+        f'chunks={result["chunks"]:,}, errors={result["errors"]:,}, '
+        f'seconds={result["seconds"]:.2f}, serialize-seconds={result["serialize_seconds"]:.2f}, '
+        f'generate-seconds={result["generate_seconds"]:.2f}, '
+        f'requests={result["requests"]:,}, request-MiB={result["request_mib"]:,.1f}, '
+        f'peak-RSS-MiB={result["peak_rss_mib"]:,.1f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
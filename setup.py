@@ -59,7 +59,12 @@ setup(
     ],
     description=metadata['__description__'],
     download_url=metadata['__download_url__'],
-    extras_require={'dev': dev_packages, 'develop': dev_packages, 'development': dev_packages},
+    extras_require={
+        'async': ['aiohttp'],
+        'dev': dev_packages,
+        'develop': dev_packages,
+        'development': dev_packages,
+    },
     include_package_data=True,
     install_requires=[
         'colorama>=0.3.9',
@@ -1,6 +1,10 @@
 """ThreatConnect Exchange App Feature Advanced Request Module"""
 # standard library
+import hashlib
 import json
+import os
+import pathlib
+import tempfile
 from argparse import Namespace
 from mimetypes import MimeTypes
 from typing import Dict, List, Optional, Union
@@ -19,6 +23,10 @@ class AdvancedRequest:
         tcex: An instance of Tcex object.
         timeout: The timeout value for the request.
         output_prefix: The prefix for any output variables created with advanced requests.
+        stream: If True, the response is streamed to a temp file (content_file) instead of being
+            read into memory, and the content of the returned response is not available. The
+            temp file is deleted when the outputs are written (see Playbooks.write_output).
+        hash_algorithm: The hashlib algorithm (e.g., sha256) used to hash a streamed response.
     """
 
     def __init__(
@@ -27,6 +35,8 @@ class AdvancedRequest:
         tcex: object,
         timeout: Optional[int] = 600,
         output_prefix: Optional[str] = None,
+        stream: Optional[bool] = False,
+        hash_algorithm: Optional[str] = None,
     ):
         """Initialize class properties."""
         self.output_prefix: str = output_prefix or tcex.ij.output_prefix
@@ -36,13 +46,53 @@ class AdvancedRequest:
         # properties
         self.args: Namespace = tcex.args  # required for ReadArgs
         self.allow_redirects: bool = True
+        self.chunk_size: int = 1024 * 1024
+        self.content_file: Optional[pathlib.Path] = None
+        self.content_hash: Optional[str] = None
         self.data: Optional[Union[dict, str]] = None
+        self.hash_algorithm: Optional[str] = hash_algorithm
         self.headers: dict = {}
         self.max_mb: int = 500
         self.mt: callable = MimeTypes()
         self.params: dict = {}
+        self.stream: bool = stream
         self.timeout: int = timeout or 600
 
+    def _download(self, response: object) -> int:
+        """Stream the response content to a temp file, hashing the content as it is written.
+
+        Args:
+            response: The streamed requests Response object.
+
+        Returns:
+            int: The size of the content in bytes.
+        """
+        digest = hashlib.new(self.hash_algorithm) if self.hash_algorithm else None
+        max_bytes: int = self.max_mb * 1000000
+        response_bytes: int = 0
+
+        fd, filename = tempfile.mkstemp(dir=self.args.tc_temp_path, prefix='advanced-request-')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    response_bytes += len(chunk)
+                    if response_bytes > max_bytes:
+                        raise RuntimeError(
+                            f'Download was larger than maximum supported {self.max_mb} MB.'
+                        )
+                    fh.write(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+        except Exception:
+            os.remove(filename)
+            raise
+        finally:
+            response.close()
+
+        self.content_file = pathlib.Path(filename)
+        self.content_hash = digest.hexdigest() if digest is not None else None
+        return response_bytes
+
     @ReadArg('tc_adv_req_body')
     def configure_body(self, tc_adv_req_body: Union[bytes, str]):
         """Configure Body
@@ -144,6 +194,7 @@ class AdvancedRequest:
                 headers=self.headers,
                 method=tc_adv_req_http_method,
                 params=self.params,
+                stream=self.stream,
                 timeout=self.timeout,
                 url=tc_adv_req_path,
             )
@@ -168,20 +219,36 @@ class AdvancedRequest:
             f'{self.output_prefix}.request.url', response.request.url, 'String'
         )
 
-        # get response size
-        response_bytes: int = len(response.content)
-        response_mb: float = response_bytes / 1000000
-        self.tcex.log.info(f'Response MB: {response_mb}')
-        if response_mb > self.max_mb:  # pragma: no cover
-            raise RuntimeError('Download was larger than maximum supported 500 MB.')
+        if self.stream:
+            # the size is validated while the content is streamed to disk
+            response_bytes: int = self._download(response)
+            self.tcex.log.info(f'Response MB: {response_bytes / 1000000}')
 
-        # write content after size validation
-        self.tcex.playbook.add_output(
-            f'{self.output_prefix}.request.content', response.text, 'String'
-        )
-        self.tcex.playbook.add_output(
-            f'{self.output_prefix}.request.content.binary', response.content, 'Binary'
-        )
+            # the Binary output is a reference to the file, which is encoded directly from disk
+            # and deleted when the outputs are written (the content String output is not written)
+            self.tcex.playbook.add_output(
+                f'{self.output_prefix}.request.content.binary', self.content_file, 'Binary'
+            )
+            self.tcex.playbook.temp_files.append(self.content_file)
+            if self.content_hash is not None:
+                self.tcex.playbook.add_output(
+                    f'{self.output_prefix}.request.content.hash', self.content_hash, 'String'
+                )
+        else:
+            # get response size
+            response_bytes: int = len(response.content)
+            response_mb: float = response_bytes / 1000000
+            self.tcex.log.info(f'Response MB: {response_mb}')
+            if response_mb > self.max_mb:  # pragma: no cover
+                raise RuntimeError(f'Download was larger than maximum supported {self.max_mb} MB.')
+
+            # write content after size validation
+            self.tcex.playbook.add_output(
+                f'{self.output_prefix}.request.content', response.text, 'String'
+            )
+            self.tcex.playbook.add_output(
+                f'{self.output_prefix}.request.content.binary', response.content, 'Binary'
+            )
 
         # fail if fail_on_error is selected and not ok
         if self.args.tc_adv_req_fail_on_error and not response.ok:
@@ -1,13 +1,20 @@
 """ThreatConnect Batch Import Module"""
 # standard library
 import json
+import sys
+from functools import lru_cache
 from typing import Callable, Optional
 
 
 class Attribute:
-    """ThreatConnect Batch Attribute Object"""
+    """ThreatConnect Batch Attribute Object
 
-    __slots__ = ['_attribute_data', '_valid']
+    The attribute data (and its memoized JSON) is shared by all instances with the same type,
+    value, displayed, and source. Updating displayed or source copies the data first. The
+    shared data is kept for the 10,000 most recently used attributes.
+    """
+
+    __slots__ = ['_attribute_data', '_json', '_valid']
 
     def __init__(
         self,
@@ -27,26 +34,49 @@ class Attribute:
             formatter: A callable that take a single attribute
                 value and return a single formatted value.
         """
-        self._attribute_data = {'type': attr_type}
-        if displayed:
-            self._attribute_data['displayed'] = displayed
+        if isinstance(attr_type, str):
+            # the same attribute types are used on many indicators/groups, share a single copy
+            attr_type = sys.intern(attr_type)
         # format the value
         if formatter is not None:
             attr_value = formatter(attr_value)
-        self._attribute_data['value'] = attr_value
-        # add source if provided
-        if source is not None:
-            self._attribute_data['source'] = source
+
+        if isinstance(attr_value, str):
+            self._attribute_data, self._json = self._shared(
+                attr_type, attr_value, displayed, source
+            )
+        else:
+            self._attribute_data = self._build(attr_type, attr_value, displayed, source)
+            self._json = None
         # is attr_value not null or ''
         self._valid = True
         # check for None and '' value only.
         if attr_value in [None, '']:
             self._valid = False
 
+    @staticmethod
+    def _build(attr_type: str, attr_value: str, displayed: bool, source: Optional[str]) -> dict:
+        """Return the attribute data."""
+        attribute_data = {'type': attr_type}
+        if displayed:
+            attribute_data['displayed'] = displayed
+        attribute_data['value'] = attr_value
+        # add source if provided
+        if source is not None:
+            attribute_data['source'] = source
+        return attribute_data
+
+    @staticmethod
+    @lru_cache(maxsize=10_000)
+    def _shared(attr_type: str, attr_value: str, displayed: bool, source: Optional[str]) -> tuple:
+        """Return the shared attribute data and JSON (least recently used are evicted)."""
+        attribute_data = Attribute._build(attr_type, attr_value, displayed, source)
+        return attribute_data, json.dumps(attribute_data)
+
     @property
     def data(self) -> dict:
-        """Return Attribute data."""
-        return self._attribute_data
+        """Return a copy of the Attribute data (the data is shared with other instances)."""
+        return dict(self._attribute_data)
 
     @property
     def displayed(self) -> bool:
@@ -56,7 +86,20 @@ class Attribute:
     @displayed.setter
     def displayed(self, displayed: bool):
         """Set Attribute displayed."""
-        self._attribute_data['displayed'] = displayed
+        self._attribute_data = {**self._attribute_data, 'displayed': displayed}
+        self._json = None
+
+    @property
+    def json(self) -> str:
+        """Return the memoized JSON encoded Attribute data."""
+        if self._json is None:
+            self._json = json.dumps(self._attribute_data)
+        return self._json
+
+    @property
+    def json_memoized(self) -> bool:
+        """Return True if the JSON encoded Attribute data is memoized."""
+        return self._json is not None
 
     @property
     def source(self) -> str:
@@ -66,7 +109,8 @@ class Attribute:
     @source.setter
     def source(self, source: str):
         """Set Attribute source."""
-        self._attribute_data['source'] = source
+        self._attribute_data = {**self._attribute_data, 'source': source}
+        self._json = None
 
     @property
     def type(self) -> str:
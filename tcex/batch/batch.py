@@ -6,15 +6,22 @@ import json
 import math
 import os
 import re
-import shelve  # nosec
-import sys
 import threading
 import time
 import traceback
 import uuid
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any, Callable, Optional, Tuple, Union
 
+from .batch_chunk import BatchChunk
+from .batch_error_index import UNCLASSIFIED_ERROR_CODE, BatchErrorIndex
+from .batch_file_content import BatchFileContent
+from .batch_journal import BatchJournal
+from .batch_json_writer import BatchJsonWriter
+from .batch_poller import BatchPoller
+from .dedup_index import DedupIndex
+from .entity_store import EntityStore
 from .group import (
     Adversary,
     Campaign,
@@ -28,6 +35,7 @@ from .group import (
     Signature,
     Threat,
 )
+from .group_chunk_planner import GroupChunkPlanner
 from .indicator import (
     ASN,
     CIDR,
@@ -42,6 +50,7 @@ from .indicator import (
     UserAgent,
     custom_indicator_class_factory,
 )
+from .indicator_validator import IndicatorValidator
 
 # import local modules for dynamic reference
 module = __import__(__name__)
@@ -85,14 +94,48 @@ class Batch:
         # properties
         self._batch_max_chunk = 5_000
         self._batch_max_size = 75_000_000  # max size in bytes
+        self._file_futures = []
+        self._file_lock = threading.Lock()
         self._file_merge_mode = None
-        self._file_threads = []
+        self._file_pool = None
+        self._file_upload_workers = 4
         self._hash_collision_mode = None
-        self._submit_thread = None
+        self._poller = None
+        self._submit_futures = set()
 
-        # shelf settings
+        # shelf settings (groups/indicators saved to disk)
         self._group_shelf_fqfn = None
         self._indicator_shelf_fqfn = None
+        self.shelf_class = EntityStore
+        self.shelf_high_water_mark = 5_000
+
+        # dedup settings (merge indicators with the same type and summary)
+        self._dedup_index = None
+        self._dedup_pending = True
+        self.enable_indicator_dedup = False
+
+        # validation settings (validate indicators against the indicator type regexes)
+        self._indicator_validator = None
+        self.enable_indicator_validation = False
+        self.quarantine_invalid_indicators = True
+
+        # journal settings (checkpoint chunk progress to resume an interrupted submit)
+        self._journal = None
+        self._journal_fqfn = None
+        self._journal_resumed = False
+        self._journal_skip_count = 0
+        self.enable_journal = False
+        self.journal_max_age = 86_400  # seconds a completed chunk is skipped by later runs
+
+        # error requeue settings (resubmit entities that failed with a retryable error)
+        self._error_index = None
+        self._retry_counts = {}
+        self._retry_lock = threading.Lock()
+        self._retry_queue = deque()
+        self.enable_error_requeue = False
+        self.error_retry_limit = 3
+        # only errors with these codes are retried (add a code to opt in to its retry)
+        self.retryable_error_codes = {'0x1007', '0x1009', '0x100B'}
 
         # global overrides on batch/file errors
         self._halt_on_batch_error = None
@@ -107,11 +150,14 @@ class Batch:
 
         # default properties
         self._batch_data_count = None
-        self._poll_interval = None
-        self._poll_interval_times = []
         self._poll_timeout = 3600
+        self._submit_concurrency = 1
 
         # containers
+        self._group_fragments = {}  # the JSON of the planned groups in memory
+        self._group_plan = None
+        self._group_planner = None
+        self._group_sizes = {}  # the size in bytes of the measured groups
         self._groups = None
         self._groups_shelf = None
         self._indicators = None
@@ -233,16 +279,82 @@ class Batch:
         else:
             # store new group
             self.groups[xid] = group_data
+            if isinstance(group_data, dict):
+                self.group_planner.add(xid, group_data.get('associatedGroupXid'))
+            else:
+                self.group_planner.add(xid)
+            self._group_plan = None  # replan to include the new group
         return group_data
 
+    def _group_fragments_clear(self) -> None:
+        """Discard the JSON of the planned groups in memory.
+
+        Groups in memory can be changed by the App between submits, so the JSON encoded when
+        they were planned is only reused by the submit that planned them.
+        """
+        self._group_fragments.clear()
+
+    def _group_measure(
+        self, xid: str, group_data: Optional[Union[dict, object]] = None
+    ) -> Optional[int]:
+        """Return the size in bytes of a group, keeping the JSON of a group in memory.
+
+        Groups submitted in a completed chunk of a previous execution (see the journal) and
+        groups that no longer exist are removed from the plan.
+
+        Args:
+            xid: The xid of the group.
+            group_data: The group dict or object, if already loaded (e.g., when it is saved).
+
+        Returns:
+            Optional[int]: The size in bytes of the group, or None if the group was removed.
+        """
+        if group_data is None:
+            if xid in self.groups:
+                group_data = self.groups.get(xid)
+            elif xid in self.groups_shelf:
+                group_data = self.groups_shelf.get(xid)
+
+        if group_data is None or self._journal_skip(xid):
+            # the group was submitted in a completed chunk of a previous execution
+            if group_data is not None:
+                self.groups.pop(xid, None)
+                if xid in self.groups_shelf:
+                    del self.groups_shelf[xid]
+            self.group_planner.remove(xid)
+            return None
+
+        if isinstance(group_data, dict):
+            group_data = {k: v for k, v in group_data.items() if k != 'fileContent'}
+        else:
+            group_data = group_data.data
+        associated_xids = group_data.get('associatedGroupXid')
+        fragment = json.dumps(group_data)
+
+        # add any associations added after the group was stored
+        self.group_planner.add(xid, associated_xids)
+        if xid in self.groups:
+            # a group on the shelf is read again when it is submitted
+            self._group_fragments[xid] = fragment
+        self._group_sizes[xid] = len(fragment)
+        return len(fragment)
+
     def _indicator(
-        self, indicator_data: Union[dict, object], store: Optional[bool] = True
+        self,
+        indicator_data: Union[dict, object],
+        store: Optional[bool] = True,
+        validate: Optional[bool] = True,
     ) -> Union[dict, object]:
         """Return previously stored indicator or new indicator.
 
         Args:
             indicator_data: An Indicator dict or instance of Indicator object.
             store: If True the indicator data will be stored in instance list.
+            validate: If False the indicator will not be validated (already validated).
+
+        When *enable_indicator_dedup* is True and an indicator with the same type and summary
+        was already stored, the indicator is merged into it and the stored indicator is returned
+        (the same as for an indicator with an existing xid).
 
         Returns:
             Union[dict, object]: The new Indicator dict/object or the previously stored dict/object.
@@ -264,10 +376,95 @@ class Batch:
             # return existing indicator from shelf
             indicator_data = self.indicators_shelf.get(xid)
         else:
+            if self.enable_indicator_validation and validate:
+                reason = self.indicator_validator.validate_many([indicator_data])[0]
+                if self._indicator_invalid(indicator_data, reason):
+                    # invalid indicators are not stored, so they are never submitted
+                    return indicator_data
+
+            if self.enable_indicator_dedup:
+                primary_data = self._indicator_dedup(xid, indicator_data)
+                if primary_data is not None:
+                    # return the indicator the duplicate was merged into
+                    return primary_data
+            else:
+                # the indicator is indexed on the next call to dedup_indicators
+                self._dedup_pending = True
+
             # store new indicators
             self.indicators[xid] = indicator_data
         return indicator_data
 
+    def _indicator_dedup(
+        self, xid: str, indicator_data: Union[dict, object]
+    ) -> Optional[Union[dict, object]]:
+        """Merge the indicator into the stored indicator with the same type and summary.
+
+        An indicator merged into an indicator on the shelf is moved back to memory, so the
+        returned dict/object is the one that gets submitted.
+
+        Args:
+            xid: The xid of the indicator.
+            indicator_data: An Indicator dict or instance of Indicator object.
+
+        Returns:
+            Optional[Union[dict, object]]: The merged Indicator dict/object or None if the
+                indicator is the first one for the type and summary.
+        """
+        key = self.dedup_index.key(indicator_data)
+        primary_xid = self.dedup_index.get(key)
+
+        primary_data = None
+        if primary_xid is not None and primary_xid != xid:
+            primary_data = self.indicators.get(primary_xid)
+            if primary_data is None:
+                primary_data = self.indicators_shelf.get(primary_xid)
+                if primary_data is not None:
+                    del self.indicators_shelf[primary_xid]
+                    self.indicators[primary_xid] = primary_data
+
+        if primary_data is None:
+            # first indicator for key or primary has already been submitted
+            self.dedup_index[key] = xid
+            return None
+        return self.dedup_index.merge(primary_data, indicator_data)
+
+    def _indicator_invalid(
+        self, indicator_data: Union[dict, object], reason: Optional[str]
+    ) -> bool:
+        """Record the indicator as invalid (rejected or quarantined) if a reason is provided.
+
+        Args:
+            indicator_data: An Indicator dict or instance of Indicator object.
+            reason: The reason the indicator failed validation or None if valid.
+
+        Returns:
+            bool: True if the indicator is invalid.
+        """
+        if reason is None:
+            return False
+
+        if isinstance(indicator_data, dict):
+            indicator_type = indicator_data.get('type')
+            summary = indicator_data.get('summary')
+            xid = indicator_data.get('xid')
+        else:
+            indicator_type = indicator_data.type
+            summary = indicator_data.summary
+            xid = indicator_data.xid
+
+        self.indicator_validator.add(
+            indicator_type,
+            reason,
+            xid,
+            indicator_data if self.quarantine_invalid_indicators else None,
+        )
+        self.tcex.log.debug(
+            f'feature=batch, event=invalid-indicator, type={indicator_type}, '
+            f'summary={summary}, xid={xid}, reason="{reason}"'
+        )
+        return True
+
     @staticmethod
     def _indicator_values(indicator: str) -> list:
         """Process indicators expanding file hashes/custom indicators into multiple entries.
@@ -301,6 +498,237 @@ class Batch:
 
         return indicator_list
 
+    def _journal_complete(
+        self, chunk_id: Optional[int], batch_status: dict, file_futures: Optional[list] = None
+    ) -> None:
+        """Record the final status of a journaled chunk once all of its files are uploaded.
+
+        Args:
+            chunk_id: The journal id of the chunk.
+            batch_status: The batch status returned from the ThreatConnect API.
+            file_futures: The futures for the file uploads of the chunk.
+        """
+        if chunk_id is None:
+            return
+
+        batch_status = batch_status or {}
+        if batch_status.get('status') != 'Completed':
+            self.journal.fail(chunk_id, f'''batch status {batch_status.get('status')}''')
+            return
+
+        file_futures = list(file_futures or [])
+        if not file_futures:
+            self.journal.complete(chunk_id, batch_status)
+            return
+
+        remaining = [len(file_futures)]
+        lock = threading.Lock()
+
+        def file_done(_: Future) -> None:
+            """Record the chunk status after the last file upload is done."""
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+
+            failed = [
+                f
+                for f in file_futures
+                if f.cancelled()
+                or f.exception() is not None
+                or (f.result() or {}).get('uploaded') is False
+            ]
+            if failed:
+                self.journal.fail(chunk_id, f'file upload failed for {len(failed)} file(s)')
+            else:
+                self.journal.complete(chunk_id, batch_status)
+
+        for future in file_futures:
+            future.add_done_callback(file_done)
+
+    def _journal_skip(self, xid: str) -> bool:
+        """Return True if the xid was submitted in a completed chunk of a previous execution."""
+        if self.enable_journal and self.journal.is_completed(xid):
+            self._journal_skip_count += 1
+            return True
+        return False
+
+    def _journal_start(self, content: dict, file_data: dict) -> Optional[int]:
+        """Record a chunk in the journal before it is submitted.
+
+        Args:
+            content: The dict of groups and indicator data.
+            file_data: The file data for any Document or Report in the chunk.
+
+        Returns:
+            Optional[int]: The journal id of the chunk, or None when the journal is disabled.
+        """
+        if not self.enable_journal:
+            return None
+        return self.journal.start(BatchJournal.xids(content), len(file_data or {}))
+
+    def _journal_submitted(self, chunk_id: Optional[int], batch_id: Optional[int]) -> None:
+        """Record the batch id of a journaled chunk."""
+        if chunk_id is not None and batch_id is not None:
+            self.journal.submitted(chunk_id, batch_id)
+
+    def _process_errors(self, errors: list, content: dict, file_data: Optional[dict]) -> None:
+        """Index the errors for a chunk, requeuing failed entities if enabled."""
+        if self.enable_error_requeue:
+            self.requeue_errors(errors, content, file_data)
+        else:
+            self.error_index.add(errors, content)
+
+    def _submit_all_chunk_async(
+        self,
+        content: dict,
+        file_data: dict,
+        poll: bool,
+        errors: bool,
+        process_files: bool,
+        halt_on_error: bool,
+    ) -> Future:
+        """Submit a single chunk of Batch data, polling for status in the background poller.
+
+        Args:
+            content: The dict of groups and indicator data.
+            file_data: The file data for any Document or Report in the chunk.
+            poll: If True poll batch for status.
+            errors: If True retrieve any batch errors (only if poll is True).
+            process_files: If true send any document or report attachments to the API.
+            halt_on_error: If True any exception will raise an error.
+
+        Returns.
+            Future: A future resolved with the Batch Status from the ThreatConnect API.
+        """
+        chunk_id = self._journal_start(content, file_data)
+        batch_data = (
+            self.submit_create_and_upload(content=content, halt_on_error=halt_on_error)
+            .get('data', {})
+            .get('batchStatus', {})
+        )
+        batch_id = batch_data.get('id')
+        self._journal_submitted(chunk_id, batch_id)
+
+        def complete(data: dict) -> None:
+            """Retrieve errors and upload files once the batch job is complete."""
+            batch_status = data.get('data', {}).get('batchStatus') or {}
+            if errors and batch_id is not None:
+                # retrieve errors
+                error_count = batch_status.get('errorCount', 0)
+                error_groups = batch_status.get('errorGroupCount', 0)
+                error_indicators = batch_status.get('errorIndicatorCount', 0)
+                if error_count > 0 or error_groups > 0 or error_indicators > 0:
+                    batch_status['errors'] = self.errors(batch_id)
+                    self._process_errors(batch_status['errors'], content, file_data)
+
+            file_futures = []
+            if process_files:
+                # submit file data to the upload pool after batch job is complete
+                file_futures = self.submit_files_async(file_data, halt_on_error)
+                self._file_futures.extend(file_futures)
+            self._journal_complete(chunk_id, batch_status, file_futures)
+
+        if batch_id is not None and poll:
+            # job hit queue
+            self.tcex.log.info(f'feature=batch, event=status, batch-id={batch_id}')
+            return self.poll_async(batch_id, callback=complete, halt_on_error=halt_on_error)
+
+        # batch was processed inline (without being queued) or the status is unknown
+        data = {'data': {'batchStatus': batch_data}}
+        if batch_id is None:
+            complete(data)
+        future = Future()
+        future.set_result(data)
+        return future
+
+    def _submit_all_concurrent(
+        self, poll: bool, errors: bool, process_files: bool, halt_on_error: bool, concurrency: int
+    ) -> list:
+        """Submit all Batch chunks with up to *concurrency* jobs in flight.
+
+        Chunks are built and uploaded on the calling thread (the entity containers are not
+        thread-safe) and the status of all in flight jobs is tracked by the background poller.
+
+        Args:
+            poll: If True poll batch for status.
+            errors: If True retrieve any batch errors (only if poll is True).
+            process_files: If true send any document or report attachments to the API.
+            halt_on_error: If True any exception will raise an error.
+            concurrency: The max number of batch jobs in flight at once.
+
+        Returns.
+            list: The Batch Status for each chunk in submission order.
+        """
+        futures = []
+        while True:
+            # block until a slot is available, raising any error from a completed job
+            # before building and submitting the next chunk.
+            self._submit_futures_wait(concurrency - 1)
+
+            # get file, group, and indicator data
+            content = self.data
+
+            # break loop when end of data is reached
+            if not content.get('group') and not content.get('indicator'):
+                if self.enable_error_requeue and self._submit_futures:
+                    # wait for in flight jobs, which may requeue failed entities
+                    self._submit_futures_wait(0)
+                    continue
+                break
+
+            file_data = content.pop('file', {})
+            future = self._submit_all_chunk_async(
+                content, file_data, poll, errors, process_files, halt_on_error
+            )
+            futures.append(future)
+            self._submit_futures.add(future)
+            self.tcex.log.info(
+                f'feature=batch, event=submit-all-concurrent, chunk={len(futures)}, '
+                f'in-flight={len(self._submit_futures)}'
+            )
+
+        batch_data_array = []
+        for future in futures:
+            batch_data = future.result().get('data', {}).get('batchStatus', {})
+            batch_data_array.append(batch_data)
+
+            # write errors for debugging
+            self.write_error_json(batch_data.get('errors'))
+
+        return batch_data_array
+
+    def _submit_futures_wait(self, max_in_flight: int, raise_error: Optional[bool] = True) -> None:
+        """Block until no more than *max_in_flight* submitted batch jobs are in progress.
+
+        When a batch job fails and raise_error is True, the other jobs in progress are allowed to
+        complete (any errors are logged) before the error is raised.
+
+        Args:
+            max_in_flight: The max number of batch jobs allowed to be in progress.
+            raise_error: If True raise any error from a completed batch job, else log it.
+        """
+        while len(self._submit_futures) > max_in_flight:
+            self.tcex.log.info(
+                'feature=batch, event=progress, status=blocked, '
+                f'in-flight={len(self._submit_futures)}'
+            )
+            done, self._submit_futures = wait(self._submit_futures, return_when=FIRST_COMPLETED)
+            error = None
+            for future in done:
+                if future.exception() is None:
+                    continue
+                if raise_error and error is None:
+                    error = future.exception()
+                    continue
+                self.tcex.log.warning(
+                    f'feature=batch, event=submit-exception, err="""{future.exception()}"""'
+                )
+            if error is not None:
+                # drain the jobs in progress before raising the error
+                self._submit_futures_wait(0, raise_error=False)
+                raise error
+
     @property
     def action(self):
         """Return batch action."""
@@ -405,7 +833,35 @@ class Batch:
             whois_active = indicator_data.pop('whoisActive', None)
             if whois_active is not None:
                 indicator_data['flag2'] = whois_active
-        return self._indicator(indicator_data, kwargs.get('store', True))
+        return self._indicator(
+            indicator_data, kwargs.get('store', True), kwargs.get('validate', True)
+        )
+
+    def add_indicators(self, indicators: list, **kwargs) -> list:
+        """Add a list of indicators to Batch Job.
+
+        When *enable_indicator_validation* is True all indicators are validated in a single
+        pass per indicator type, before any are added. Invalid indicators are rejected (and
+        quarantined if *quarantine_invalid_indicators* is True) and are not returned.
+
+        Args:
+            indicators: The Full Indicator data for each indicator (see add_indicator).
+            store: (bool, kwargs): Advanced - Defaults to True. If True
+                the indicator data will be stored in instance list.
+
+        Returns:
+            list: The new indicator dicts/objects or the previously stored dicts/objects.
+        """
+        reasons = [None] * len(indicators)
+        if self.enable_indicator_validation and kwargs.get('store', True):
+            reasons = self.indicator_validator.validate_many(indicators)
+
+        added = []
+        for indicator_data, reason in zip(indicators, reasons):
+            if self._indicator_invalid(indicator_data, reason):
+                continue
+            added.append(self.add_indicator(indicator_data, validate=False, **kwargs))
+        return added
 
     def address(self, ip: str, **kwargs) -> Address:
         """Add Address data to Batch object.
@@ -509,30 +965,56 @@ class Batch:
 
     def close(self) -> None:
         """Cleanup batch job."""
-        # allow pol thread to complete before wrapping up
-        if hasattr(self._submit_thread, 'is_alive'):
-            self._submit_thread.join()
+        # allow poll/callback of submitted jobs to complete before wrapping up
+        self._submit_futures_wait(0, raise_error=False)
+        if self._poller is not None:
+            self._poller.shutdown(wait=True)
+            self._poller = None
+
+        # allow file uploads to complete before wrapping up job
+        for future in wait(self._file_futures).done:
+            if future.exception() is not None:
+                self.tcex.log.warning(
+                    f'feature=batch, event=file-upload-exception, err="""{future.exception()}"""'
+                )
+        self._file_futures = []
+        if self._file_pool is not None:
+            self._file_pool.shutdown(wait=True)
+            self._file_pool = None
 
-        # allow file threads to complete before wrapping up job
-        for t in self._file_threads:
-            t.join()
+        if self._journal is not None:
+            self.tcex.log.info(
+                f'feature=batch, event=journal-close, skipped={self._journal_skip_count:,}, '
+                f'chunks={self._journal.summary()}'
+            )
+            if self._journal.resumable:
+                # keep the journal to resume unfinished or failed chunks on the next execution
+                self._journal.close()
+            else:
+                self._journal.delete()
+            self._journal = None
+
+        if self._indicator_validator is not None and self._indicator_validator.invalid_count:
+            self.tcex.log.warning(
+                f'feature=batch, event=invalid-indicators, '
+                f'report={json.dumps(self._indicator_validator.report)}'
+            )
 
-        self.groups_shelf.close()
-        self.indicators_shelf.close()
         if not self.debug and not self.enable_saved_file:
-            # delete saved files
-            if os.path.isfile(self.group_shelf_fqfn):
-                os.remove(self.group_shelf_fqfn)
-            if os.path.isfile(self.group_shelf_fqfn):
-                os.remove(self.indicator_shelf_fqfn)
+            # close and delete saved files
+            self.groups_shelf.delete()
+            self.indicators_shelf.delete()
+        else:
+            self.groups_shelf.close()
+            self.indicators_shelf.close()
 
     @property
     def data(self):
         """Return the batch indicator/group and file data to be sent to the ThreatConnect API.
 
         **Processing Order:**
-        * Process groups in memory up to max batch size.
-        * Process groups in shelf to max batch size.
+        * Process the next planned chunk of groups (memory and shelf) with associated groups
+          kept together.
         * Process indicators in memory up to max batch size.
         * Process indicators in shelf up to max batch size.
 
@@ -541,17 +1023,25 @@ class Batch:
         Returns:
             dict: A dictionary of group, indicators, and/or file data.
         """
-        data = {'file': {}, 'group': [], 'indicator': []}
+        data = BatchChunk()
         tracker = {'count': 0, 'bytes': 0}
 
-        # process group from memory, returning if max values have been reached
-        if self.data_groups(data, self.groups, tracker) is True:
-            return data
+        # store any entities requeued after a retryable error
+        while self._retry_queue:
+            entity_type, entity_data = self._retry_queue.popleft()
+            if entity_type == 'group':
+                self._group(entity_data)
+            else:
+                self._indicator(entity_data)
 
-        # process group from shelf file, returning if max values have been reached
-        if self.data_groups(data, self.groups_shelf, tracker) is True:
+        # process the next planned chunk of groups, returning if max values have been reached
+        if self.data_groups_planned(data, tracker) is True:
             return data
 
+        # merge duplicate indicators before any indicators are added to the chunk
+        if self.enable_indicator_dedup and self._dedup_pending:
+            self.dedup_indicators()
+
         # process indicator from memory, returning if max values have been reached
         if self.data_indicators(data, self.indicators, tracker) is True:
             return data
@@ -562,45 +1052,6 @@ class Batch:
 
         return data
 
-    def data_group_association(self, data: dict, tracker: dict, xid: str) -> None:
-        """Return group dict array following all associations.
-
-        The *data* dict is passed by reference to make it easier to update both the group data
-        and file data inline versus passing the data all the way back up to the calling methods.
-
-        Args:
-            data: The data dict to update with group and file data.
-            tracker: A dict containing total count of all entities collected and
-                the total size in bytes of all entities collected.
-            xid: The xid of the group to retrieve associations.
-        """
-        xids = deque()
-        xids.append(xid)
-
-        while xids:
-            xid = xids.popleft()  # remove current xid
-            group_data = None
-
-            if xid in self.groups:
-                group_data = self.groups.get(xid)
-                del self.groups[xid]
-            elif xid in self.groups_shelf:
-                group_data = self.groups_shelf.get(xid)
-                del self.groups_shelf[xid]
-
-            if group_data:
-                file_data, group_data = self.data_group_type(group_data)
-                data['group'].append(group_data)
-                if file_data:
-                    data['file'][xid] = file_data
-
-                # update entity trackers
-                tracker['count'] += 1
-                tracker['bytes'] += sys.getsizeof(json.dumps(group_data))
-
-                # extend xids with any groups associated with the same object
-                xids.extend(group_data.get('associatedGroupXid', []))
-
     @staticmethod
     def data_group_type(group_data: Union[dict, object]) -> Tuple[dict, dict]:
         """Return dict representation of group data and file data.
@@ -629,43 +1080,62 @@ class Batch:
 
         return file_data, group_data
 
-    def data_groups(self, data: dict, groups: list, tracker: dict) -> bool:
-        """Process Group data.
+    def data_groups_planned(self, data: dict, tracker: dict) -> bool:
+        """Process the next planned chunk of Group data.
 
         Args:
             data: The data dict to update with group and file data.
-            groups: The list of groups to process.
             tracker: A dict containing total count of all entities collected and
                 the total size in bytes of all entities collected.
 
         Returns:
-            bool: True if max values have been hit, else False.
+            bool: True if max values have been hit or more group chunks remain, else False.
         """
-        # convert groups.keys() to a list to prevent dictionary change error caused by
-        # the data_group_association function deleting items from the object.
+        if self._group_plan is None:
+            self._group_plan = self.group_plan()
 
-        # process group objects
-        for xid in list(groups.keys()):
-            # get association from group data
-            self.data_group_association(data, tracker, xid)
+        if not self._group_plan:
+            self._group_plan = None
+            return False
 
-            if tracker.get('count') % 2_500 == 0:
-                # log count/size at a sane level
-                self.tcex.log.info(
-                    '''feature=batch, action=data-groups, '''
-                    f'''count={tracker.get('count'):,}, bytes={tracker.get('bytes'):,}'''
-                )
+        for xid in self._group_plan.pop(0):
+            group_data = None
+            if xid in self.groups:
+                group_data = self.groups.get(xid)
+                del self.groups[xid]
+            elif xid in self.groups_shelf:
+                group_data = self.groups_shelf.get(xid)
+                del self.groups_shelf[xid]
 
-            if (
-                tracker.get('count') >= self._batch_max_chunk
-                or tracker.get('bytes') >= self._batch_max_size
-            ):
-                # stop processing xid once max limit are reached
-                self.tcex.log.info(
-                    '''feature=batch, event=max-value-reached, '''
-                    f'''count={tracker.get('count'):,}, bytes={tracker.get('bytes'):,}'''
-                )
-                return True
+            # the group is submitted, remove it from the plan
+            fragment = self._group_fragments.pop(xid, None)
+            self._group_sizes.pop(xid, None)
+            self.group_planner.remove(xid)
+
+            if group_data:
+                file_data, group_data = self.data_group_type(group_data)
+                # reuse the JSON encoded when the group was planned (groups in memory only)
+                group_size = data.append('group', group_data, fragment)
+                if file_data:
+                    data['file'][xid] = file_data
+
+                # update entity trackers
+                tracker['count'] += 1
+                tracker['bytes'] += group_size
+
+        if (
+            self._group_plan
+            or tracker.get('count') >= self._batch_max_chunk
+            or tracker.get('bytes') >= self._batch_max_size
+        ):
+            # stop processing once max limit are reached or there are more group chunks
+            self.tcex.log.info(
+                '''feature=batch, event=max-value-reached, '''
+                f'''count={tracker.get('count'):,}, bytes={tracker.get('bytes'):,}'''
+            )
+            return True
+
+        self._group_plan = None
         return False
 
     def data_indicators(self, data: dict, indicators: list, tracker: dict) -> bool:
@@ -680,16 +1150,25 @@ class Batch:
         Returns:
             bool: True if max values have been hit, else False.
         """
+        # the shelf iterates in pages and supports deleting items while iterating.
+        items = list(indicators.items()) if isinstance(indicators, dict) else indicators.items()
+
         # process indicator objects
-        for xid, indicator_data in list(indicators.items()):
+        for xid, indicator_data in items:
+            if self._journal_skip(xid):
+                # the indicator was submitted in a completed chunk of a previous execution
+                del indicators[xid]
+                continue
+
             if not isinstance(indicator_data, dict):
+                # the chunk needs the dict, encoding it directly is faster than Indicator.json()
                 indicator_data = indicator_data.data
-            data['indicator'].append(indicator_data)
+            indicator_size = data.append('indicator', indicator_data)
             del indicators[xid]
 
             # update entity trackers
             tracker['count'] += 1
-            tracker['bytes'] += sys.getsizeof(json.dumps(indicator_data))
+            tracker['bytes'] += indicator_size
 
             if tracker.get('count') % 2_500 == 0:
                 # log count/size at a sane level
@@ -732,6 +1211,44 @@ class Batch:
                 self._debug = True
         return self._debug
 
+    @property
+    def dedup_index(self) -> DedupIndex:
+        """Return the indicator dedup index."""
+        if self._dedup_index is None:
+            self._dedup_index = DedupIndex()
+        return self._dedup_index
+
+    def dedup_indicators(self) -> int:
+        """Merge indicators with the same type and summary, but different xids.
+
+        Indicators in memory and shelf are indexed on type and normalized summary. Tags,
+        attributes, security labels, file occurrences, and associations of any duplicate are
+        merged into the first indicator with the same key and the duplicate is removed.
+
+        While *enable_indicator_dedup* is True indicators are indexed and merged when they are
+        added, so this method only has to index indicators added before it was enabled (or
+        loaded from a saved shelf). It is called automatically before indicators are chunked
+        when there are indicators that have not been indexed.
+
+        Returns:
+            int: The number of indicators merged.
+        """
+        merge_count = self.dedup_index.merge_count
+        for indicators in [self.indicators, self.indicators_shelf]:
+            # the shelf iterates in pages and supports updating items while iterating.
+            items = list(indicators.items()) if isinstance(indicators, dict) else indicators.items()
+            for xid, indicator_data in items:
+                if self._indicator_dedup(xid, indicator_data) is not None:
+                    del indicators[xid]
+
+        self._dedup_pending = False
+        merged = self.dedup_index.merge_count - merge_count
+        self.tcex.log.info(
+            f'feature=batch, event=dedup-indicators, merged={merged:,}, '
+            f'total-merged={self.dedup_index.merge_count:,}'
+        )
+        return merged
+
     def document(self, name: str, file_name: str, **kwargs) -> Document:
         """Add Document data to Batch object.
 
@@ -813,6 +1330,13 @@ class Batch:
             '0x2003': 'File Hash Merge Error',
         }
 
+    @property
+    def error_index(self) -> BatchErrorIndex:
+        """Return the index of batch errors by xid, classified by Batch error code."""
+        if self._error_index is None:
+            self._error_index = BatchErrorIndex(self.error_codes)
+        return self._error_index
+
     def errors(self, batch_id: int, halt_on_error: Optional[bool] = True) -> list:
         """Retrieve Batch errors to ThreatConnect API.
 
@@ -908,6 +1432,25 @@ class Batch:
         """
         self._file_merge_mode = value
 
+    @property
+    def file_pool(self) -> ThreadPoolExecutor:
+        """Return the thread pool shared by all Document and Report file uploads."""
+        if self._file_pool is None:
+            self._file_pool = ThreadPoolExecutor(
+                max_workers=self.file_upload_workers, thread_name_prefix='submit-files'
+            )
+        return self._file_pool
+
+    @property
+    def file_upload_workers(self) -> int:
+        """Return the max number of concurrent file uploads."""
+        return self._file_upload_workers
+
+    @file_upload_workers.setter
+    def file_upload_workers(self, workers: int):
+        """Set the max number of concurrent file uploads (set before the first upload)."""
+        self._file_upload_workers = max(int(workers), 1)
+
     @staticmethod
     def generate_xid(identifier: Optional[Union[list, str]] = None):
         """Generate xid from provided identifiers.
@@ -945,6 +1488,41 @@ class Batch:
         group_obj = Group(group_type, name, **kwargs)
         return self._group(group_obj, kwargs.get('store', True))
 
+    def group_plan(self) -> list:
+        """Return the xids of all groups in memory and shelf, laid out in chunks.
+
+        Associated groups are always placed in the same chunk and the chunks are packed to
+        the max chunk count and size (see GroupChunkPlanner). Each group is only measured the
+        first time it is planned, so a new plan (e.g., after more groups are added) only packs
+        the groups again.
+
+        Returns:
+            list: A list of xids for each chunk.
+        """
+        sizes = {}
+        for xid in self.group_planner.xids:
+            size = self._group_sizes.get(xid)
+            if size is None:
+                size = self._group_measure(xid)
+                if size is None:
+                    continue
+            sizes[xid] = size
+
+        self.group_planner.max_count = self._batch_max_chunk
+        self.group_planner.max_size = self._batch_max_size
+        chunks = self.group_planner.plan(sizes)
+        self.tcex.log.info(
+            f'feature=batch, event=group-plan, count={len(sizes):,}, chunks={len(chunks):,}'
+        )
+        return chunks
+
+    @property
+    def group_planner(self) -> GroupChunkPlanner:
+        """Return the association index used to plan group chunks."""
+        if self._group_planner is None:
+            self._group_planner = GroupChunkPlanner(self._batch_max_chunk, self._batch_max_size)
+        return self._group_planner
+
     @property
     def group_shelf_fqfn(self):
         """Return groups shelf fully qualified filename.
@@ -972,10 +1550,14 @@ class Batch:
         return self._groups
 
     @property
-    def groups_shelf(self) -> object:
-        """Return dictionary of all Groups data."""
+    def groups_shelf(self) -> EntityStore:
+        """Return entity store of all saved Groups data."""
         if self._groups_shelf is None:
-            self._groups_shelf = shelve.open(self.group_shelf_fqfn, writeback=False)  # nosec
+            self._groups_shelf = self.shelf_class(self.group_shelf_fqfn, self.shelf_high_water_mark)
+            if self.saved_groups:
+                # plan the groups of the saved shelf file
+                for xid in self._groups_shelf.keys():
+                    self.group_planner.add(xid)
         return self._groups_shelf
 
     @property
@@ -1107,6 +1689,13 @@ class Batch:
                 self._indicator_shelf_fqfn = self.debug_path_indicator_shelf
         return self._indicator_shelf_fqfn
 
+    @property
+    def indicator_validator(self) -> IndicatorValidator:
+        """Return the validator for indicators (compiled indicator type regexes and report)."""
+        if self._indicator_validator is None:
+            self._indicator_validator = IndicatorValidator(self.tcex.indicator_types_data)
+        return self._indicator_validator
+
     @property
     def indicators(self) -> dict:
         """Return dictionary of all Indicator data."""
@@ -1116,11 +1705,11 @@ class Batch:
         return self._indicators
 
     @property
-    def indicators_shelf(self) -> object:
-        """Return dictionary of all Indicator data."""
+    def indicators_shelf(self) -> EntityStore:
+        """Return entity store of all saved Indicator data."""
         if self._indicators_shelf is None:
-            self._indicators_shelf = shelve.open(  # nosec
-                self.indicator_shelf_fqfn, writeback=False
+            self._indicators_shelf = self.shelf_class(
+                self.indicator_shelf_fqfn, self.shelf_high_water_mark
             )
         return self._indicators_shelf
 
@@ -1140,6 +1729,82 @@ class Batch:
         group_obj = IntrusionSet(name, **kwargs)
         return self._group(group_obj, kwargs.get('store', True))
 
+    @property
+    def journal(self) -> Optional[BatchJournal]:
+        """Return the checkpoint journal, or None when the journal is disabled.
+
+        When enable_journal is True each chunk submitted by submit_all or submit_callback is
+        recorded with its xids, batch id, and final status. If the App is interrupted the next
+        execution will skip any group or indicator in a chunk completed by the previous
+        execution, resume polling of jobs still in flight, and resubmit any unfinished or failed
+        chunk. Chunks older than journal_max_age seconds are ignored. The journal is deleted by
+        close() once all chunks have completed.
+        """
+        if self._journal is None and self.enable_journal:
+            os.makedirs(os.path.dirname(self.journal_fqfn), exist_ok=True)
+            self._journal = BatchJournal(self.journal_fqfn, self.journal_max_age)
+            self.tcex.log.info(
+                f'feature=batch, event=journal-open, fqfn={self.journal_fqfn}, '
+                f'chunks={self._journal.summary()}'
+            )
+        return self._journal
+
+    @property
+    def journal_fqfn(self) -> str:
+        """Return the journal fully qualified filename.
+
+        The journal must be in a location that persists between executions of the App, by
+        default a file named for the owner in the tc_temp_path directory.
+        """
+        if self._journal_fqfn is None:
+            owner = re.sub(r'[^\w.-]', '_', self._owner)
+            self._journal_fqfn = os.path.join(
+                self.tcex.args.tc_temp_path, f'batch-journal-{owner}.db'
+            )
+        return self._journal_fqfn
+
+    @journal_fqfn.setter
+    def journal_fqfn(self, fqfn: str):
+        """Set the journal fully qualified filename."""
+        self._journal_fqfn = fqfn
+
+    def journal_resume(self) -> list:
+        """Resume polling of the batch jobs left in flight by a previous execution.
+
+        This method is called by submit_all and submit_callback and only runs once. A job that
+        completed is recorded as completed, unless the chunk had files to upload (the file
+        content was not retained), in which case it is recorded as failed so the chunk is
+        resubmitted.
+
+        Returns:
+            list: The Batch Status for each resumed job.
+        """
+        if not self.enable_journal or self._journal_resumed:
+            return []
+        self._journal_resumed = True
+
+        chunks = self.journal.chunks('Submitted')
+        self.tcex.log.info(f'feature=batch, event=journal-resume, in-flight={len(chunks)}')
+        futures = [
+            (chunk_id, file_count, self.poll_async(batch_id, halt_on_error=False))
+            for chunk_id, batch_id, _, file_count in chunks
+        ]
+
+        batch_data_array = []
+        for chunk_id, file_count, future in futures:
+            try:
+                batch_status = future.result().get('data', {}).get('batchStatus') or {}
+            except Exception as e:
+                self.tcex.log.warning(f'feature=batch, event=journal-resume-error, err="""{e}"""')
+                batch_status = {}
+
+            if batch_status.get('status') == 'Completed' and file_count:
+                self.journal.fail(chunk_id, 'file upload status unknown')
+            else:
+                self._journal_complete(chunk_id, batch_status)
+            batch_data_array.append(batch_status)
+        return batch_data_array
+
     def mutex(self, mutex: str, **kwargs) -> Mutex:
         """Add Mutex data to Batch object.
 
@@ -1195,86 +1860,64 @@ class Batch:
         Returns:
             dict: The batch status returned from the ThreatConnect API.
         """
+        return self.poll_async(
+            batch_id,
+            retry_seconds=retry_seconds,
+            back_off=back_off,
+            timeout=timeout,
+            halt_on_error=halt_on_error,
+        ).result()
+
+    def poll_async(
+        self,
+        batch_id: int,
+        callback: Optional[Callable[[dict], Any]] = None,
+        retry_seconds: Optional[int] = None,
+        back_off: Optional[float] = None,
+        timeout: Optional[int] = None,
+        halt_on_error: Optional[bool] = True,
+    ) -> Future:
+        """Poll Batch status to ThreatConnect API using the shared background poller.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the current batch job.
+            callback: A method that is passed the batch status when the job is complete.
+            retry_seconds: The base number of seconds used for retries when job is not completed.
+            back_off: A multiplier to use for backing off on
+                each poll attempt when job has not completed.
+            timeout: The number of seconds before the poll should timeout.
+            halt_on_error: If True any exception will be raised by the future.
+
+        Returns:
+            Future: A future resolved with the batch status returned from the ThreatConnect API.
+        """
         # check global setting for override
         if self.halt_on_poll_error is not None:
             halt_on_error = self.halt_on_poll_error
 
         # initial poll interval
-        if self._poll_interval is None and self._batch_data_count is not None:
+        interval = None
+        if self.poller.interval is None and self._batch_data_count is not None:
             # calculate poll_interval base off the number of entries in the batch data
             # with a minimum value of 5 seconds.
-            self._poll_interval = max(math.ceil(self._batch_data_count / 300), 5)
-        elif self._poll_interval is None:
-            # if not able to calculate poll_interval default to 15 seconds
-            self._poll_interval = 15
-
-        # poll retry back_off factor
-        poll_interval_back_off = float(2.5 if back_off is None else back_off)
-
-        # poll retry seconds
-        poll_retry_seconds = int(5 if retry_seconds is None else retry_seconds)
-
-        # poll timeout
-        if timeout is None:
-            timeout = self.poll_timeout
-        else:
-            timeout = int(timeout)
-        params = {'includeAdditional': 'true'}
-
-        poll_count = 0
-        poll_time_total = 0
-        data = {}
-        while True:
-            poll_count += 1
-            poll_time_total += self._poll_interval
-            time.sleep(self._poll_interval)
-            self.tcex.log.info(f'feature=batch, event=progress, poll-time={poll_time_total}')
-            try:
-                # retrieve job status
-                r = self.tcex.session.get(f'/v2/batch/{batch_id}', params=params)
-                if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
-                    self.tcex.handle_error(545, [r.status_code, r.text], halt_on_error)
-                    return data
-                data = r.json()
-                if data.get('status') != 'Success':
-                    self.tcex.handle_error(545, [r.status_code, r.text], halt_on_error)
-            except Exception as e:
-                self.tcex.handle_error(540, [e], halt_on_error)
-
-            if data.get('data', {}).get('batchStatus', {}).get('status') == 'Completed':
-                # store last 5 poll times to use in calculating average poll time
-                modifier = poll_time_total * 0.7
-                self._poll_interval_times = self._poll_interval_times[-4:] + [modifier]
-
-                weights = [1]
-                poll_interval_time_weighted_sum = 0
-                for poll_interval_time in self._poll_interval_times:
-                    poll_interval_time_weighted_sum += poll_interval_time * weights[-1]
-                    # weights will be [1, 1.5, 2.25, 3.375, 5.0625] for all 5 poll times depending
-                    # on how many poll times are available.
-                    weights.append(weights[-1] * 1.5)
-
-                # pop off the last weight so its not added in to the sum
-                weights.pop()
-
-                # calculate the weighted average of the last 5 poll times
-                self._poll_interval = math.floor(poll_interval_time_weighted_sum / sum(weights))
-
-                if poll_count == 1:
-                    # if completed on first poll, reduce poll interval.
-                    self._poll_interval = self._poll_interval * 0.85
-
-                self.tcex.log.debug(f'feature=batch, poll-time={poll_time_total}, status={data}')
-                return data
-
-            # update poll_interval for retry with max poll time of 20 seconds
-            self._poll_interval = min(
-                poll_retry_seconds + int(poll_count * poll_interval_back_off), 20
-            )
+            interval = max(math.ceil(self._batch_data_count / 300), 5)
+
+        return self.poller.submit(
+            batch_id,
+            callback=callback,
+            halt_on_error=halt_on_error,
+            interval=interval,
+            retry_seconds=retry_seconds,
+            back_off=back_off,
+            timeout=self.poll_timeout if timeout is None else timeout,
+        )
 
-            # time out poll to prevent App running indefinitely
-            if poll_time_total >= timeout:
-                self.tcex.handle_error(550, [timeout], True)
+    @property
+    def poller(self) -> BatchPoller:
+        """Return the background poller shared by all batch jobs."""
+        if self._poller is None:
+            self._poller = BatchPoller(self.tcex, timeout=self.poll_timeout)
+        return self._poller
 
     @property
     def poll_timeout(self) -> int:
@@ -1292,6 +1935,7 @@ class Batch:
         Args:
             process_files: Send any document or report attachments to the API.
         """
+        self._group_fragments_clear()
         while True:
             content = self.data
             file_data = content.pop('file', {})
@@ -1357,8 +2001,8 @@ class Batch:
                 continue
 
             # write the file to disk
-            with open(fqfn, 'wb') as fh:
-                fh.write(content)
+            with BatchFileContent(content) as file_content:
+                file_content.write(fqfn)
 
     def registry_key(
         self, key_name: str, value_name: str, value_type: str, **kwargs
@@ -1403,8 +2047,64 @@ class Batch:
         group_obj = Report(name, **kwargs)
         return self._group(group_obj, kwargs.get('store', True))
 
+    def requeue_errors(self, errors: list, content: dict, file_data: Optional[dict] = None) -> int:
+        """Index the errors for a chunk and requeue entities that failed with a retryable error.
+
+        The requeued entities are added to the next chunk returned by data. An entity is only
+        requeued if all of its errors have a code in retryable_error_codes and it has been
+        requeued less than error_retry_limit times. An error that couldn't be classified is
+        never retried. This method is called for each chunk with errors by the submit methods
+        when enable_error_requeue is True.
+
+        Args:
+            errors: The errors returned from the ThreatConnect API for the batch job.
+            content: The dict of groups and indicator data submitted in the batch job.
+            file_data: The file data for the batch job. The file for a requeued Document or
+                Report is removed and submitted with the requeued group.
+
+        Returns:
+            int: The number of requeued entities.
+        """
+        records = self.error_index.add(errors, content)
+        # an error that couldn't be classified may be a critical failure and is never retried
+        codes = set(self.retryable_error_codes) - {UNCLASSIFIED_ERROR_CODE}
+        retryable = {r.get('xid') for r in records if r.get('code') in codes}
+        retryable -= {r.get('xid') for r in records if r.get('code') not in codes}
+        retryable.discard(None)
+        if not retryable:
+            return 0
+
+        requeued = 0
+        for entity_type in ['group', 'indicator']:
+            for entity_data in content.get(entity_type) or []:
+                xid = entity_data.get('xid')
+                if xid not in retryable:
+                    continue
+
+                with self._retry_lock:
+                    retry_count = self._retry_counts.get(xid, 0)
+                    if retry_count >= self.error_retry_limit:
+                        self.tcex.log.warning(
+                            f'feature=batch, event=retry-limit-reached, xid={xid}, '
+                            f'retries={retry_count}'
+                        )
+                        continue
+                    self._retry_counts[xid] = retry_count + 1
+
+                entity_data = dict(entity_data)
+                if file_data and xid in file_data:
+                    # send the file after the requeued group is saved
+                    entity_data['fileContent'] = file_data.pop(xid).get('fileContent')
+                self._retry_queue.append((entity_type, entity_data))
+                requeued += 1
+
+        self.tcex.log.info(
+            f'feature=batch, event=requeue-errors, errors={len(records):,}, requeued={requeued:,}'
+        )
+        return requeued
+
     def save(self, resource: Union[dict, object]) -> None:
-        """Save group|indicator dict or object to shelve.
+        """Save group|indicator dict or object to the shelf (entity store on disk).
 
         Best effort to save group/indicator data to disk.  If for any reason the save fails
         the data will still be accessible from list in memory.
@@ -1437,6 +2137,10 @@ class Batch:
                     except KeyError:
                         # if group was saved twice it would already be delete
                         pass
+                    # measure the group now, so it is not read from the shelf to be planned
+                    self._group_fragments.pop(xid, None)
+                    if xid not in self._group_sizes:
+                        self._group_measure(xid, resource)
             elif resource_type in self.tcex.indicator_types_data.keys():
                 try:
                     # indicators
@@ -1591,6 +2295,7 @@ class Batch:
             dict: The Batch Status from the ThreatConnect API.
         """
         # get file, group, and indicator data
+        self._group_fragments_clear()
         content = self.data
 
         # pop any file content to pass to submit_files
@@ -1617,22 +2322,14 @@ class Batch:
                     error_indicators = batch_data.get('errorIndicatorCount', 0)
                     if error_groups > 0 or error_indicators > 0:
                         batch_data['errors'] = self.errors(batch_id)
+                        self._process_errors(batch_data['errors'], content, file_data)
             else:
                 # can't process files if status is unknown (polling must be enabled)
                 process_files = False
 
         if process_files:
-            # submit file data after batch job is complete
-            self._file_threads.append(
-                self.submit_thread(
-                    name='submit-files',
-                    target=self.submit_files,
-                    args=(
-                        file_data,
-                        halt_on_error,
-                    ),
-                )
-            )
+            # submit file data to the upload pool after batch job is complete
+            self._file_futures.extend(self.submit_files_async(file_data, halt_on_error))
         return batch_data
 
     def submit_all(
@@ -1641,6 +2338,7 @@ class Batch:
         errors: Optional[bool] = True,
         process_files: Optional[bool] = True,
         halt_on_error: Optional[bool] = True,
+        concurrency: Optional[int] = None,
     ) -> dict:
         """Submit Batch request to ThreatConnect API.
 
@@ -1653,6 +2351,11 @@ class Batch:
         If any of the submit, poll, or error methods fail the entire submit will halt at the point
         of failure. The behavior can be changed by setting halt_on_error to False.
 
+        When concurrency is greater than 1 up to that many createAndUpload jobs are submitted
+        and polled at the same time. The batch status for each job is still returned in the order
+        the chunks were submitted. On failure no new chunks are submitted, any jobs already in
+        flight are allowed to complete and the error is raised.
+
         Each of these methods can also be called on their own for greater control of the submit
         process.
 
@@ -1661,12 +2364,25 @@ class Batch:
             errors: If True retrieve any batch errors (only if poll is True).
             process_files: If true send any document or report attachments to the API.
             halt_on_error: If True any exception will raise an error.
+            concurrency: The max number of batch jobs in flight at once. Defaults to the
+                value of the submit_concurrency property.
 
         Returns.
             dict: The Batch Status from the ThreatConnect API.
         """
+        if concurrency is None:
+            concurrency = self.submit_concurrency
+
+        # resume polling of any jobs left in flight by a previous execution
+        self.journal_resume()
+        self._group_fragments_clear()
+
+        if concurrency > 1 and self.action.lower() != 'delete':
+            return self._submit_all_concurrent(
+                poll, errors, process_files, halt_on_error, concurrency
+            )
+
         batch_data_array = []
-        file_data = {}
         while True:
             batch_data = {}
             batch_id = None
@@ -1695,46 +2411,14 @@ class Batch:
             else:
                 # pop any file content to pass to submit_files
                 file_data = content.pop('file', {})
-                batch_data = (
-                    self.submit_create_and_upload(content=content, halt_on_error=halt_on_error)
-                    .get('data', {})
-                    .get('batchStatus', {})
+                batch_data = self.submit_all_chunk(
+                    content, file_data, poll, errors, process_files, halt_on_error
                 )
-                batch_id = batch_data.get('id')
-
-            if batch_id is not None:
-                self.tcex.log.info(f'feature=batch, event=status, batch-id={batch_id}')
-                # job hit queue
-                if poll:
-                    # poll for status
-                    batch_data = (
-                        self.poll(batch_id, halt_on_error=halt_on_error)
-                        .get('data', {})
-                        .get('batchStatus')
-                    )
-                    if errors:
-                        # retrieve errors
-                        error_count = batch_data.get('errorCount', 0)
-                        error_groups = batch_data.get('errorGroupCount', 0)
-                        error_indicators = batch_data.get('errorIndicatorCount', 0)
-                        if error_count > 0 or error_groups > 0 or error_indicators > 0:
-                            batch_data['errors'] = self.errors(batch_id)
-                else:
-                    # can't process files if status is unknown (polling must be enabled)
+
+                # can't process files if status is unknown (polling must be enabled)
+                if batch_data.get('id') is not None and not poll:
                     process_files = False
 
-            if process_files:
-                # submit file data after batch job is complete
-                self._file_threads.append(
-                    self.submit_thread(
-                        name='submit-files',
-                        target=self.submit_files,
-                        args=(
-                            file_data,
-                            halt_on_error,
-                        ),
-                    )
-                )
             batch_data_array.append(batch_data)
 
             # write errors for debugging
@@ -1742,19 +2426,83 @@ class Batch:
 
         return batch_data_array
 
+    def submit_all_chunk(
+        self,
+        content: dict,
+        file_data: dict,
+        poll: Optional[bool] = True,
+        errors: Optional[bool] = True,
+        process_files: Optional[bool] = True,
+        halt_on_error: Optional[bool] = True,
+    ) -> dict:
+        """Submit a single chunk of Batch data using createAndUpload.
+
+        Args:
+            content: The dict of groups and indicator data.
+            file_data: The file data for any Document or Report in the chunk.
+            poll: If True poll batch for status.
+            errors: If True retrieve any batch errors (only if poll is True).
+            process_files: If true send any document or report attachments to the API.
+            halt_on_error: If True any exception will raise an error.
+
+        Returns.
+            dict: The Batch Status from the ThreatConnect API.
+        """
+        chunk_id = self._journal_start(content, file_data)
+        batch_data = (
+            self.submit_create_and_upload(content=content, halt_on_error=halt_on_error)
+            .get('data', {})
+            .get('batchStatus', {})
+        )
+        batch_id = batch_data.get('id')
+        self._journal_submitted(chunk_id, batch_id)
+
+        if batch_id is not None:
+            self.tcex.log.info(f'feature=batch, event=status, batch-id={batch_id}')
+            # job hit queue
+            if poll:
+                # poll for status
+                batch_data = (
+                    self.poll(batch_id, halt_on_error=halt_on_error)
+                    .get('data', {})
+                    .get('batchStatus')
+                )
+                if errors:
+                    # retrieve errors
+                    error_count = batch_data.get('errorCount', 0)
+                    error_groups = batch_data.get('errorGroupCount', 0)
+                    error_indicators = batch_data.get('errorIndicatorCount', 0)
+                    if error_count > 0 or error_groups > 0 or error_indicators > 0:
+                        batch_data['errors'] = self.errors(batch_id)
+                        self._process_errors(batch_data['errors'], content, file_data)
+            else:
+                # can't process files if status is unknown (polling must be enabled)
+                process_files = False
+
+        file_futures = []
+        if process_files:
+            # submit file data to the upload pool after batch job is complete
+            file_futures = self.submit_files_async(file_data, halt_on_error)
+            self._file_futures.extend(file_futures)
+
+        if batch_id is None or poll:
+            self._journal_complete(chunk_id, batch_data, file_futures)
+        return batch_data
+
     def submit_callback(
         self,
         callback: Callable[..., Any],
         content: Optional[dict] = None,
         halt_on_error: Optional[bool] = True,
     ) -> bool:
-        """Submit batch data to ThreatConnect and poll in a separate thread.
+        """Submit batch data to ThreatConnect and poll using the background poller.
 
         The "normal" submit methods run in serial which will block when the batch poll is running.
-        Using this method the submit is done in serial, but the poll method is run in a thread,
-        which should allow the App to continue downloading and processing data while the batch
-        poll process is running. Only one batch submission is allowed at a time so that any
-        critical errors returned from batch can be handled before submitting a new batch job.
+        Using this method the submit is done in serial, but the poll is done by the shared
+        background poller, which should allow the App to continue downloading and processing
+        data while the batch poll process is running. Up to *submit_concurrency* (default 1)
+        batch submissions are allowed at a time so that any critical errors returned from batch
+        can be handled before submitting a new batch job.
 
         Args:
             callback: The callback method that will handle
@@ -1768,31 +2516,36 @@ class Batch:
         Returns:
             bool: False when there is not data to process, else True
         """
+        # resume polling of any jobs left in flight by a previous execution
+        self.journal_resume()
+        self._group_fragments_clear()
+
         # user provided content or grab content from local group/indicator lists
         if content is not None:
             # process content
             pass
         else:
             content = self.data
+            while (
+                not content.get('group')
+                and not content.get('indicator')
+                and self.enable_error_requeue
+                and self._submit_futures
+            ):
+                # wait for in flight jobs, which may requeue failed entities
+                self._submit_futures_wait(0)
+                content = self.data
         file_data = content.pop('file', {})
 
         # return False when end of data is reached
         if not content.get('group') and not content.get('indicator'):
             return False
 
-        # block here is there is already a batch submission being processed
-        if hasattr(self._submit_thread, 'is_alive'):
-            self.tcex.log.info(
-                'feature=batch, event=progress, status=blocked, '
-                f'is-alive={self._submit_thread.is_alive()}'
-            )
-            self._submit_thread.join()
-            self.tcex.log.debug(
-                'feature=batch, event=progress, status=released, '
-                f'is-alive={self._submit_thread.is_alive()}'
-            )
+        # block here if the max number of batch submissions are already being processed
+        self._submit_futures_wait(self.submit_concurrency - 1)
 
         # submit the data and collect the response
+        chunk_id = self._journal_start(content, file_data)
         batch_data: dict = (
             self.submit_create_and_upload(content=content, halt_on_error=halt_on_error)
             .get('data', {})
@@ -1800,57 +2553,72 @@ class Batch:
         )
         self.tcex.log.trace(f'feature=batch, event=submit-callback, batch-data={batch_data}')
 
-        # launch batch polling in a thread
-        self._submit_thread = self.submit_thread(
-            name='submit-poll',
-            target=self.submit_callback_thread,
-            args=(batch_data, callback, file_data),
-        )
+        batch_id = batch_data.get('id')
+        self._journal_submitted(chunk_id, batch_id)
+        self.tcex.log.info(f'feature=batch, event=progress, batch-id={batch_id}')
+        if batch_id:
+            # poll for status in the background poller
+            self._submit_futures.add(
+                self.poll_async(
+                    batch_id,
+                    callback=lambda data: self.submit_callback_complete(
+                        data.get('data', {}).get('batchStatus') or {},
+                        callback,
+                        file_data,
+                        halt_on_error,
+                        chunk_id,
+                        content,
+                    ),
+                    halt_on_error=halt_on_error,
+                )
+            )
+        else:
+            # when batch_id is None it indicates that batch submission was small enough to be
+            # processed inline (without being queued)
+            self.submit_callback_complete(
+                batch_data, callback, file_data, halt_on_error, chunk_id, content
+            )
 
         return True
 
-    def submit_callback_thread(
+    def submit_callback_complete(
         self,
-        batch_data: int,
+        batch_status: dict,
         callback: Callable[..., Any],
         file_data: dict,
         halt_on_error: Optional[bool] = True,
+        chunk_id: Optional[int] = None,
+        content: Optional[dict] = None,
     ) -> None:
-        """Submit data in a thread."""
-        batch_id = batch_data.get('id')
-        self.tcex.log.info(f'feature=batch, event=progress, batch-id={batch_id}')
-        if batch_id:
-            # when batch_id is None it indicates that batch submission was small enough to be
-            # processed inline (without being queued)
-
-            # poll for status
-            batch_status = (
-                self.poll(batch_id, halt_on_error=halt_on_error).get('data', {}).get('batchStatus')
-            )
-
-            # retrieve errors
-            error_count = batch_status.get('errorCount', 0)
-            error_groups = batch_status.get('errorGroupCount', 0)
-            error_indicators = batch_status.get('errorIndicatorCount', 0)
-            if error_count > 0 or error_groups > 0 or error_indicators > 0:
-                batch_status['errors'] = self.errors(batch_id)
-        else:
-            batch_status = batch_data
+        """Retrieve errors, upload files, and send the batch status to the callback.
 
-        # launch file upload in a thread *after* batch status is returned. while only one batch
-        # submission thread is allowed, there is no limit on file upload threads. the upload
-        # status returned by file upload will be ignored when running in a thread.
+        Args:
+            batch_status: The batch status for the completed batch job.
+            callback: The callback method that will handle the batch status.
+            file_data: The file data for any Document or Report in the batch job.
+            halt_on_error: If True the process should halt if any errors are encountered.
+            chunk_id: The journal id of the chunk (see enable_journal).
+            content: The dict of groups and indicator data submitted in the batch job, used
+                to match errors to the failed entities.
+        """
+        # retrieve errors
+        batch_id = batch_status.get('id')
+        error_count = batch_status.get('errorCount', 0)
+        error_groups = batch_status.get('errorGroupCount', 0)
+        error_indicators = batch_status.get('errorIndicatorCount', 0)
+        if batch_id and (error_count > 0 or error_groups > 0 or error_indicators > 0):
+            batch_status['errors'] = self.errors(batch_id)
+            if content is not None:
+                self._process_errors(batch_status['errors'], content, file_data)
+
+        # submit file upload to the upload pool *after* batch status is returned. the upload
+        # pool is shared by all batch jobs and bounded by file_upload_workers. the upload
+        # status returned by file upload will be ignored when running in the pool.
+        file_futures = []
         if file_data:
-            self._file_threads.append(
-                self.submit_thread(
-                    name='submit-files',
-                    target=self.submit_files,
-                    args=(
-                        file_data,
-                        halt_on_error,
-                    ),
-                )
-            )
+            file_futures = self.submit_files_async(file_data, halt_on_error)
+            self._file_futures.extend(file_futures)
+        self._journal_complete(chunk_id, batch_status, file_futures)
 
         # send batch_status to callback
         if callable(callback):
@@ -1860,6 +2628,16 @@ class Batch:
             except Exception as e:
                 self.tcex.log.warning(f'feature=batch, event=callback-error, err="""{e}"""')
 
+    @property
+    def submit_concurrency(self) -> int:
+        """Return the max number of batch jobs submit_all will have in flight at once."""
+        return self._submit_concurrency
+
+    @submit_concurrency.setter
+    def submit_concurrency(self, concurrency: int):
+        """Set the max number of batch jobs submit_all will have in flight at once."""
+        self._submit_concurrency = max(int(concurrency), 1)
+
     def submit_create_and_upload(self, content: dict, halt_on_error: Optional[bool] = True) -> dict:
         """Submit Batch request to ThreatConnect API.
 
@@ -1888,7 +2666,12 @@ class Batch:
         )
 
         try:
-            files = (('config', json.dumps(self.settings)), ('content', json.dumps(content)))
+            if isinstance(content, BatchChunk):
+                # assemble the body from the entities encoded while building the chunk
+                content_json = content.json()
+            else:
+                content_json = json.dumps(content)
+            files = (('config', json.dumps(self.settings)), ('content', content_json))
             params = {'includeAdditional': 'true'}
             r = self.tcex.session.post('/v2/batch/createAndUpload', files=files, params=params)
             if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
@@ -1934,94 +2717,147 @@ class Batch:
 
         return None
 
-    def submit_files(self, file_data: dict, halt_on_error: Optional[bool] = True) -> dict:
-        """Submit Files for Documents and Reports to ThreatConnect API.
+    def submit_file(
+        self, xid: str, content_data: dict, halt_on_error: Optional[bool] = True
+    ) -> dict:
+        """Submit the File for a single Document or Report to ThreatConnect API.
+
+        The file content can be bytes, str, a path (os.PathLike), a file-like object, an
+        iterator of chunks, or a callable that is passed the xid and returns any of these.
+        Paths, file-like objects, and iterators are streamed without buffering the whole file.
 
         Critical Errors
 
         * There is insufficient document storage allocated to this account.
 
         Args:
+            xid: The xid of the Document or Report.
+            content_data: The file data (fileContent, fileName, and type).
             halt_on_error: If True any exception will raise an error.
-            file_data: The file data to be submitted.
 
         Returns:
-            dict: The upload status for each xid.
+            dict: The upload status, size, latency, and throughput for the xid.
         """
-        # check global setting for override
-        if self.halt_on_file_error is not None:
-            halt_on_error = self.halt_on_file_error
-
-        upload_status = []
-        self.tcex.log.info(f'feature=batch, action=submit-files, count={len(file_data)}')
-        for xid, content_data in list(file_data.items()):
-            del file_data[xid]  # win or loose remove the entry
-            status = True
+        # used for debug/testing to prevent upload of previously uploaded file
+        if self.debug and xid in self.saved_xids:
+            self.tcex.log.debug(
+                f'feature=batch-submit-files, action=skip-previously-saved-file, xid={xid}'
+            )
+            return None
 
-            # used for debug/testing to prevent upload of previously uploaded file
-            if self.debug and xid in self.saved_xids:
-                self.tcex.log.debug(
-                    f'feature=batch-submit-files, action=skip-previously-saved-file, xid={xid}'
+        # process the file content
+        content = content_data.get('fileContent')
+        if callable(content):
+            try:
+                content_callable_name = getattr(content, '__name__', repr(content))
+                self.tcex.log.trace(
+                    f'feature=batch-submit-files, method={content_callable_name}, xid={xid}'
+                )
+                content = content(xid)
+            except Exception as e:
+                content = None
+                self.tcex.log.warning(
+                    f'feature=batch, event=file-download-exception, err="""{e}"""'
                 )
-                continue
 
-            # process the file content
-            content = content_data.get('fileContent')
-            if callable(content):
-                try:
-                    content_callable_name = getattr(content, '__name__', repr(content))
-                    self.tcex.log.trace(
-                        f'feature=batch-submit-files, method={content_callable_name}, xid={xid}'
-                    )
-                    content = content_data.get('fileContent')(xid)
-                except Exception as e:
-                    self.tcex.log.warning(
-                        f'feature=batch, event=file-download-exception, err="""{e}"""'
-                    )
+        if content is None:
+            self.tcex.log.warning(f'feature=batch-submit-files, xid={xid}, event=content-null')
+            return {'uploaded': False, 'xid': xid}
 
-            if content is None:
-                upload_status.append({'uploaded': False, 'xid': xid})
-                self.tcex.log.warning(f'feature=batch-submit-files, xid={xid}, event=content-null')
-                continue
-
-            api_branch = 'documents'
-            if content_data.get('type') == 'Report':
-                api_branch = 'reports'
+        api_branch = 'documents'
+        if content_data.get('type') == 'Report':
+            api_branch = 'reports'
 
+        status = True
+        with BatchFileContent(content) as file_content:
             if self.debug and content_data.get('fileName'):
                 # special code for debugging App using batchV2.
                 fqfn = os.path.join(
                     self.debug_path_files,
                     f'''{api_branch}--{xid}--{content_data.get('fileName').replace('/', ':')}''',
                 )
-                with open(fqfn, 'wb') as fh:
-                    if not isinstance(content, bytes):
-                        content = content.encode()
-                    fh.write(content)
+                file_content.write(fqfn)
 
             # Post File
             url = f'/v2/groups/{api_branch}/{xid}/upload'
             headers = {'Content-Type': 'application/octet-stream'}
             params = {'owner': self._owner, 'updateIfExists': 'true'}
-            r = self.submit_file_content('POST', url, content, headers, params, halt_on_error)
-            if r.status_code == 401:
+            start = time.perf_counter()
+            r = self.submit_file_content(
+                'POST', url, file_content.body(), headers, params, halt_on_error
+            )
+            if r is not None and r.status_code == 401:
                 # use PUT method if file already exists
                 self.tcex.log.info('feature=batch, event=401-from-post, action=switch-to-put')
-                r = self.submit_file_content('PUT', url, content, headers, params, halt_on_error)
-            if not r.ok:
-                status = False
-                self.tcex.handle_error(585, [r.status_code, r.text], halt_on_error)
-            elif self.debug and self.enable_saved_file and xid not in self.saved_xids:
-                # save xid "if" successfully uploaded and not already saved
+                r = self.submit_file_content(
+                    'PUT', url, file_content.body(), headers, params, halt_on_error
+                )
+            latency = time.perf_counter() - start
+            size = file_content.measure()
+
+        if r is None:
+            status = False
+        elif not r.ok:
+            status = False
+            self.tcex.handle_error(585, [r.status_code, r.text], halt_on_error)
+        elif self.debug and self.enable_saved_file and xid not in self.saved_xids:
+            # save xid "if" successfully uploaded and not already saved
+            with self._file_lock:
                 self.saved_xids = xid
 
-            self.tcex.log.info(
-                f'feature=batch, event=file-upload, status={r.status_code}, '
-                f'xid={xid}, remaining={len(file_data)}'
-            )
-            upload_status.append({'uploaded': status, 'xid': xid})
+        throughput = int(size / latency) if latency else 0
+        self.tcex.log.info(
+            f'''feature=batch, event=file-upload, status={getattr(r, 'status_code', None)}, '''
+            f'xid={xid}, bytes={size:,}, latency={latency:.3f}, throughput={throughput:,}'
+        )
+        return {
+            'uploaded': status,
+            'xid': xid,
+            'bytes': size,
+            'latency': round(latency, 3),
+            'throughput': throughput,
+        }
+
+    def submit_files(self, file_data: dict, halt_on_error: Optional[bool] = True) -> list:
+        """Submit Files for Documents and Reports to ThreatConnect API.
+
+        The files are uploaded by the shared upload pool (see file_upload_workers) and this
+        method waits for all uploads to complete.
+
+        Args:
+            halt_on_error: If True any exception will raise an error.
+            file_data: The file data to be submitted.
+
+        Returns:
+            list: The upload status, size (bytes), latency (seconds), and throughput
+                (bytes per second) for each xid.
+        """
+        futures = self.submit_files_async(file_data, halt_on_error)
+        upload_status = [f.result() for f in futures]
+        return [status for status in upload_status if status is not None]
+
+    def submit_files_async(self, file_data: dict, halt_on_error: Optional[bool] = True) -> list:
+        """Submit Files for Documents and Reports to the shared upload pool.
+
+        Args:
+            halt_on_error: If True any exception will raise an error.
+            file_data: The file data to be submitted.
 
-        return upload_status
+        Returns:
+            list: A future for each file upload which returns the upload status.
+        """
+        # check global setting for override
+        if self.halt_on_file_error is not None:
+            halt_on_error = self.halt_on_file_error
+
+        futures = []
+        self.tcex.log.info(f'feature=batch, action=submit-files, count={len(file_data)}')
+        for xid, content_data in list(file_data.items()):
+            del file_data[xid]  # win or loose remove the entry
+            futures.append(
+                self.file_pool.submit(self.submit_file, xid, content_data, halt_on_error)
+            )
+        return futures
 
     def submit_file_content(
         self,
@@ -2188,8 +3024,15 @@ class Batch:
             # get timestamp as a string without decimal place and consistent length
             timestamp = str(int(time.time() * 10000000))
             batch_json_file = os.path.join(self.debug_path_batch, f'batch-{timestamp}.json.gz')
-            with gzip.open(batch_json_file, mode='wt', encoding='utf-8') as fh:
-                json.dump(content, fh)
+            with BatchJsonWriter(filename=lambda: batch_json_file) as writer:
+                for entity_type in ['group', 'indicator']:
+                    if isinstance(content, BatchChunk) and content.fragments_valid:
+                        # reuse the JSON encoded entities
+                        entities = content.fragments(entity_type)
+                    else:
+                        entities = content.get(entity_type) or []
+                    for entity in entities:
+                        writer.write(entity_type, entity)
 
     @property
     def group_len(self) -> int:
@@ -2201,6 +3044,13 @@ class Batch:
         """Return the number of current indicators."""
         return len(self.indicators) + len(self.indicators_shelf)
 
+    @property
+    def indicator_merge_count(self) -> int:
+        """Return the number of duplicate indicators merged."""
+        if self._dedup_index is None:
+            return 0
+        return self._dedup_index.merge_count
+
     def __len__(self) -> int:
         """Return the number of groups and indicators."""
         return self.group_len + self.indicator_len
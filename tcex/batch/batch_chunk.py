@@ -0,0 +1,86 @@
+"""ThreatConnect Batch Chunk"""
+# standard library
+import json
+import operator
+from typing import Optional
+
+
+class BatchChunk(dict):
+    """A chunk of Batch data with each entity JSON encoded only once.
+
+    The chunk behaves as the ``{'file': {}, 'group': [], 'indicator': []}`` dict returned by
+    Batch.data, but each group and indicator added with append() is serialized when it is
+    added. The encoded fragments are used to track the chunk size in bytes and to build the
+    JSON body for the upload, so no entity is encoded a second time.
+
+    An entity is frozen once it is added, to change it replace it in the group or indicator
+    list with a new dict. If an entity is added, removed, or replaced in the lists (or keys are
+    added to the chunk) the fragments are no longer used and the chunk is encoded in full.
+    """
+
+    __slots__ = ['_entities', '_fragments', 'size']
+
+    def __init__(self):
+        """Initialize Class properties."""
+        super().__init__(file={}, group=[], indicator=[])
+        self._entities = {'group': [], 'indicator': []}  # the entities the fragments encode
+        self._fragments = {'group': [], 'indicator': []}
+        self.size = 0  # size in bytes of all encoded fragments
+
+    def append(self, entity_type: str, entity_data: dict, fragment: Optional[str] = None) -> int:
+        """Add a group or indicator to the chunk.
+
+        Args:
+            entity_type: The entity type (group or indicator).
+            entity_data: The dict representation of the group or indicator.
+            fragment: The JSON encoded entity data, if it was already encoded.
+
+        Returns:
+            int: The size in bytes of the encoded entity.
+        """
+        if fragment is None:
+            fragment = json.dumps(entity_data)
+        self[entity_type].append(entity_data)
+        self._entities[entity_type].append(entity_data)
+        self._fragments[entity_type].append(fragment)
+
+        # json.dumps escapes all non-ascii characters, so len is the size in bytes
+        size = len(fragment)
+        self.size += size
+        return size
+
+    def fragments(self, entity_type: str) -> list:
+        """Return the encoded fragments for the provided entity type.
+
+        Args:
+            entity_type: The entity type (group or indicator).
+
+        Returns:
+            list: The JSON encoded entities.
+        """
+        return self._fragments[entity_type]
+
+    @property
+    def fragments_valid(self) -> bool:
+        """Return True if the encoded fragments still match the chunk content."""
+        if not set(self.keys()) <= {'file', 'group', 'indicator'}:
+            return False
+        for entity_type, encoded_entities in self._entities.items():
+            entities = self.get(entity_type) or []
+            if len(entities) != len(encoded_entities) or not all(
+                map(operator.is_, entities, encoded_entities)
+            ):
+                return False
+        return True
+
+    def json(self) -> str:
+        """Return the JSON body of the chunk (file data excluded).
+
+        If the chunk content was modified after the entities were added the chunk is
+        encoded in full.
+        """
+        if not self.fragments_valid:
+            return json.dumps({k: v for k, v in self.items() if k != 'file'})
+        groups = ', '.join(self._fragments['group'])
+        indicators = ', '.join(self._fragments['indicator'])
+        return f'{{"group": [{groups}], "indicator": [{indicators}]}}'
@@ -0,0 +1,119 @@
+"""ThreatConnect Batch Entity"""
+# standard library
+import json
+from typing import Optional
+
+from .attribute import Attribute
+from .security_label import SecurityLabel
+from .tag import Tag
+
+
+class BatchEntity:
+    """Base class for the Batch Group and Indicator objects.
+
+    Provides the JSON splicing of the memoized attribute, security label, and tag JSON and the
+    minimal pickle state. The attributes, security labels, and tags are pickled as tuples of
+    their values and the objects are only built when first used after the entity is unpickled.
+
+    Subclasses define the order of the pickle state in *_state_fields*, starting with the
+    data dict.
+    """
+
+    __slots__ = ['_attributes', '_labels', '_pickled', '_tags']
+
+    # the lists pickled as values and built on first use (see __getattr__)
+    _lazy_fields = ['_attributes', '_labels', '_tags']
+
+    # the fields of the pickle state, the first field is the data dict
+    _state_fields = []
+
+    @staticmethod
+    def _json_splice(data: dict, fragments: dict) -> str:
+        """Return the JSON encoded data with the JSON encoded list fragments added."""
+        if not fragments:
+            return json.dumps(data)
+
+        if not fragments.keys().isdisjoint(data):
+            # the lists were added to the data (see data property)
+            data = {k: v for k, v in data.items() if k not in fragments}
+        data_json = json.dumps(data)
+
+        lists = ', '.join(f'"{k}": [{", ".join(v)}]' for k, v in fragments.items())
+        if data_json == '{}':
+            return f'{{{lists}}}'
+        return f'{data_json[:-1]}, {lists}}}'
+
+    def _loaded(self, name: str) -> Optional[list]:
+        """Return the attributes, security labels, or tags without building pickled objects."""
+        if self._pickled is not None and name in self._pickled:
+            return self._pickled[name]
+        return getattr(self, name)
+
+    def _pickle_values(self, name: str) -> Optional[list]:
+        """Return the values of the attributes, security labels, or tags used for pickling."""
+        if self._pickled is not None and name in self._pickled:
+            # the objects were not built since the entity was unpickled
+            return self._pickled[name] or None
+        items = getattr(self, name)
+        if not items:
+            return None
+        if name == '_attributes':
+            return [(a.type, a.value, a.displayed, a.source) for a in items]
+        if name == '_labels':
+            return [(label.name, label.description, label.color) for label in items]
+        return [t.name for t in items]
+
+    def _strip_data(self, data: dict) -> dict:
+        """Return the data without the lists added by the data property."""
+        keys = []
+        if self._loaded('_attributes'):
+            keys.append('attribute')
+        if self._loaded('_labels'):
+            keys.append('securityLabel')
+        if self._loaded('_tags'):
+            keys.append('tag')
+        if not keys or data.keys().isdisjoint(keys):
+            return data
+        return {k: v for k, v in data.items() if k not in keys}
+
+    def __getattr__(self, name: str) -> Optional[list]:
+        """Build the attributes, security labels, or tags of an unpickled entity on first use."""
+        if name not in self._lazy_fields:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        values = self._pickled.get(name)
+        items = None
+        if values and name == '_attributes':
+            items = [Attribute(*a) for a in values]
+        elif values and name == '_labels':
+            items = [SecurityLabel(*label) for label in values]
+        elif values:
+            items = [Tag.shared(tag_name) for tag_name in values]
+        setattr(self, name, items)
+        self._pickled.pop(name, None)
+        return items
+
+    def __getstate__(self) -> tuple:
+        """Return the minimal state used to pickle the entity (e.g., Batch.save()).
+
+        Attributes, security labels, and tags are stored as tuples of their values instead of
+        pickled objects, and the lists added to the data by the data property are dropped.
+        """
+        data_field, *fields = self._state_fields
+        state = [self._strip_data(getattr(self, data_field))]
+        for name in fields:
+            if name in self._lazy_fields:
+                state.append(self._pickle_values(name))
+            else:
+                state.append(getattr(self, name))
+        return tuple(state)
+
+    def __setstate__(self, state: tuple):
+        """Restore the entity from the pickled state."""
+        self._pickled = {}
+        for name, value in zip(self._state_fields, state):
+            if name in self._lazy_fields:
+                # the objects are only built when used (see __getattr__)
+                self._pickled[name] = value
+            else:
+                setattr(self, name, value)
@@ -0,0 +1,136 @@
+"""ThreatConnect Batch Error Index"""
+# standard library
+import json
+import re
+import threading
+from typing import Optional
+
+# the code of an error that has no known errorCode and doesn't match a pattern (never retried)
+UNCLASSIFIED_ERROR_CODE = 'unclassified'
+
+
+class BatchErrorIndex:
+    """Index of Batch errors by xid, classified by Batch error code.
+
+    The errors returned by the batch errors endpoint are matched back to the group or
+    indicator in the submitted chunk using (in order) an xid field on the error, the xid of
+    a JSON encoded errorSource, or a token of the errorSource/errorReason that is an xid or
+    summary/name of an entity in the chunk. The error code is taken from the errorCode field
+    when provided, otherwise it is inferred from the errorReason. An error that can't be
+    classified gets the UNCLASSIFIED_ERROR_CODE.
+
+    Args:
+        error_codes: The Batch error codes and short descriptions.
+    """
+
+    # patterns used to classify errors returned without an errorCode, first match wins
+    _code_patterns = [
+        (re.compile(r'exceed the number of allowed indicators', re.I), '0x1008'),
+        (re.compile(r'permission|not authorized|unauthorized', re.I), '0x1002'),
+        (re.compile(r'json', re.I), '0x1003'),
+        (re.compile(r'file hash', re.I), '0x2003'),
+        (re.compile(r'duplicate', re.I), '0x100A'),
+        (re.compile(r'associat', re.I), '0x1009'),
+        (re.compile(r'not found|does not exist', re.I), '0x1007'),
+        (re.compile(r'invalid|not valid', re.I), 'invalid'),
+        (re.compile(r'file', re.I), '0x100B'),
+    ]
+    _token_split = re.compile(r'''[\s,;"'()\[\]{}]+''')
+
+    def __init__(self, error_codes: dict):
+        """Initialize Class properties."""
+        self.error_codes = error_codes
+
+        # properties
+        self._lock = threading.Lock()
+        self.counts = {}  # error code -> count
+        self.errors = {}  # xid -> list of error records
+        self.unmatched = []  # error records that could not be matched to an entity
+
+    def _code(self, error: dict, entity_type: Optional[str]) -> str:
+        """Return the Batch error code for the error."""
+        code = error.get('errorCode')
+        if code in self.error_codes:
+            return code
+
+        reason = f'''{error.get('errorReason') or ''} {error.get('errorMessage') or ''}'''
+        for pattern, code in self._code_patterns:
+            if pattern.search(reason):
+                if code == 'invalid':
+                    code = '0x1006' if entity_type == 'group' else '0x1005'
+                return code
+        return UNCLASSIFIED_ERROR_CODE
+
+    def _match(self, error: dict, xids: dict, names: dict) -> Optional[str]:
+        """Return the xid of the entity the error was reported for."""
+        xid = error.get('xid')
+        if xid in xids:
+            return xid
+
+        source = error.get('errorSource') or ''
+        if source.startswith('{'):
+            try:
+                xid = json.loads(source).get('xid')
+                if xid in xids:
+                    return xid
+            except (AttributeError, ValueError):
+                pass
+
+        tokens = [
+            t.rstrip('.:')
+            for t in self._token_split.split(f'''{source} {error.get('errorReason') or ''}''')
+        ]
+        for token in tokens:
+            if token in xids:
+                return token
+        for token in tokens:
+            if token in names:
+                return names.get(token)
+        return None
+
+    def add(self, errors: list, content: dict) -> list:
+        """Add the errors for a chunk to the index.
+
+        Args:
+            errors: The errors returned from the ThreatConnect API for the batch job.
+            content: The dict of groups and indicator data submitted in the batch job.
+
+        Returns:
+            list: The error records (xid, type, code, description, reason, and source).
+        """
+        if not errors:
+            return []
+
+        xids = {}  # xid -> entity type
+        names = {}  # summary/name -> xid
+        for entity_type in ['group', 'indicator']:
+            for entity in content.get(entity_type) or []:
+                xids[entity.get('xid')] = entity_type
+                names.setdefault(entity.get('name') or entity.get('summary'), entity.get('xid'))
+
+        records = []
+        for error in errors:
+            xid = self._match(error, xids, names)
+            code = self._code(error, xids.get(xid))
+            record = {
+                'xid': xid,
+                'type': xids.get(xid),
+                'code': code,
+                'description': self.error_codes.get(code, 'Unclassified Error'),
+                'reason': error.get('errorReason'),
+                'source': error.get('errorSource'),
+            }
+            records.append(record)
+
+        with self._lock:
+            for record in records:
+                self.counts[record['code']] = self.counts.get(record['code'], 0) + 1
+                if record['xid'] is None:
+                    self.unmatched.append(record)
+                else:
+                    self.errors.setdefault(record['xid'], []).append(record)
+        return records
+
+    def get(self, xid: str) -> list:
+        """Return the error records for the xid."""
+        return self.errors.get(xid, [])
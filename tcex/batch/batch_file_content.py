@@ -0,0 +1,151 @@
+"""ThreatConnect Batch File Content"""
+# standard library
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Iterator, Optional, Union
+
+
+class BatchFileContent:
+    """Streamable file content for a Batch Document or Report upload.
+
+    The content can be provided as bytes, str, a path (os.PathLike), a file-like object, or
+    an iterator of bytes/str chunks. Paths and file-like objects are streamed directly as the
+    request body. Iterators are streamed as a chunked body while being copied to a spooled
+    temporary file, so the upload can be sent again (e.g., PUT after a 401 on POST) without
+    holding the whole file in memory.
+
+    Args:
+        content: The file content.
+        spool_size: The max size in bytes of iterator content to hold in memory before the
+            copy is moved to disk.
+    """
+
+    def __init__(
+        self,
+        content: Union[bytes, str, os.PathLike, BinaryIO, Iterator[Union[bytes, str]]],
+        spool_size: Optional[int] = 1_048_576,
+    ):
+        """Initialize Class properties."""
+        self.content = content
+        self.spool_size = spool_size
+
+        if hasattr(content, 'read') and not (hasattr(content, 'seekable') and content.seekable()):
+            # non-seekable streams are handled as iterators so they can be replayed from spool
+            self.content = iter(lambda: content.read(65_536), content.read(0))
+
+        # properties
+        self._fh = None  # file handle for path content
+        self._position = None  # start position of file-like content
+        self._spool = None  # copy of iterator content
+        self._spool_complete = False
+        self.size = 0  # size in bytes of the last body sent
+
+    @staticmethod
+    def _encode(chunk: Union[bytes, str]) -> bytes:
+        """Return the chunk as bytes."""
+        if isinstance(chunk, str):
+            return chunk.encode()
+        return chunk
+
+    def _file_like(self) -> BinaryIO:
+        """Return the file-like object for path or file-like content."""
+        if isinstance(self.content, os.PathLike):
+            if self._fh is None:
+                self._fh = open(self.content, 'rb')  # pylint: disable=consider-using-with
+            return self._fh
+        return self.content
+
+    def _spool_chunks(self) -> Iterator[bytes]:
+        """Yield the iterator content while copying it to the spool."""
+        self._spool = tempfile.SpooledTemporaryFile(  # pylint: disable=consider-using-with
+            max_size=self.spool_size
+        )
+        for chunk in self.content:
+            chunk = self._encode(chunk)
+            self._spool.write(chunk)
+            self.size += len(chunk)
+            yield chunk
+        self._spool_complete = True
+
+    def _spool_drain(self) -> None:
+        """Copy any iterator content not consumed by the last request to the spool."""
+        if self._spool is None:
+            for _ in self._spool_chunks():
+                pass
+        elif not self._spool_complete:
+            self._spool.seek(0, os.SEEK_END)
+            for chunk in self.content:
+                self._spool.write(self._encode(chunk))
+            self._spool_complete = True
+
+    def body(self) -> Union[bytes, str, BinaryIO, Iterator[bytes]]:
+        """Return the request body, positioned at the start of the content.
+
+        Returns:
+            Union[bytes, str, BinaryIO, Iterator[bytes]]: The body for the upload request.
+        """
+        if isinstance(self.content, (bytes, str)):
+            self.size = len(self._encode(self.content))
+            return self.content
+
+        if isinstance(self.content, os.PathLike) or hasattr(self.content, 'read'):
+            fh = self._file_like()
+            if self._position is None:
+                self._position = fh.tell() if fh.seekable() else 0
+            elif fh.seekable():
+                fh.seek(self._position)
+            return fh
+
+        # iterator content is streamed on the first request and replayed from the spool
+        self.size = 0
+        if self._spool is None:
+            return self._spool_chunks()
+        self._spool_drain()
+        self._spool.seek(0)
+        return self._spool
+
+    def close(self) -> None:
+        """Close any file handles opened for the content."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+    def measure(self) -> int:
+        """Return the size in bytes of the last body sent."""
+        if isinstance(self.content, os.PathLike) or hasattr(self.content, 'read'):
+            fh = self._file_like()
+            if fh.seekable():
+                self.size = fh.tell() - (self._position or 0)
+        elif self._spool is not None and self._spool_complete:
+            self.size = self._spool.seek(0, os.SEEK_END)
+        return self.size
+
+    def write(self, fqfn: str) -> None:
+        """Write the content to a file, leaving the content available for upload.
+
+        Args:
+            fqfn: The fully qualified filename to write.
+        """
+        with open(fqfn, 'wb') as fh:
+            if isinstance(self.content, (bytes, str)):
+                fh.write(self._encode(self.content))
+            elif isinstance(self.content, os.PathLike) or hasattr(self.content, 'read'):
+                src = self.body()
+                shutil.copyfileobj(src, fh)
+                self.body()  # rewind for the upload
+            else:
+                self._spool_drain()
+                self._spool.seek(0)
+                shutil.copyfileobj(self._spool, fh)
+
+    def __enter__(self) -> 'BatchFileContent':
+        """Return the content for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close any file handles opened for the content."""
+        self.close()
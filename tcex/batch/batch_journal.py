@@ -0,0 +1,226 @@
+"""ThreatConnect Batch Journal"""
+# standard library
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+
+class BatchJournal:
+    """Checkpoint journal recording the progress of each Batch chunk on disk.
+
+    Each chunk is recorded with the xids of its groups and indicators before it is submitted,
+    then updated with the batch id once the job is created and with the final status once the
+    job (and any file uploads) are complete. The journal is kept in a SQLite database (WAL
+    mode) that is committed on every update, so it survives the App being killed midway
+    through a submit.
+
+    Chunk Status:
+    * Pending - recorded, but no batch id was returned (resubmit).
+    * Submitted - the batch job was created and may still be running (resume polling).
+    * Completed - the batch job completed and all files were uploaded (skip).
+    * Failed - the batch job or a file upload failed (resubmit).
+
+    Each chunk is recorded with the id of the run (the BatchJournal instance) that submitted it.
+    Only xids in chunks completed by a previous run are skipped, so an xid submitted again in
+    the same run (e.g., requeued after an error) is not dropped. Chunks last updated more than
+    max_age seconds ago are removed when the journal is opened, so a journal left by a failed
+    run isn't used by runs long after it.
+
+    Args:
+        fqfn: The fully qualified filename of the journal.
+        max_age: The seconds a chunk is kept after it was last updated (None to keep all).
+    """
+
+    def __init__(self, fqfn: str, max_age: Optional[float] = 86_400):
+        """Initialize Class properties."""
+        self.fqfn = fqfn
+        self.max_age = max_age
+
+        # properties
+        self._completed_count = None
+        self._conn = None
+        self._lock = threading.RLock()
+        self.run_id = uuid.uuid4().hex
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Return the SQLite connection, creating the journal tables if required."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.fqfn, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS chunk ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id INTEGER, status TEXT NOT NULL, '
+                'entity_count INTEGER, error_count INTEGER, file_count INTEGER, reason TEXT, '
+                'run_id TEXT, created REAL, updated REAL)'
+            )
+            # the latest chunk for each xid
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS xid (xid TEXT PRIMARY KEY, chunk_id INTEGER NOT NULL)'
+            )
+            if self.max_age is not None:
+                # remove the expired chunks of previous runs
+                expired = time.time() - self.max_age
+                self._conn.execute(
+                    'DELETE FROM xid WHERE chunk_id IN (SELECT id FROM chunk WHERE updated < ?)',
+                    (expired,),
+                )
+                self._conn.execute('DELETE FROM chunk WHERE updated < ?', (expired,))
+            self._conn.commit()
+        return self._conn
+
+    def _update(self, chunk_id: int, status: str, **kwargs) -> None:
+        """Update the status (and any provided columns) of a chunk."""
+        columns = {'status': status, 'updated': time.time(), **kwargs}
+        with self._lock:
+            self.conn.execute(
+                f'''UPDATE chunk SET {', '.join(f'{k} = ?' for k in columns)} WHERE id = ?''',
+                list(columns.values()) + [chunk_id],
+            )
+            self.conn.commit()
+
+    def chunks(self, status: Optional[str] = None) -> List[Tuple[int, Optional[int], str, int]]:
+        """Return the id, batch id, status, and file count of the recorded chunks.
+
+        Args:
+            status: Only return chunks with the provided status.
+
+        Returns:
+            list: A (chunk id, batch id, status, file count) tuple for each chunk in
+                submission order.
+        """
+        sql = 'SELECT id, batch_id, status, file_count FROM chunk'
+        params = []
+        if status is not None:
+            sql += ' WHERE status = ?'
+            params.append(status)
+        with self._lock:
+            return self.conn.execute(f'{sql} ORDER BY id', params).fetchall()
+
+    def close(self) -> None:
+        """Close the journal, keeping the file for the next execution."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def complete(self, chunk_id: int, batch_status: dict) -> None:
+        """Record a completed chunk.
+
+        Args:
+            chunk_id: The id of the chunk.
+            batch_status: The batch status returned from the ThreatConnect API.
+        """
+        self._update(chunk_id, 'Completed', error_count=batch_status.get('errorCount', 0))
+
+    @property
+    def completed_count(self) -> int:
+        """Return the number of xids in chunks completed by previous runs (when opened)."""
+        if self._completed_count is None:
+            with self._lock:
+                self._completed_count = self.conn.execute(
+                    'SELECT COUNT(*) FROM xid JOIN chunk ON chunk.id = xid.chunk_id '
+                    'WHERE chunk.status = ? AND chunk.run_id != ?',
+                    ('Completed', self.run_id),
+                ).fetchone()[0]
+        return self._completed_count
+
+    def delete(self) -> None:
+        """Close and delete the journal."""
+        self.close()
+        for suffix in ['', '-shm', '-wal']:
+            try:
+                os.remove(f'{self.fqfn}{suffix}')
+            except OSError:
+                pass
+
+    def fail(self, chunk_id: int, reason: str) -> None:
+        """Record a failed chunk.
+
+        Args:
+            chunk_id: The id of the chunk.
+            reason: The reason the chunk failed.
+        """
+        self._update(chunk_id, 'Failed', reason=reason)
+
+    def is_completed(self, xid: str) -> bool:
+        """Return True if the xid was in a chunk completed by a previous run."""
+        if not self.completed_count:
+            return False
+
+        with self._lock:
+            return (
+                self.conn.execute(
+                    'SELECT 1 FROM xid JOIN chunk ON chunk.id = xid.chunk_id '
+                    'WHERE xid.xid = ? AND chunk.status = ? AND chunk.run_id != ?',
+                    (xid, 'Completed', self.run_id),
+                ).fetchone()
+                is not None
+            )
+
+    @property
+    def resumable(self) -> bool:
+        """Return True if the latest chunk for any xid has not completed."""
+        with self._lock:
+            return (
+                self.conn.execute(
+                    'SELECT 1 FROM xid JOIN chunk ON chunk.id = xid.chunk_id '
+                    'WHERE chunk.status != ? LIMIT 1',
+                    ('Completed',),
+                ).fetchone()
+                is not None
+            )
+
+    def start(self, xids: Iterable[str], file_count: Optional[int] = 0) -> int:
+        """Record a chunk before it is submitted.
+
+        Args:
+            xids: The xids of the groups and indicators in the chunk.
+            file_count: The number of files to upload for the chunk.
+
+        Returns:
+            int: The id of the chunk.
+        """
+        xids = list(xids)
+        now = time.time()
+        with self._lock:
+            cursor = self.conn.execute(
+                'INSERT INTO chunk (status, entity_count, file_count, run_id, created, updated) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ('Pending', len(xids), file_count, self.run_id, now, now),
+            )
+            chunk_id = cursor.lastrowid
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO xid (xid, chunk_id) VALUES (?, ?)',
+                ((xid, chunk_id) for xid in xids),
+            )
+            self.conn.commit()
+        return chunk_id
+
+    def submitted(self, chunk_id: int, batch_id: int) -> None:
+        """Record the batch id of a submitted chunk.
+
+        Args:
+            chunk_id: The id of the chunk.
+            batch_id: The ID returned from the ThreatConnect API for the batch job.
+        """
+        self._update(chunk_id, 'Submitted', batch_id=batch_id)
+
+    def summary(self) -> dict:
+        """Return the number of chunks for each status."""
+        with self._lock:
+            return dict(
+                self.conn.execute('SELECT status, COUNT(*) FROM chunk GROUP BY status').fetchall()
+            )
+
+    @staticmethod
+    def xids(content: dict) -> List[str]:
+        """Return the xids of the groups and indicators in the chunk content."""
+        return [
+            entity.get('xid')
+            for entity_type in ['group', 'indicator']
+            for entity in content.get(entity_type) or []
+        ]
@@ -0,0 +1,266 @@
+"""ThreatConnect Batch JSON Writer"""
+# standard library
+import gzip
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, TextIO, Union
+
+
+class BatchJsonWriter:
+    """Stream groups and indicators into gzip compressed batch JSON files.
+
+    Entities are written one at a time into a ``{"group": [...], "indicator": [...]}`` document
+    so memory use does not depend on the number of entities written. When a file reaches the
+    max count or max size a new file is started on the next call to rotate(). Groups written
+    after indicators also start a new file so each file stays a valid batch document.
+
+    Args:
+        filename: A callable that returns the fully qualified filename for each new file.
+        compress_level: The gzip compression level (1-9).
+        max_count: The max number of entities per file.
+        max_size: The max size in bytes of uncompressed entity data per file.
+        write_callback: A callable that is passed the filename of each completed file.
+    """
+
+    def __init__(
+        self,
+        filename: Callable[[], str],
+        compress_level: Optional[int] = 9,
+        max_count: Optional[int] = None,
+        max_size: Optional[int] = None,
+        write_callback: Optional[Callable[[str], None]] = None,
+    ):
+        """Initialize Class properties."""
+        self.compress_level = compress_level
+        self.filename = filename
+        self.max_count = max_count
+        self.max_size = max_size
+        self.write_callback = write_callback
+
+        # properties
+        self._count = 0  # entities in current file
+        self._fh = None
+        self._fqfn = None
+        self._section = None  # current JSON array (group or indicator)
+        self._section_count = 0  # entities in current JSON array
+        self._size = 0  # bytes of entity data in current file
+        self.count = {'group': 0, 'indicator': 0}
+        self.files = []
+
+    def _complete(self) -> None:
+        """Close the current file and send the callback the filename."""
+        self._fh.close()
+        self.files.append(self._fqfn)
+
+        # send callback the filename
+        if callable(self.write_callback):
+            self.write_callback(self._fqfn)
+
+    def _handle(self) -> TextIO:
+        """Return the text handle the current file is written to."""
+        return gzip.open(self._fqfn, mode='wt', encoding='utf-8', compresslevel=self.compress_level)
+
+    def _open(self) -> None:
+        """Open a new file and start the group array."""
+        self._fqfn = self.filename()
+        self._fh = self._handle()
+        self._fh.write('{"group": [')
+        self._count = 0
+        self._section = 'group'
+        self._section_count = 0
+        self._size = 0
+
+    @property
+    def full(self) -> bool:
+        """Return True if the current file has reached the max count or size."""
+        return (self.max_count is not None and self._count >= self.max_count) or (
+            self.max_size is not None and self._size >= self.max_size
+        )
+
+    def close(self) -> None:
+        """Finish the JSON document and close the current file."""
+        if self._fh is None:
+            return
+
+        if self._section == 'group':
+            self._fh.write('], "indicator": []}')
+        else:
+            self._fh.write(']}')
+        self._complete()
+        self._fh = None
+
+    def rotate(self) -> bool:
+        """Close the current file if it is full.
+
+        Callers should only rotate between entities that can be split across files (e.g., not
+        in the middle of a cluster of associated groups).
+
+        Returns:
+            bool: True if the file was closed.
+        """
+        if self._fh is not None and self.full:
+            self.close()
+            return True
+        return False
+
+    def write(self, entity_type: str, entity_data: Union[dict, str]) -> int:
+        """Write a group or indicator to the current file.
+
+        Args:
+            entity_type: The entity type (group or indicator).
+            entity_data: The dict representation of the entity or the JSON encoded entity.
+
+        Returns:
+            int: The size in bytes of the encoded entity.
+        """
+        if isinstance(entity_data, str):
+            fragment = entity_data
+        else:
+            fragment = json.dumps(entity_data)
+
+        if self._fh is not None and entity_type == 'group' and self._section == 'indicator':
+            # groups can't be added once the indicator array is started
+            self.close()
+
+        if self._fh is None:
+            self._open()
+
+        if entity_type != self._section:
+            self._fh.write('], "indicator": [')
+            self._section = entity_type
+            self._section_count = 0
+
+        if self._section_count:
+            self._fh.write(', ')
+        self._fh.write(fragment)
+
+        size = len(fragment)
+        self._count += 1
+        self._section_count += 1
+        self._size += size
+        self.count[entity_type] += 1
+        return size
+
+    def __enter__(self) -> 'BatchJsonWriter':
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the current file."""
+        self.close()
+
+
+class _Buffer(list):
+    """The pieces of a file written by ShardedBatchJsonWriter, held until a worker writes them."""
+
+    write = list.append
+
+    def close(self) -> None:
+        """Keep the pieces (the buffer is passed to the worker)."""
+
+
+class ShardedBatchJsonWriter(BatchJsonWriter):
+    """Stream groups and indicators into batch JSON files compressed and written in parallel.
+
+    Entities are encoded on the calling thread and the encoded pieces of the current file are
+    buffered in memory. When the file is closed the pieces are streamed through a gzip stream
+    and written by a pool of worker threads (zlib releases the GIL, so files are compressed on
+    multiple cores) while the next file is filled. Filenames are assigned in order when each
+    file is started, so the names are the same as for BatchJsonWriter, and the write callback
+    is called (on a worker thread) as each file is written.
+
+    Closing a file blocks while the buffered files waiting to be written hold more than
+    max_buffered_size bytes, so memory use is bounded by bytes instead of by the number of
+    files (a single file larger than the max is always accepted).
+
+    Args:
+        filename: A callable that returns the fully qualified filename for each new file.
+        compress_level: The gzip compression level (1-9).
+        max_count: The max number of entities per file.
+        max_size: The max size in bytes of uncompressed entity data per file.
+        write_callback: A callable that is passed the filename of each completed file.
+        workers: The number of threads compressing and writing files.
+        max_buffered_size: The max size in bytes of the files waiting to be written.
+    """
+
+    def __init__(
+        self,
+        filename: Callable[[], str],
+        compress_level: Optional[int] = 9,
+        max_count: Optional[int] = None,
+        max_size: Optional[int] = None,
+        write_callback: Optional[Callable[[str], None]] = None,
+        workers: Optional[int] = None,
+        max_buffered_size: Optional[int] = 256 * 1024 * 1024,
+    ):
+        """Initialize Class properties."""
+        super().__init__(filename, compress_level, max_count, max_size, write_callback)
+        self.max_buffered_size = max_buffered_size
+        self.workers = workers or os.cpu_count() or 1
+
+        # properties
+        self._buffered = 0  # bytes of the files waiting to be written
+        self._buffered_condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='batch-json-writer')
+        self._futures = []
+
+    def _complete(self) -> None:
+        """Submit the buffered file to be compressed and written by a worker thread."""
+        pieces = self._fh
+        size = sum(len(piece) for piece in pieces)
+        with self._buffered_condition:
+            # block while the buffered files are waiting to be written
+            self._buffered_condition.wait_for(
+                lambda: not self._buffered or self._buffered + size <= self.max_buffered_size
+            )
+            self._buffered += size
+        self.files.append(self._fqfn)
+        self._futures.append(self._executor.submit(self._write_file, self._fqfn, pieces, size))
+
+    def _handle(self) -> _Buffer:
+        """Return the in-memory buffer the current file is written to."""
+        return _Buffer()
+
+    def _write_file(self, fqfn: str, pieces: List[str], size: int) -> None:
+        """Compress and write a file, then send the callback the filename."""
+        temp_fqfn = f'{fqfn}.tmp'
+        try:
+            # write to a temporary file so the file is complete when it appears
+            with open(temp_fqfn, mode='wb') as raw, gzip.GzipFile(
+                filename='', mode='wb', compresslevel=self.compress_level, fileobj=raw
+            ) as gz, io.TextIOWrapper(gz, encoding='utf-8') as fh:
+                fh.writelines(pieces)
+            os.replace(temp_fqfn, fqfn)
+        except Exception:
+            # don't leave a partially written file behind
+            if os.path.isfile(temp_fqfn):
+                os.remove(temp_fqfn)
+            raise
+        finally:
+            with self._buffered_condition:
+                self._buffered -= size
+                self._buffered_condition.notify_all()
+
+        # send callback the filename
+        if callable(self.write_callback):
+            self.write_callback(fqfn)
+
+    def wait(self) -> None:
+        """Close the current file and wait for all files to be written.
+
+        Any exception raised writing a file (or by the write callback) is raised.
+        """
+        self.close()
+        futures, self._futures = self._futures, []
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the current file and wait for all files to be written."""
+        self.wait()
@@ -0,0 +1,272 @@
+"""ThreatConnect Batch Poller"""
+# standard library
+import heapq
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class BatchPollJob:
+    """A batch job tracked by the BatchPoller."""
+
+    __slots__ = [
+        'back_off',
+        'batch_id',
+        'callback',
+        'future',
+        'halt_on_error',
+        'poll_count',
+        'retry_seconds',
+        'start',
+        'timeout',
+    ]
+
+    def __init__(
+        self,
+        batch_id: int,
+        callback: Optional[Callable[[dict], Any]],
+        halt_on_error: bool,
+        retry_seconds: int,
+        back_off: float,
+        timeout: int,
+    ):
+        """Initialize Class properties."""
+        self.back_off = back_off
+        self.batch_id = batch_id
+        self.callback = callback
+        self.future = Future()
+        self.halt_on_error = halt_on_error
+        self.poll_count = 0
+        self.retry_seconds = retry_seconds
+        self.start = time.time()
+        self.timeout = timeout
+
+
+class BatchPoller:
+    """Background poller that tracks the status of many batch jobs at once.
+
+    A single daemon thread issues one status request per batch id each time the job is due,
+    adjusting the poll interval from the observed completion times of previous jobs. Each job
+    resolves a concurrent.futures.Future with the batch status returned from the API. An
+    optional callback is run on a separate (single) callback thread so slow callbacks do not
+    delay polling of other jobs; the future is resolved after the callback returns (or with
+    the exception raised by the callback).
+
+    Args:
+        tcex: An instance of TcEx object.
+        max_interval: The max number of seconds between polls of an incomplete job.
+        timeout: The default number of seconds before a job poll should timeout.
+    """
+
+    def __init__(
+        self,
+        tcex: object,
+        max_interval: Optional[int] = 20,
+        timeout: Optional[int] = 3600,
+    ):
+        """Initialize Class properties."""
+        self.tcex = tcex
+        self.max_interval = max_interval
+        self.timeout = timeout
+
+        # properties
+        self._callback_pool = None
+        self._condition = threading.Condition()
+        self._queue = []  # heap of (next poll time, sequence, job)
+        self._sequence = 0
+        self._shutdown = False
+        self._thread = None
+        self.interval = None  # learned initial poll interval
+        self.interval_times = []  # last 5 (weighted) completion times
+
+    @staticmethod
+    def _complete(job: BatchPollJob, data: dict) -> None:
+        """Run the job callback and resolve the job future."""
+        try:
+            job.callback(data)
+        except Exception as e:
+            job.future.set_exception(e)
+            return
+        job.future.set_result(data)
+
+    def _learn(self, job: BatchPollJob) -> None:
+        """Update the initial poll interval from the completion time of the job."""
+        # store last 5 poll times to use in calculating average poll time
+        modifier = (time.time() - job.start) * 0.7
+        self.interval_times = self.interval_times[-4:] + [modifier]
+
+        weights = [1]
+        poll_interval_time_weighted_sum = 0
+        for poll_interval_time in self.interval_times:
+            poll_interval_time_weighted_sum += poll_interval_time * weights[-1]
+            # weights will be [1, 1.5, 2.25, 3.375, 5.0625] for all 5 poll times depending
+            # on how many poll times are available.
+            weights.append(weights[-1] * 1.5)
+
+        # pop off the last weight so its not added in to the sum
+        weights.pop()
+
+        # calculate the weighted average of the last 5 poll times
+        self.interval = max(math.floor(poll_interval_time_weighted_sum / sum(weights)), 1)
+
+        if job.poll_count == 1:
+            # if completed on first poll, reduce poll interval.
+            self.interval = max(self.interval * 0.85, 1)
+
+    def _poll(self, job: BatchPollJob) -> Optional[dict]:
+        """Request the job status, returning the data when the job is complete.
+
+        Returns:
+            Optional[dict]: The batch status data when the job is done, else None.
+        """
+        job.poll_count += 1
+        elapsed = time.time() - job.start
+        self.tcex.log.info(
+            f'feature=batch, event=progress, batch-id={job.batch_id}, poll-time={elapsed:.0f}'
+        )
+
+        data = {}
+        try:
+            # retrieve job status
+            r = self.tcex.session.get(
+                f'/v2/batch/{job.batch_id}', params={'includeAdditional': 'true'}
+            )
+            if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
+                self.tcex.handle_error(545, [r.status_code, r.text], job.halt_on_error)
+                return data
+            data = r.json()
+            if data.get('status') != 'Success':
+                self.tcex.handle_error(545, [r.status_code, r.text], job.halt_on_error)
+        except Exception as e:
+            self.tcex.handle_error(540, [e], job.halt_on_error)
+
+        if data.get('data', {}).get('batchStatus', {}).get('status') == 'Completed':
+            self._learn(job)
+            self.tcex.log.debug(f'feature=batch, poll-time={elapsed:.0f}, status={data}')
+            return data
+
+        # time out poll to prevent App running indefinitely
+        if elapsed >= job.timeout:
+            self.tcex.handle_error(550, [job.timeout], True)
+
+        return None
+
+    def _run(self) -> None:
+        """Poll each job when it is due until the poller is shutdown."""
+        while True:
+            with self._condition:
+                while not self._shutdown and (not self._queue or self._queue[0][0] > time.time()):
+                    timeout = self._queue[0][0] - time.time() if self._queue else None
+                    self._condition.wait(timeout)
+                if self._shutdown:
+                    return
+                _, _, job = heapq.heappop(self._queue)
+
+            try:
+                data = self._poll(job)
+            except Exception as e:
+                job.future.set_exception(e)
+                continue
+
+            if data is not None:
+                if job.callback is not None:
+                    self.callback_pool.submit(self._complete, job, data)
+                else:
+                    job.future.set_result(data)
+                continue
+
+            # update poll interval for retry with max poll time
+            interval = min(
+                job.retry_seconds + int(job.poll_count * job.back_off), self.max_interval
+            )
+            self._schedule(job, interval)
+
+    def _schedule(self, job: BatchPollJob, interval: float) -> None:
+        """Add the job to the poll queue."""
+        with self._condition:
+            self._sequence += 1
+            heapq.heappush(self._queue, (time.time() + interval, self._sequence, job))
+            self._condition.notify()
+
+    @property
+    def callback_pool(self) -> ThreadPoolExecutor:
+        """Return the thread pool used to run job callbacks."""
+        if self._callback_pool is None:
+            self._callback_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='batch-poll-callback'
+            )
+        return self._callback_pool
+
+    @property
+    def pending(self) -> int:
+        """Return the number of jobs waiting on a completed status."""
+        with self._condition:
+            return len(self._queue)
+
+    def shutdown(self, wait: Optional[bool] = True) -> None:
+        """Stop the poller thread, cancelling any pending jobs.
+
+        Args:
+            wait: If True wait for the poller and callback threads to finish.
+        """
+        with self._condition:
+            self._shutdown = True
+            for _, _, job in self._queue:
+                job.future.cancel()
+            self._queue = []
+            self._condition.notify()
+
+        if wait and self._thread is not None:
+            self._thread.join()
+        if self._callback_pool is not None:
+            self._callback_pool.shutdown(wait=wait)
+
+    def submit(
+        self,
+        batch_id: int,
+        callback: Optional[Callable[[dict], Any]] = None,
+        halt_on_error: Optional[bool] = True,
+        interval: Optional[float] = None,
+        retry_seconds: Optional[int] = None,
+        back_off: Optional[float] = None,
+        timeout: Optional[int] = None,
+    ) -> Future:
+        """Track the status of a batch job.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the batch job.
+            callback: A method that is passed the batch status data when the job is complete.
+            halt_on_error: If True any exception will be set on the future.
+            interval: The number of seconds before the first poll, defaults to the
+                learned interval (or 15 seconds when no job has completed).
+            retry_seconds: The base number of seconds used for retries when job is not completed.
+            back_off: A multiplier to use for backing off on
+                each poll attempt when job has not completed.
+            timeout: The number of seconds before the poll should timeout.
+
+        Returns:
+            Future: A future resolved with the batch status data when the job is complete.
+        """
+        job = BatchPollJob(
+            batch_id=batch_id,
+            callback=callback,
+            halt_on_error=halt_on_error,
+            retry_seconds=int(5 if retry_seconds is None else retry_seconds),
+            back_off=float(2.5 if back_off is None else back_off),
+            timeout=int(self.timeout if timeout is None else timeout),
+        )
+
+        if interval is None:
+            # if not able to use a learned poll interval default to 15 seconds
+            interval = self.interval or 15
+
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('Batch poller has been shutdown.')
+            if self._thread is None:
+                self._thread = threading.Thread(name='batch-poller', target=self._run, daemon=True)
+                self._thread.start()
+        self._schedule(job, interval)
+        return job.future
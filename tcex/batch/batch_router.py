@@ -0,0 +1,189 @@
+"""ThreatConnect Batch Router"""
+# standard library
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Union
+
+from .batch import Batch
+
+
+class BatchRouter:
+    """Route groups and indicators to a Batch per owner and submit the owners concurrently.
+
+    Each owner has its own Batch (and chunk pipeline), created on first use with the provided
+    Batch settings. On submit the pipeline of each owner is run on a worker thread with at most
+    *concurrency* owners submitting at once, so writing the same data into several owners
+    takes about as long as the slowest owner. Each owner pipeline has up to submit_concurrency
+    (default 1) batch jobs in flight, which caps the batch jobs in flight across all owners.
+
+    Args:
+        tcex: An instance of TcEx object.
+        concurrency: The max number of owners to submit at once.
+        batch_callback: A method called with each new Batch (e.g., to change the Batch
+            settings).
+        action (kwargs: str): Action for the batch job ['Create', 'Delete'].
+        attribute_write_type (kwargs: str): Write type for attributes ['Append', 'Replace'].
+        halt_on_error (kwargs: bool): If True, any batch error will halt the batch job.
+        security_label_write_type (kwargs: str): Write type for labels ['Append', 'Replace'].
+        tag_write_type (kwargs: str): Write type for tags ['Append', 'Replace'].
+    """
+
+    def __init__(
+        self,
+        tcex: object,
+        concurrency: Optional[int] = 4,
+        batch_callback: Optional[Callable[[Batch], None]] = None,
+        **kwargs,
+    ):
+        """Initialize Class properties."""
+        self.tcex = tcex
+        self.batch_callback = batch_callback
+        self.batch_kwargs = kwargs
+        self.concurrency = concurrency
+
+        # properties
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def add_group(self, owner: str, group_data: dict, **kwargs) -> Union[dict, object]:
+        """Add a group to the Batch of the owner.
+
+        Args:
+            owner: The ThreatConnect owner for the group.
+            group_data: The full Group data (see Batch.add_group).
+
+        Returns:
+            Union[dict, object]: The new group dict/object or the previously stored dict/object.
+        """
+        return self.batch(owner).add_group(group_data, **kwargs)
+
+    def add_indicator(self, owner: str, indicator_data: dict, **kwargs) -> Union[dict, object]:
+        """Add an indicator to the Batch of the owner.
+
+        Args:
+            owner: The ThreatConnect owner for the indicator.
+            indicator_data: The full Indicator data (see Batch.add_indicator).
+
+        Returns:
+            Union[dict, object]: The new indicator dict/object or the previously stored
+                dict/object.
+        """
+        return self.batch(owner).add_indicator(indicator_data, **kwargs)
+
+    def batch(self, owner: str) -> Batch:
+        """Return the Batch for the owner, creating it on first use.
+
+        Args:
+            owner: The ThreatConnect owner.
+
+        Returns:
+            Batch: The Batch instance for the owner.
+        """
+        batch = self._batches.get(owner)
+        if batch is None:
+            with self._lock:
+                batch = self._batches.get(owner)
+                if batch is None:
+                    batch = self.tcex.batch(owner, **self.batch_kwargs)
+                    if self.batch_callback is not None:
+                        self.batch_callback(batch)
+                    self._batches[owner] = batch
+        return batch
+
+    @property
+    def batches(self) -> dict:
+        """Return the Batch for each owner."""
+        return dict(self._batches)
+
+    def close(self) -> None:
+        """Cleanup the Batch of each owner."""
+        for batch in self._batches.values():
+            batch.close()
+
+    def group(self, owner: str, group_type: str, name: str, **kwargs) -> object:
+        """Add Group data to the Batch of the owner.
+
+        Args:
+            owner: The ThreatConnect owner for the group.
+            group_type: The ThreatConnect define Group type.
+            name: The name for this Group.
+
+        Returns:
+            object: An instance of one of the Group classes.
+        """
+        return self.batch(owner).group(group_type, name, **kwargs)
+
+    def indicator(self, owner: str, indicator_type: str, summary: str, **kwargs) -> object:
+        """Add Indicator data to the Batch of the owner.
+
+        Args:
+            owner: The ThreatConnect owner for the indicator.
+            indicator_type: The ThreatConnect define Indicator type.
+            summary: The value for this Indicator.
+
+        Returns:
+            object: An instance of one of the Indicator classes.
+        """
+        return self.batch(owner).indicator(indicator_type, summary, **kwargs)
+
+    @property
+    def owners(self) -> list:
+        """Return the owners with a Batch."""
+        return list(self._batches)
+
+    def submit_all(
+        self,
+        poll: Optional[bool] = True,
+        errors: Optional[bool] = True,
+        process_files: Optional[bool] = True,
+        halt_on_error: Optional[bool] = True,
+    ) -> dict:
+        """Submit the Batch of each owner concurrently (see Batch.submit_all).
+
+        The pipelines of all owners are allowed to complete before any error is raised, so a
+        failure in one owner does not leave the other owners partially submitted. The results
+        of each owner are logged and, if *halt_on_error* is True and any owner failed, the
+        Batch of every owner is closed and a single error listing all failed owners is raised.
+
+        Args:
+            poll: If True poll batch for status.
+            errors: If True retrieve any batch errors (only if poll is True).
+            process_files: If true send any document or report attachments to the API.
+            halt_on_error: If True any exception will raise an error.
+
+        Returns:
+            dict: The Batch Status for each chunk (list) by owner.
+        """
+        batches = self.batches
+        if not batches:
+            return {}
+
+        workers = max(min(self.concurrency, len(batches)), 1)
+        with ThreadPoolExecutor(workers, thread_name_prefix='batch-router') as executor:
+            futures = {
+                owner: executor.submit(batch.submit_all, poll, errors, process_files, halt_on_error)
+                for owner, batch in batches.items()
+            }
+
+        failed = []
+        results = {}
+        for owner, future in futures.items():
+            results[owner] = []
+            if future.exception() is not None:
+                failed.append(f'owner={owner}, error={future.exception()}')
+                continue
+            results[owner] = future.result()
+
+            batch_count = len(results[owner])
+            error_count = sum(b.get('errorCount', 0) for b in results[owner])
+            self.tcex.log.info(
+                f'feature=batch-router, event=submit-all, owner={owner}, '
+                f'chunks={batch_count:,}, errors={error_count:,}'
+            )
+
+        if failed:
+            if halt_on_error:
+                # no Batch is left open when the error is raised
+                self.close()
+            self.tcex.handle_error(10505, ['; '.join(failed)], halt_on_error)
+        return results
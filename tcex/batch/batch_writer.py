@@ -1,17 +1,18 @@
 """ThreatConnect Batch Import Module."""
 # standard library
-import gzip
 import hashlib
 import json
 import os
 import re
-import shelve
 import sys
 import time
 import uuid
 from collections import deque
-from typing import Optional, Tuple, Union
+from typing import Iterator, Optional, Tuple, Union
 
+from .batch_chunk import BatchChunk
+from .batch_json_writer import BatchJsonWriter, ShardedBatchJsonWriter
+from .entity_store import EntityStore
 from .group import (
     Adversary,
     Campaign,
@@ -56,15 +57,23 @@ class BatchWriter:
         self.write_callback_kwargs = kwargs.get('write_callback_kwargs', {})
 
         # properties
-        self._batch_files = []
+        self._batch_files = set()  # the output filenames, used to keep filenames unique
         self._batch_max_chunk = 100_000
         self._batch_size = 0  # track current batch size
         self._batch_max_size = 75_000_000  # max size in bytes
         # self._batch_max_size = 7_500_000  # max size in bytes
 
-        # shelf settings
+        # output file settings
+        self.output_compress_level = kwargs.get('output_compress_level', 9)
+        self.output_max_count = kwargs.get('output_max_count', self._batch_max_chunk)
+        self.output_max_size = kwargs.get('output_max_size', self._batch_max_size)
+        self.output_workers = kwargs.get('output_workers', 1)
+
+        # shelf settings (groups/indicators saved to disk)
         self._group_shelf_fqfn = None
         self._indicator_shelf_fqfn = None
+        self.shelf_class = EntityStore
+        self.shelf_high_water_mark = 5_000
 
         # containers
         self._groups = None
@@ -183,6 +192,36 @@ class BatchWriter:
                 self.dump()
         return group_data
 
+    def _group_association(self, xid: str) -> Iterator[Tuple[str, dict, dict]]:
+        """Yield the group and all associated groups, removing each from memory or shelf.
+
+        Args:
+            xid: The xid of the group to retrieve associations.
+
+        Yields:
+            Tuple[str, dict, dict]: The xid, file data, and group data of each group.
+        """
+        xids = deque()
+        xids.append(xid)
+
+        while xids:
+            xid = xids.popleft()  # remove current xid
+            group_data = None
+
+            if xid in self.groups:
+                group_data = self.groups.get(xid)
+                del self.groups[xid]
+            elif xid in self.groups_shelf:
+                group_data = self.groups_shelf.get(xid)
+                del self.groups_shelf[xid]
+
+            if group_data:
+                file_data, group_data = self.data_group_type(group_data)
+                yield xid, file_data, group_data
+
+                # extend xids with any groups associated with the same object
+                xids.extend(group_data.get('associatedGroupXid', []))
+
     def _indicator(
         self, indicator_data: Union[dict, object], store: Optional[bool] = True
     ) -> Union[dict, object]:
@@ -259,6 +298,27 @@ class BatchWriter:
 
         return indicator_list
 
+    def _output_fqfn(self) -> str:
+        """Return the fully qualified filename for a new output file."""
+        # get timestamp as a string without decimal place and consistent length
+        timestamp = round(time.time() * 10000000)
+        while True:
+            filename = f'{str(timestamp)}.json.gz'
+            if self.output_extension is not None:
+                # add any additional extension provided
+                filename += self.output_extension
+            if filename not in self._batch_files:
+                break
+            # files can be rotated faster than the timestamp resolution
+            timestamp += 1
+        self._batch_files.add(filename)
+        return os.path.join(self.output_dir, filename)
+
+    def _write_callback(self, fqfn: str) -> None:
+        """Send callback the filename of a completed output file."""
+        if callable(self.write_callback):
+            self.write_callback(fqfn, **self.write_callback_kwargs)
+
     def add_group(self, group_data: dict, **kwargs) -> Union[dict, object]:
         """Add a group to Batch Job.
 
@@ -451,8 +511,7 @@ class BatchWriter:
 
         # cleanup shelf files
         try:
-            self.groups_shelf.close()
-            os.unlink(self.group_shelf_fqfn)
+            self.groups_shelf.delete()
         except Exception as ex:
             self.tcex.log.warning(
                 f'action=batch-close, filename={self.group_shelf_fqfn} exception={ex}'
@@ -460,8 +519,7 @@ class BatchWriter:
 
         # cleanup shelf files
         try:
-            self.indicators_shelf.close()
-            os.unlink(self.indicator_shelf_fqfn)
+            self.indicators_shelf.delete()
         except Exception as ex:
             self.tcex.log.warning(
                 f'action=batch-close, filename={self.indicator_shelf_fqfn} exception={ex}'
@@ -482,7 +540,7 @@ class BatchWriter:
         Returns:
             dict: A dictionary of group, indicators, and/or file data.
         """
-        data = {'file': {}, 'group': [], 'indicator': []}
+        data = BatchChunk()
         tracker = {'count': 0, 'bytes': 0}
 
         # process group from memory, returning if max values have been reached
@@ -515,32 +573,14 @@ class BatchWriter:
                 the total size in bytes of all entities collected.
             xid: The xid of the group to retrieve associations.
         """
-        xids = deque()
-        xids.append(xid)
-
-        while xids:
-            xid = xids.popleft()  # remove current xid
-            group_data = None
+        for group_xid, file_data, group_data in self._group_association(xid):
+            group_size = data.append('group', group_data)
+            if file_data:
+                data['file'][group_xid] = file_data
 
-            if xid in self.groups:
-                group_data = self.groups.get(xid)
-                del self.groups[xid]
-            elif xid in self.groups_shelf:
-                group_data = self.groups_shelf.get(xid)
-                del self.groups_shelf[xid]
-
-            if group_data:
-                file_data, group_data = self.data_group_type(group_data)
-                data['group'].append(group_data)
-                if file_data:
-                    data['file'][xid] = file_data
-
-                # update entity trackers
-                tracker['count'] += 1
-                # tracker['bytes'] += sys.getsizeof(json.dumps(group_data))
-
-                # extend xids with any groups associated with the same object
-                xids.extend(group_data.get('associatedGroupXid', []))
+            # update entity trackers
+            tracker['count'] += 1
+            tracker['bytes'] += group_size
 
     @staticmethod
     def data_group_type(group_data: Union[dict, object]) -> Tuple[dict, dict]:
@@ -583,10 +623,12 @@ class BatchWriter:
             bool: True if max values have been hit, else False.
         """
         # convert groups.keys() to a list to prevent dictionary change error caused by
-        # the data_group_association function deleting items from the object.
+        # the data_group_association function deleting items from the object. the shelf
+        # iterates in pages and supports deleting items while iterating.
+        xids = list(groups.keys()) if isinstance(groups, dict) else groups.keys()
 
         # process group objects
-        for xid in list(groups.keys()):
+        for xid in xids:
             # get association from group data
             self.data_group_association(data, tracker, xid)
 
@@ -611,16 +653,22 @@ class BatchWriter:
         Returns:
             bool: True if max values have been hit, else False.
         """
+        # the shelf iterates in pages and supports deleting items while iterating.
+        items = list(indicators.items()) if isinstance(indicators, dict) else indicators.items()
+
         # process indicator objects
-        for xid, indicator_data in list(indicators.items()):
+        for xid, indicator_data in items:
+            fragment = None
             if not isinstance(indicator_data, dict):
+                # reuse the memoized JSON of the attributes, security labels, and tags
+                fragment = indicator_data.json()
                 indicator_data = indicator_data.data
-            data['indicator'].append(indicator_data)
+            indicator_size = data.append('indicator', indicator_data, fragment)
             del indicators[xid]
 
             # update entity trackers
             tracker['count'] += 1
-            # tracker['bytes'] += sys.getsizeof(json.dumps(indicator_data))
+            tracker['bytes'] += indicator_size
 
             if tracker.get('count') % 10_000 == 0:
                 # log count/size at a sane level
@@ -653,24 +701,46 @@ class BatchWriter:
         return self._group(group_obj, kwargs.get('store', True))
 
     def dump(self) -> None:
-        """Process Batch request to ThreatConnect API."""
-        content = self.data
-        content.pop('file', {})
-        if not content.get('group') and not content.get('indicator'):
-            return
+        """Write all groups and indicators to gzip compressed batch JSON files.
 
-        # special code for debugging App using batchV2.
-        self.write_batch_json(content)
+        Groups (following associations) and indicators are streamed from memory and shelf into
+        the output file one at a time, starting a new file when the output max count or max size
+        is reached. Associated groups are always written to the same file.
+        """
+        with self.json_writer(self.output_max_count, self.output_max_size) as writer:
+            # process groups from memory then shelf file
+            for groups in [self.groups, self.groups_shelf]:
+                xids = list(groups.keys()) if isinstance(groups, dict) else groups.keys()
+                for xid in xids:
+                    for _, _, group_data in self._group_association(xid):
+                        writer.write('group', group_data)
+                    writer.rotate()
+
+            # process indicators from memory then shelf file
+            for indicators in [self.indicators, self.indicators_shelf]:
+                items = (
+                    list(indicators.items()) if isinstance(indicators, dict) else indicators.items()
+                )
+                for xid, indicator_data in items:
+                    if not isinstance(indicator_data, dict):
+                        # reuse the memoized attribute, label, and tag JSON of the object
+                        indicator_data = indicator_data.json()
+                    writer.write('indicator', indicator_data)
+                    del indicators[xid]
+                    writer.rotate()
+
+        if not writer.files:
+            return
 
-        # store the length of the batch data to use for poll interval calculations
         self.tcex.log.info(
-            '''feature=batch, event=dump, type=group, ''' f'''count={len(content.get('group')):,}'''
+            f'''feature=batch, event=dump, type=group, count={writer.count.get('group'):,}'''
         )
         self.tcex.log.info(
             '''feature=batch, event=dump, type=indicator, '''
-            f'''count={len(content.get('indicator')):,}'''
+            f'''count={writer.count.get('indicator'):,}'''
         )
         self.tcex.log.info(f'''feature=batch, event=dump, type=batch, size={self._batch_size:,}''')
+        self.tcex.log.info(f'''feature=batch, event=dump, type=files, count={len(writer.files)}''')
 
         # reset batch size after dump
         self._batch_size = 0
@@ -824,10 +894,10 @@ class BatchWriter:
         return self._groups
 
     @property
-    def groups_shelf(self) -> object:
-        """Return dictionary of all Groups data."""
+    def groups_shelf(self) -> EntityStore:
+        """Return entity store of all saved Groups data."""
         if self._groups_shelf is None:
-            self._groups_shelf = shelve.open(self.group_shelf_fqfn, writeback=False)
+            self._groups_shelf = self.shelf_class(self.group_shelf_fqfn, self.shelf_high_water_mark)
         return self._groups_shelf
 
     def host(self, hostname: str, **kwargs) -> Host:
@@ -912,10 +982,12 @@ class BatchWriter:
         return self._indicators
 
     @property
-    def indicators_shelf(self) -> object:
-        """Return dictionary of all Indicator data."""
+    def indicators_shelf(self) -> EntityStore:
+        """Return entity store of all saved Indicator data."""
         if self._indicators_shelf is None:
-            self._indicators_shelf = shelve.open(self.indicator_shelf_fqfn, writeback=False)
+            self._indicators_shelf = self.shelf_class(
+                self.indicator_shelf_fqfn, self.shelf_high_water_mark
+            )
         return self._indicators_shelf
 
     def intrusion_set(self, name: str, **kwargs) -> IntrusionSet:
@@ -934,6 +1006,39 @@ class BatchWriter:
         group_obj = IntrusionSet(name, **kwargs)
         return self._group(group_obj, kwargs.get('store', True))
 
+    def json_writer(
+        self, max_count: Optional[int] = None, max_size: Optional[int] = None
+    ) -> BatchJsonWriter:
+        """Return a streaming batch JSON writer for the output directory.
+
+        When output_workers is greater than 1 the files are compressed and written in parallel
+        by that many worker threads (see ShardedBatchJsonWriter).
+
+        Args:
+            max_count: The max number of entities per file.
+            max_size: The max size in bytes of uncompressed entity data per file.
+
+        Returns:
+            BatchJsonWriter: An instance of the BatchJsonWriter class.
+        """
+        if self.output_workers > 1:
+            return ShardedBatchJsonWriter(
+                filename=self._output_fqfn,
+                compress_level=self.output_compress_level,
+                max_count=max_count,
+                max_size=max_size,
+                write_callback=self._write_callback,
+                workers=self.output_workers,
+            )
+
+        return BatchJsonWriter(
+            filename=self._output_fqfn,
+            compress_level=self.output_compress_level,
+            max_count=max_count,
+            max_size=max_size,
+            write_callback=self._write_callback,
+        )
+
     def mutex(self, mutex: str, **kwargs) -> Mutex:
         """Add Mutex data to Batch object.
 
@@ -997,7 +1102,7 @@ class BatchWriter:
         return self._group(group_obj, kwargs.get('store', True))
 
     def save(self, resource: Union[dict, object]) -> None:
-        """Save group|indicator dict or object to shelve.
+        """Save group|indicator dict or object to the shelf (entity store on disk).
 
         Best effort to save group/indicator data to disk.  If for any reason the save fails
         the data will still be accessible from list in memory.
@@ -1133,17 +1238,12 @@ class BatchWriter:
     def write_batch_json(self, content: dict) -> None:
         """Write batch json data to a file."""
         if content:
-            # get timestamp as a string without decimal place and consistent length
-            filename = f'{str(round(time.time() * 10000000))}.json.gz'
-            if self.output_extension is not None:
-                # add any additional extension provided
-                filename += self.output_extension
-            # TODO: is this needed
-            self._batch_files.append(filename)
-            fqfn = os.path.join(self.output_dir, filename)
-            with gzip.open(fqfn, mode='wt', encoding='utf-8') as fh:
-                json.dump(content, fh)
-
-            # send callback the filename
-            if callable(self.write_callback):
-                self.write_callback(fqfn, **self.write_callback_kwargs)
+            with self.json_writer() as writer:
+                for entity_type in ['group', 'indicator']:
+                    if isinstance(content, BatchChunk) and content.fragments_valid:
+                        # reuse the JSON encoded entities
+                        entities = content.fragments(entity_type)
+                    else:
+                        entities = content.get(entity_type) or []
+                    for entity in entities:
+                        writer.write(entity_type, entity)
@@ -0,0 +1,162 @@
+"""ThreatConnect Batch Dedup Index"""
+# standard library
+import json
+from typing import Optional, Tuple, Union
+
+
+class DedupIndex:
+    """Index of Batch indicators keyed on indicator type and normalized summary.
+
+    Feeds often provide the same indicator several times with different xids. The index maps
+    each (type, normalized summary) key to the xid of the first indicator seen so any later
+    copies can be merged into it before the data is chunked.
+    """
+
+    # indicator types where the summary is not case sensitive
+    case_insensitive_types = ['Address', 'ASN', 'CIDR', 'EmailAddress', 'File', 'Host']
+
+    # list fields merged from duplicates and the fields that identify a unique entry
+    merge_fields = {
+        'associatedGroups': ['groupXid'],
+        'attribute': ['type', 'value'],
+        'fileOccurrence': None,  # compare the full occurrence
+        'securityLabel': ['name'],
+        'tag': ['name'],
+    }
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self._index = {}
+        self.merge_count = 0
+
+    @staticmethod
+    def _entry_key(entry: dict, fields: Optional[list]) -> str:
+        """Return the value that identifies a unique entry of a list field."""
+        if fields is None:
+            return json.dumps(entry, sort_keys=True)
+        return json.dumps([entry.get(f) for f in fields])
+
+    @staticmethod
+    def _merge_object(primary: object, duplicate: dict) -> None:
+        """Merge the duplicate indicator data into an Indicator object.
+
+        The data is added with the methods of the Indicator (e.g., tag()) so the object stays
+        the source of the data that gets submitted.
+        """
+        primary_data = primary.data
+        for field, value in duplicate.items():
+            if field == 'xid':
+                continue
+
+            if field == 'associatedGroups':
+                for association in value:
+                    if association not in (primary_data.get(field) or []):
+                        primary.association(association.get('groupXid'))
+            elif field == 'attribute':
+                for attribute in value:
+                    primary.attribute(
+                        attribute.get('type'),
+                        attribute.get('value'),
+                        attribute.get('displayed', False),
+                        attribute.get('source'),
+                    )
+            elif field == 'fileOccurrence':
+                for occurrence in value:
+                    if occurrence not in (primary_data.get(field) or []):
+                        primary.occurrence(
+                            occurrence.get('fileName'),
+                            occurrence.get('path'),
+                            occurrence.get('date'),
+                        )
+            elif field == 'securityLabel':
+                for label in value:
+                    primary.security_label(
+                        label.get('name'), label.get('description'), label.get('color')
+                    )
+            elif field == 'tag':
+                for tag in value:
+                    primary.tag(tag.get('name'))
+            elif field not in primary_data:
+                primary.add_key_value(field, value)
+
+    def get(self, key: Tuple[str, str]) -> Optional[str]:
+        """Return the xid of the indexed indicator for the provided key."""
+        return self._index.get(key)
+
+    def key(self, indicator_data: Union[dict, object]) -> Tuple[str, str]:
+        """Return the dedup key for the provided indicator.
+
+        Args:
+            indicator_data: The indicator dict or object.
+
+        Returns:
+            Tuple[str, str]: The indicator type and normalized summary.
+        """
+        if isinstance(indicator_data, dict):
+            indicator_type = indicator_data.get('type')
+            summary = indicator_data.get('summary') or ''
+        else:
+            indicator_type = indicator_data.type
+            summary = indicator_data.summary or ''
+
+        # normalize each value of multi-valued indicators (e.g., file hashes)
+        values = [v.strip() for v in summary.split(' : ')]
+        if indicator_type in self.case_insensitive_types:
+            values = [v.lower() for v in values]
+        return indicator_type, ' : '.join(values)
+
+    def merge(
+        self, primary: Union[dict, object], duplicate: Union[dict, object]
+    ) -> Union[dict, object]:
+        """Merge the duplicate indicator data into the primary indicator.
+
+        Tags, attributes, security labels, file occurrences, and associations are combined
+        without duplicate entries. Any other field is only taken from the duplicate if it is
+        not already set on the primary. An Indicator object is updated in place, so any
+        reference to it held by the App stays valid.
+
+        Args:
+            primary: The indicator dict or object to merge into.
+            duplicate: The indicator dict or object to merge.
+
+        Returns:
+            Union[dict, object]: The merged indicator dict or object.
+        """
+        if not isinstance(duplicate, dict):
+            duplicate = duplicate.data
+        if not isinstance(primary, dict):
+            self._merge_object(primary, duplicate)
+            self.merge_count += 1
+            return primary
+
+        for field, value in duplicate.items():
+            if field == 'xid':
+                continue
+
+            fields = self.merge_fields.get(field, False)
+            if fields is False or not isinstance(value, list):
+                primary.setdefault(field, value)
+                continue
+
+            entries = primary.setdefault(field, [])
+            entry_keys = {self._entry_key(e, fields) for e in entries}
+            for entry in value:
+                entry_key = self._entry_key(entry, fields)
+                if entry_key not in entry_keys:
+                    entries.append(entry)
+                    entry_keys.add(entry_key)
+
+        self.merge_count += 1
+        return primary
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        """Return True if the key is in the index."""
+        return key in self._index
+
+    def __len__(self) -> int:
+        """Return the number of indexed indicators."""
+        return len(self._index)
+
+    def __setitem__(self, key: Tuple[str, str], xid: str) -> None:
+        """Index the xid for the provided key."""
+        self._index[key] = xid
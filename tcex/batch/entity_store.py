@@ -0,0 +1,233 @@
+"""ThreatConnect Batch Entity Store"""
+# standard library
+import dbm
+import os
+import pickle  # nosec
+import shelve  # nosec
+import sqlite3
+import threading
+from typing import Any, Iterator, Optional, Tuple
+
+# the header of an SQLite database file
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+
+class EntityStore:
+    """Indexed on-disk store for Batch Group and Indicator data.
+
+    The store is a drop-in replacement for the shelve files previously used by Batch to spill
+    groups and indicators to disk. Entities are kept in a single SQLite table (WAL mode) keyed
+    on xid, with rows iterated in insertion order. Writes are buffered in memory and bulk
+    inserted once the high water mark is reached.
+
+    The entities of a shelve file saved by an earlier version at the same path (e.g., a saved
+    debug file) are imported into a new store the first time the store is opened.
+
+    Any class implementing the same mapping interface (get, __contains__, __setitem__,
+    __delitem__, __len__, keys, values, items, sync, close and delete) can be used in its place.
+
+    Args:
+        fqfn: The fully qualified filename of the store.
+        high_water_mark: The number of pending writes to buffer in memory before flushing.
+        page_size: The number of rows to fetch per query when iterating the store.
+    """
+
+    def __init__(
+        self, fqfn: str, high_water_mark: Optional[int] = 5_000, page_size: Optional[int] = 1_000
+    ):
+        """Initialize Class properties."""
+        self.fqfn = fqfn
+        self.high_water_mark = high_water_mark
+        self.page_size = page_size
+
+        # properties
+        self._conn = None
+        self._count = None  # the number of stored entities (None when there are pending writes)
+        self._lock = threading.RLock()
+        self._pending = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Return the SQLite connection, creating the entity table if required."""
+        if self._conn is None:
+            shelve_fqfn = self._shelve_fqfn()
+            self._conn = sqlite3.connect(self.fqfn, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            # the store only holds data for the current execution, durability is not required
+            self._conn.execute('PRAGMA synchronous=OFF')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS entity ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, xid TEXT NOT NULL UNIQUE, data BLOB)'
+            )
+            if shelve_fqfn is not None:
+                with shelve.open(shelve_fqfn, flag='r') as shelf:
+                    self._conn.executemany(
+                        'INSERT INTO entity (xid, data) VALUES (?, ?)',
+                        ((xid, self.dumps(entity)) for xid, entity in shelf.items()),
+                    )
+                self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def dumps(entity: Any) -> bytes:
+        """Return the serialized entity."""
+        return pickle.dumps(entity, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        """Return the deserialized entity."""
+        return pickle.loads(data)  # nosec
+
+    def _contains_stored(self, xid: str) -> bool:
+        """Return True if the xid has been written to the database."""
+        return (
+            self.conn.execute('SELECT 1 FROM entity WHERE xid = ?', (xid,)).fetchone() is not None
+        )
+
+    def _page(self, last_id: int) -> list:
+        """Return the next page of rows after the provided row id."""
+        with self._lock:
+            self.flush()
+            return self.conn.execute(
+                'SELECT id, xid, data FROM entity WHERE id > ? ORDER BY id LIMIT ?',
+                (last_id, self.page_size),
+            ).fetchall()
+
+    def _rows(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield xid and serialized data for all rows in insertion order.
+
+        Rows are read one page at a time so entities can be deleted while iterating.
+        """
+        last_id = 0
+        while True:
+            rows = self._page(last_id)
+            if not rows:
+                break
+            for row_id, xid, data in rows:
+                last_id = row_id
+                yield xid, data
+
+    def _shelve_fqfn(self) -> Optional[str]:
+        """Return the filename of a shelve file saved at the store path that must be imported.
+
+        A shelve file at the store path (e.g., dbm.gnu) is renamed so the store can be created.
+        """
+        if os.path.isfile(self.fqfn):
+            with open(self.fqfn, 'rb') as fh:
+                if fh.read(len(SQLITE_HEADER)) == SQLITE_HEADER:
+                    return None
+        if not dbm.whichdb(self.fqfn):
+            # no file (None) or not a dbm file ('')
+            return None
+        if not os.path.isfile(self.fqfn):
+            # the dbm files use an extension (e.g., dbm.dumb)
+            return self.fqfn
+        shelve_fqfn = f'{self.fqfn}.shelve'
+        os.replace(self.fqfn, shelve_fqfn)
+        return shelve_fqfn
+
+    def close(self) -> None:
+        """Flush any pending writes and close the database connection."""
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def delete(self) -> None:
+        """Close the store and remove the database files from disk."""
+        self.close()
+        for fqfn in [self.fqfn, f'{self.fqfn}-shm', f'{self.fqfn}-wal']:
+            if os.path.isfile(fqfn):
+                os.remove(fqfn)
+
+    def flush(self) -> None:
+        """Bulk insert any pending writes and commit the transaction."""
+        with self._lock:
+            if self._pending:
+                # an upsert keeps the row id (and the iteration position) of an existing xid
+                self.conn.executemany(
+                    'INSERT INTO entity (xid, data) VALUES (?, ?) '
+                    'ON CONFLICT(xid) DO UPDATE SET data = excluded.data',
+                    ((xid, self.dumps(entity)) for xid, entity in self._pending.items()),
+                )
+                self._pending = {}
+            if self._conn is not None:
+                self._conn.commit()
+
+    def get(self, xid: str, default: Optional[Any] = None) -> Any:
+        """Return the entity for the provided xid."""
+        with self._lock:
+            if xid in self._pending:
+                return self._pending[xid]
+            row = self.conn.execute('SELECT data FROM entity WHERE xid = ?', (xid,)).fetchone()
+        if row is None:
+            return default
+        return self.loads(row[0])
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield xid and entity for all entities in insertion order."""
+        for xid, data in self._rows():
+            yield xid, self.loads(data)
+
+    def keys(self) -> Iterator[str]:
+        """Yield xid for all entities in insertion order."""
+        for xid, _ in self._rows():
+            yield xid
+
+    def sync(self) -> None:
+        """Write any pending data to disk (shelve compatible)."""
+        self.flush()
+
+    def update(self, entities: dict) -> None:
+        """Add multiple entities to the store."""
+        for xid, entity in entities.items():
+            self[xid] = entity
+
+    def values(self) -> Iterator[Any]:
+        """Yield all entities in insertion order."""
+        for _, data in self._rows():
+            yield self.loads(data)
+
+    def __contains__(self, xid: str) -> bool:
+        """Return True if the xid is in the store."""
+        with self._lock:
+            return xid in self._pending or self._contains_stored(xid)
+
+    def __delitem__(self, xid: str) -> None:
+        """Remove the entity for the provided xid."""
+        with self._lock:
+            in_pending = self._pending.pop(xid, None) is not None
+            cursor = self.conn.execute('DELETE FROM entity WHERE xid = ?', (xid,))
+            if not in_pending and cursor.rowcount == 0:
+                raise KeyError(xid)
+            if self._count is not None:
+                self._count -= 1
+
+    def __getitem__(self, xid: str) -> Any:
+        """Return the entity for the provided xid."""
+        entity = self.get(xid)
+        if entity is None:
+            raise KeyError(xid)
+        return entity
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield xid for all entities in insertion order."""
+        return self.keys()
+
+    def __len__(self) -> int:
+        """Return the number of entities in the store (any pending writes are flushed)."""
+        with self._lock:
+            if self._count is None:
+                self.flush()
+                self._count = self.conn.execute('SELECT COUNT(*) FROM entity').fetchone()[0]
+            return self._count
+
+    def __setitem__(self, xid: str, entity: Any) -> None:
+        """Add or replace the entity for the provided xid."""
+        with self._lock:
+            # the count is loaded on the next call to len (an upsert may replace an entity)
+            self._count = None
+            self._pending[xid] = entity
+            if len(self._pending) >= self.high_water_mark:
+                self.flush()
@@ -1,34 +1,53 @@
 """ThreatConnect Batch Import Module"""
 # standard library
 import json
+import sys
 import uuid
 from typing import Any, Callable, Optional, Union
 
 from ..utils import Utils
 from .attribute import Attribute
+from .batch_entity import BatchEntity
 from .security_label import SecurityLabel
 from .tag import Tag
 
 
-class Group:
-    """ThreatConnect Batch Group Object"""
+class Group(BatchEntity):
+    """ThreatConnect Batch Group Object
 
-    __slots__ = [
+    To keep the per-object footprint small when holding millions of groups the utils
+    instance and key maps are shared by all instances, the type is interned, and the
+    attribute, label, and tag lists are only created when used.
+    """
+
+    __slots__ = ['_file_content', '_group_data', '_processed']
+
+    # the order of the pickle state (see BatchEntity)
+    _state_fields = [
+        '_group_data',
         '_attributes',
         '_file_content',
-        '_group_data',
         '_labels',
-        '_name',
         '_processed',
-        '_type',
         '_tags',
-        '_utils',
-        'file_content',
-        'malware',
-        'password',
-        'status',
     ]
 
+    # shared by all instances
+    _utils = Utils()
+
+    # metadata map for Group objects
+    _metadata_map = {
+        'date_added': 'dateAdded',
+        'event_date': 'eventDate',
+        'file_name': 'fileName',
+        'file_text': 'fileText',
+        'file_type': 'fileType',
+        'first_seen': 'firstSeen',
+        'from_addr': 'from',
+        'publish_date': 'publishDate',
+        'to_addr': 'to',
+    }
+
     def __init__(self, group_type: str, name: str, **kwargs):
         """Initialize Class Properties.
 
@@ -37,37 +56,20 @@ class Group:
             name (str): The name for this Group.
             xid (str, kwargs): The external id for this Group.
         """
-        self._utils = Utils()
-        self._name = name
-        self._type = group_type
-        self._group_data = {'name': name, 'type': group_type}
+        self._group_data = {'name': name, 'type': sys.intern(group_type)}
         # process all kwargs and update metadata field names
         for arg, value in kwargs.items():
             self.add_key_value(arg, value)
         # set xid to random and unique uuid4 value if not provided
         if kwargs.get('xid') is None:
             self._group_data['xid'] = str(uuid.uuid4())
-        self._attributes = []
-        self._labels = []
+        self._attributes = None
+        self._labels = None
         self._file_content = None
-        self._tags = []
+        self._tags = None
+        self._pickled = None
         self._processed = False
 
-    @property
-    def _metadata_map(self) -> dict:
-        """Return metadata map for Group objects."""
-        return {
-            'date_added': 'dateAdded',
-            'event_date': 'eventDate',
-            'file_name': 'fileName',
-            'file_text': 'fileText',
-            'file_type': 'fileType',
-            'first_seen': 'firstSeen',
-            'from_addr': 'from',
-            'publish_date': 'publishDate',
-            'to_addr': 'to',
-        }
-
     def add_file(
         self, filename: str, file_content: Union[bytes, Callable[[str], Any], str]
     ) -> None:
@@ -147,6 +149,8 @@ class Group:
         Returns:
             Attribute: An instance of the Attribute class.
         """
+        if self._attributes is None:
+            self._attributes = []
         attr = Attribute(attr_type, attr_value, displayed, source, formatter)
         if unique == 'Type':
             for attribute_data in self._attributes:
@@ -208,6 +212,25 @@ class Group:
             'type': self._group_data.get('type'),
         }
 
+    def json(self) -> str:
+        """Return the JSON encoded Group data.
+
+        The memoized JSON of the attributes, security labels, and tags (shared by all
+        indicators/groups with the same values) is reused instead of encoding them again.
+        """
+        if self._attributes and not all(a.json_memoized for a in self._attributes):
+            # unique attribute values are faster to encode with the rest of the data
+            return json.dumps(self.data)
+
+        fragments = {}
+        if self._attributes:
+            fragments['attribute'] = [a.json for a in self._attributes if a.valid]
+        if self._labels:
+            fragments['securityLabel'] = [label.json for label in self._labels]
+        if self._tags:
+            fragments['tag'] = [t.json for t in self._tags if t.valid]
+        return self._json_splice(self._group_data, fragments)
+
     @property
     def name(self) -> str:
         """Return Group name."""
@@ -242,6 +265,8 @@ class Group:
         Returns:
             SecurityLabel: An instance of the SecurityLabel class.
         """
+        if self._labels is None:
+            self._labels = []
         label = SecurityLabel(name, description, color)
         for label_data in self._labels:
             if label_data.name == name:
@@ -261,7 +286,9 @@ class Group:
         Returns:
             Tag: An instance of the Tag class.
         """
-        tag = Tag(name, formatter)
+        if self._tags is None:
+            self._tags = []
+        tag = Tag.shared(name, formatter)
         for tag_data in self._tags:
             if tag_data.name == name:
                 tag = tag_data
@@ -333,7 +360,7 @@ class Campaign(Group):
 class Document(Group):
     """ThreatConnect Batch Document Object"""
 
-    __slots__ = ['_file_data', '_group_data']
+    __slots__ = []
 
     def __init__(self, name: str, file_name: str, **kwargs):
         """Initialize Class Properties.
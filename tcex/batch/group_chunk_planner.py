@@ -0,0 +1,153 @@
+"""ThreatConnect Batch Group Chunk Planner"""
+# standard library
+from typing import Iterable, List, Optional
+
+
+class GroupChunkPlanner:
+    """Plan the layout of Batch groups into chunks, keeping associated groups together.
+
+    Groups are indexed as they are added and connected components (groups linked through
+    associatedGroupXid in either direction) are maintained incrementally, merging the smaller
+    component into the larger one. When a plan is requested the components are packed into
+    chunks using next-fit decreasing (only the last open chunk is filled), so each chunk
+    respects the max count and size where possible and no component is split. A component
+    larger than the limits is placed in a chunk of its own. Groups are removed from the index
+    once they are submitted.
+
+    Args:
+        max_count: The max number of groups in a chunk.
+        max_size: The max size in bytes of the groups in a chunk.
+    """
+
+    def __init__(self, max_count: int, max_size: int):
+        """Initialize Class properties."""
+        self.max_count = max_count
+        self.max_size = max_size
+
+        # properties
+        self._component = {}  # xid -> component id
+        self._members = {}  # component id -> xids in the component
+        self._order = {}  # xid -> insertion order
+        self._waiting = {}  # unknown xid -> xids waiting on it to be added
+        self._waiting_on = {}  # xid -> unknown xids it is waiting on
+        self._sequence = 0
+
+    def _union(self, xid_1: str, xid_2: str) -> None:
+        """Merge the components of the provided xids."""
+        component_1 = self._component[xid_1]
+        component_2 = self._component[xid_2]
+        if component_1 == component_2:
+            return
+        if len(self._members[component_1]) < len(self._members[component_2]):
+            component_1, component_2 = component_2, component_1
+
+        # move the xids of the smaller component
+        members = self._members.pop(component_2)
+        for xid in members:
+            self._component[xid] = component_1
+        self._members[component_1].update(members)
+
+    def add(self, xid: str, associated_xids: Optional[Iterable[str]] = None) -> None:
+        """Add a group and its associations to the index.
+
+        Calling add again for an existing xid adds any new associations.
+
+        Args:
+            xid: The xid of the group.
+            associated_xids: The xids of the associated groups.
+        """
+        if xid not in self._component:
+            self._component[xid] = xid
+            self._members[xid] = {xid}
+            self._order[xid] = self._sequence
+            self._sequence += 1
+
+            # link groups that were added with an association to this group
+            for waiting_xid in self._waiting.pop(xid, []):
+                self._waiting_on[waiting_xid].discard(xid)
+                self._union(xid, waiting_xid)
+
+        for associated_xid in associated_xids or []:
+            if associated_xid in self._component:
+                self._union(xid, associated_xid)
+            else:
+                self._waiting.setdefault(associated_xid, set()).add(xid)
+                self._waiting_on.setdefault(xid, set()).add(associated_xid)
+
+    def plan(self, sizes: dict) -> List[List[str]]:
+        """Return the chunks for the provided groups.
+
+        Args:
+            sizes: The size in bytes of each group to plan, keyed by xid. Any xid not
+                previously added is added without associations.
+
+        Returns:
+            List[List[str]]: The xids of each chunk, in insertion order within a chunk.
+        """
+        for xid in sizes:
+            if xid not in self._component:
+                self.add(xid)
+
+        components = {}
+        for xid in sizes:
+            components.setdefault(self._component[xid], []).append(xid)
+
+        # next-fit decreasing on count, ties broken by insertion order for a stable layout
+        ordered = sorted(
+            components.values(), key=lambda c: (-len(c), min(self._order[x] for x in c))
+        )
+        chunks = []  # [count, size, xids]
+        open_chunk = None  # the chunk being filled, all previous chunks are closed
+        for component in ordered:
+            count = len(component)
+            size = sum(sizes[xid] for xid in component)
+            if (
+                open_chunk is not None
+                and open_chunk[0] + count <= self.max_count
+                and open_chunk[1] + size <= self.max_size
+            ):
+                open_chunk[0] += count
+                open_chunk[1] += size
+                open_chunk[2].extend(component)
+                continue
+
+            chunk = [count, size, list(component)]
+            chunks.append(chunk)
+            if count <= self.max_count and size <= self.max_size:
+                # a component larger than the limits does not close the open chunk
+                open_chunk = chunk
+
+        return [sorted(chunk[2], key=self._order.get) for chunk in chunks]
+
+    def remove(self, xid: str) -> None:
+        """Remove a group (e.g., once it was submitted) from the index.
+
+        The remaining groups of its component stay in the same component.
+
+        Args:
+            xid: The xid of the group.
+        """
+        component = self._component.pop(xid, None)
+        if component is None:
+            return
+        del self._order[xid]
+        members = self._members[component]
+        members.discard(xid)
+        if not members:
+            del self._members[component]
+
+        for unknown_xid in self._waiting_on.pop(xid, []):
+            waiting = self._waiting.get(unknown_xid)
+            if waiting is not None:
+                waiting.discard(xid)
+                if not waiting:
+                    del self._waiting[unknown_xid]
+
+    @property
+    def xids(self) -> List[str]:
+        """Return the xids of the groups in the index, in insertion order."""
+        return list(self._component)
+
+    def __len__(self) -> int:
+        """Return the number of groups in the index."""
+        return len(self._component)
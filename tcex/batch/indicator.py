@@ -1,11 +1,13 @@
 """ThreatConnect Batch Import Module"""
 # standard library
 import json
+import sys
 import uuid
 from typing import Callable, Optional
 
 from ..utils import Utils
 from .attribute import Attribute
+from .batch_entity import BatchEntity
 from .security_label import SecurityLabel
 from .tag import Tag
 
@@ -48,21 +50,41 @@ def custom_indicator_class_factory(indicator_type, base_class, class_dict, value
     return newclass
 
 
-class Indicator:
-    """ThreatConnect Batch Indicator Object"""
+class Indicator(BatchEntity):
+    """ThreatConnect Batch Indicator Object
 
-    __slots__ = [
+    To keep the per-object footprint small when holding millions of indicators the utils
+    instance and key maps are shared by all instances, the type is interned, and the
+    attribute, file action, label, occurrence, and tag lists are only created when used.
+    """
+
+    __slots__ = ['_file_actions', '_indicator_data', '_occurrences']
+
+    # the order of the pickle state (see BatchEntity)
+    _state_fields = [
+        '_indicator_data',
         '_attributes',
         '_file_actions',
-        '_indicator_data',
         '_labels',
         '_occurrences',
-        '_summary',
         '_tags',
-        '_type',
-        '_utils',
     ]
 
+    # shared by all instances
+    _utils = Utils()
+
+    # metadata map for Indicator objects
+    _metadata_map = {
+        'date_added': 'dateAdded',
+        'dnsActive': 'flag1',
+        'dns_active': 'flag1',
+        'last_modified': 'lastModified',
+        'private_flag': 'privateFlag',
+        'size': 'intValue1',
+        'whoisActive': 'flag2',
+        'whois_active': 'flag2',
+    }
+
     def __init__(self, indicator_type: str, summary: str, **kwargs):
         """Initialize Class Properties.
 
@@ -77,35 +99,19 @@ class Indicator:
             rating (str, kwargs): The threat rating for this Indicator.
             xid (str, kwargs): The external id for this Indicator.
         """
-        self._utils = Utils()
-        self._summary = summary
-        self._type = indicator_type
-        self._indicator_data = {'summary': summary, 'type': indicator_type}
+        self._indicator_data = {'summary': summary, 'type': sys.intern(indicator_type)}
         # process all kwargs and update metadata field names
         for arg, value in kwargs.items():
             self.add_key_value(arg, value)
         # set xid to random and unique uuid4 value if not provided
         if kwargs.get('xid') is None:
             self._indicator_data['xid'] = str(uuid.uuid4())
-        self._attributes = []
-        self._file_actions = []
-        self._labels = []
-        self._occurrences = []
-        self._tags = []
-
-    @property
-    def _metadata_map(self) -> dict:
-        """Return metadata map for Indicator objects."""
-        return {
-            'date_added': 'dateAdded',
-            'dnsActive': 'flag1',
-            'dns_active': 'flag1',
-            'last_modified': 'lastModified',
-            'private_flag': 'privateFlag',
-            'size': 'intValue1',
-            'whoisActive': 'flag2',
-            'whois_active': 'flag2',
-        }
+        self._attributes = None
+        self._file_actions = None
+        self._labels = None
+        self._occurrences = None
+        self._pickled = None
+        self._tags = None
 
     def add_key_value(self, key: str, value: str) -> None:
         """Add custom field to Indicator object.
@@ -180,6 +186,8 @@ class Indicator:
         Returns:
             Attribute: An instance of the Attribute class.
         """
+        if self._attributes is None:
+            self._attributes = []
         attr = Attribute(attr_type, attr_value, displayed, source, formatter)
         if unique == 'Type':
             for attribute_data in self._attributes:
@@ -238,12 +246,12 @@ class Indicator:
         # add file actions
         if self._file_actions:
             self._indicator_data.setdefault('fileAction', {})
-            self._indicator_data['fileAction'].setdefault('children', [])
+            self._indicator_data['fileAction']['children'] = []
             for action in self._file_actions:
                 self._indicator_data['fileAction']['children'].append(action.data)
         # add file occurrences
         if self._occurrences:
-            self._indicator_data.setdefault('fileOccurrence', [])
+            self._indicator_data['fileOccurrence'] = []
             for occurrence in self._occurrences:
                 self._indicator_data['fileOccurrence'].append(occurrence.data)
         # add security labels
@@ -271,6 +279,37 @@ class Indicator:
             date_added, date_format='%Y-%m-%dT%H:%M:%SZ'
         )
 
+    def json(self) -> str:
+        """Return the JSON encoded Indicator data.
+
+        The memoized JSON of the attributes, security labels, and tags (shared by all
+        indicators/groups with the same values) is reused instead of encoding them again.
+        """
+        if self._attributes and not all(a.json_memoized for a in self._attributes):
+            # unique attribute values are faster to encode with the rest of the data
+            return json.dumps(self.data)
+
+        indicator_data = self._indicator_data
+        if self._file_actions or self._occurrences:
+            # add file actions and occurrences to a copy, leaving the data unchanged
+            indicator_data = dict(indicator_data)
+            if self._file_actions:
+                indicator_data['fileAction'] = {
+                    **(indicator_data.get('fileAction') or {}),
+                    'children': [action.data for action in self._file_actions],
+                }
+            if self._occurrences:
+                indicator_data['fileOccurrence'] = [o.data for o in self._occurrences]
+
+        fragments = {}
+        if self._attributes:
+            fragments['attribute'] = [a.json for a in self._attributes if a.valid]
+        if self._labels:
+            fragments['securityLabel'] = [label.json for label in self._labels]
+        if self._tags:
+            fragments['tag'] = [t.json for t in self._tags if t.valid]
+        return self._json_splice(indicator_data, fragments)
+
     @property
     def last_modified(self) -> str:
         """Return Indicator lastModified."""
@@ -304,6 +343,8 @@ class Indicator:
             return None
 
         occurrence_obj = FileOccurrence(file_name, path, date)
+        if self._occurrences is None:
+            self._occurrences = []
         self._occurrences.append(occurrence_obj)
         return occurrence_obj
 
@@ -348,6 +389,8 @@ class Indicator:
         Returns:
             SecurityLabel: An instance of the SecurityLabel class.
         """
+        if self._labels is None:
+            self._labels = []
         label = SecurityLabel(name, description, color)
         for label_data in self._labels:
             if label_data.name == name:
@@ -367,7 +410,9 @@ class Indicator:
         Returns:
             Tag: An instance of the Tag class.
         """
-        tag = Tag(name, formatter)
+        if self._tags is None:
+            self._tags = []
+        tag = Tag.shared(name, formatter)
         for tag_data in self._tags:
             if tag_data.name == name:
                 tag = tag_data
@@ -509,6 +554,8 @@ class File(Indicator):
     def action(self, relationship: str) -> object:
         """Add a File Action."""
         action_obj = FileAction(self._indicator_data.get('xid'), relationship)
+        if self._file_actions is None:
+            self._file_actions = []
         self._file_actions.append(action_obj)
         return action_obj
 
@@ -686,7 +733,7 @@ class UserAgent(Indicator):
 class FileAction:
     """ThreatConnect Batch FileAction Object"""
 
-    __slots__ = ['_action_data', '_children', 'xid']
+    __slots__ = ['_action_data', 'xid']
 
     def __init__(self, parent_xid: str, relationship):
         """Initialize Class Properties.
@@ -703,20 +750,17 @@ class FileAction:
             'relationship': relationship,
             'parentIndicatorXid': parent_xid,
         }
-        self._children = []
 
     @property
     def data(self) -> dict:
         """Return File Occurrence data."""
-        if self._children:
-            for child in self._children:
-                self._action_data.setdefault('children', []).append(child.data)
         return self._action_data
 
     def action(self, relationship) -> None:
         """Add a nested File Action."""
         action_obj = FileAction(self.xid, relationship)
-        self._children.append(action_obj)
+        # the child data is updated in place, so the children list is only built once
+        self._action_data.setdefault('children', []).append(action_obj.data)
 
     def __str__(self) -> str:
         """Return string represtentation of object."""
@@ -726,7 +770,10 @@ class FileAction:
 class FileOccurrence:
     """ThreatConnect Batch FileAction Object."""
 
-    __slots__ = ['_occurrence_data', '_utils']
+    __slots__ = ['_occurrence_data']
+
+    # shared by all instances
+    _utils = Utils()
 
     def __init__(
         self,
@@ -741,7 +788,6 @@ class FileOccurrence:
             path (str, optional): The file path for this occurrence.
             date (str, optional): The datetime expression for this occurrence.
         """
-        self._utils = Utils()
         self._occurrence_data = {}
         if file_name is not None:
             self._occurrence_data['fileName'] = file_name
@@ -0,0 +1,182 @@
+"""ThreatConnect Batch Indicator Validator"""
+# standard library
+import re
+import threading
+from typing import Iterable, List, Optional, Union
+
+
+class IndicatorValidator:
+    """Validate Batch indicators against the regexes of the ThreatConnect indicator types.
+
+    The regexes of each indicator type are compiled once, when the type is first validated.
+    Each value of a multi-valued indicator (e.g., file hashes or custom indicators) is matched
+    against the regex of the same position when all values are provided, otherwise against
+    any of the regexes of the type (e.g., a File with only a sha256). A regex that is not
+    supported by the Python re module is skipped, so only indicators that would be rejected by
+    the API (0x1005 Invalid Indicator Error) are reported as invalid.
+
+    Args:
+        indicator_types_data: The indicator types data from tcex.indicator_types_data.
+    """
+
+    def __init__(self, indicator_types_data: dict):
+        """Initialize Class properties."""
+        self.indicator_types_data = indicator_types_data
+
+        # properties
+        self._lock = threading.Lock()
+        self._patterns = {}  # indicator type -> list of compiled regexes (one per value)
+        self.counts = {}  # indicator type -> {reason: count}
+        self.quarantined = {}  # xid -> {'indicator': data, 'reason': reason}
+        self.skipped_patterns = {}  # indicator type -> regexes that could not be compiled
+        self.valid_count = 0
+
+    @staticmethod
+    def _values(summary: str) -> List[str]:
+        """Return the values of a " : " delimited indicator summary."""
+        return [v.strip() for v in summary.split(' : ')]
+
+    def _reason(self, patterns: list, values: List[str]) -> Optional[str]:
+        """Return the reason the values are invalid or None if they are valid."""
+        if patterns and len(values) > len(patterns):
+            return f'expected at most {len(patterns)} value(s)'
+
+        positional = len(values) == len(patterns)
+        for index, value in enumerate(values):
+            if not value:
+                # optional values (e.g., the value name of a Registry Key) may be empty
+                continue
+
+            candidates = [patterns[index]] if positional else patterns
+            candidates = [p for p in candidates if p is not None]
+            if candidates and not any(p.search(value) for p in candidates):
+                return f'value{index + 1} does not match the indicator type regex'
+        return None
+
+    def add(
+        self,
+        indicator_type: str,
+        reason: str,
+        xid: Optional[str] = None,
+        indicator_data: Optional[Union[dict, object]] = None,
+    ) -> None:
+        """Record an invalid indicator, quarantining it when the data is provided.
+
+        Args:
+            indicator_type: The ThreatConnect indicator type.
+            reason: The reason the indicator is invalid.
+            xid: The xid of the indicator.
+            indicator_data: The indicator dict or object to quarantine.
+        """
+        with self._lock:
+            reasons = self.counts.setdefault(indicator_type, {})
+            reasons[reason] = reasons.get(reason, 0) + 1
+            if indicator_data is not None:
+                self.quarantined[xid] = {'indicator': indicator_data, 'reason': reason}
+
+    @property
+    def invalid_count(self) -> int:
+        """Return the number of invalid indicators."""
+        return sum(sum(r.values()) for r in self.counts.values())
+
+    def patterns(self, indicator_type: str) -> Optional[list]:
+        """Return the compiled regexes for the indicator type or None for an unknown type.
+
+        Args:
+            indicator_type: The ThreatConnect indicator type.
+
+        Returns:
+            list: A compiled regex (or None if the value has no regex) for each value.
+        """
+        patterns = self._patterns.get(indicator_type)
+        if patterns is None:
+            entry = self.indicator_types_data.get(indicator_type)
+            if entry is None:
+                return None
+
+            patterns = []
+            for index in range(1, 4):
+                regex = entry.get(f'regex{index}')
+                if regex is None and index == 1:
+                    regex = entry.get('regex')
+                if regex is None and not entry.get(f'value{index}Label'):
+                    break
+
+                try:
+                    patterns.append(re.compile(regex) if regex else None)
+                except (re.error, TypeError):
+                    # e.g., java only syntax such as unicode property classes (\p{L})
+                    self.skipped_patterns.setdefault(indicator_type, []).append(regex)
+                    patterns.append(None)
+            self._patterns[indicator_type] = patterns
+        return patterns
+
+    @property
+    def report(self) -> dict:
+        """Return the number of valid and invalid indicators and the invalid reasons by type."""
+        return {
+            'valid': self.valid_count,
+            'invalid': self.invalid_count,
+            'quarantined': len(self.quarantined),
+            'types': {k: dict(v) for k, v in self.counts.items()},
+        }
+
+    def validate(self, indicator_type: str, summary: str) -> Optional[str]:
+        """Validate a single indicator.
+
+        Args:
+            indicator_type: The ThreatConnect indicator type.
+            summary: The indicator summary (" : " delimited for multi-valued indicators).
+
+        Returns:
+            str: The reason the indicator is invalid or None if the indicator is valid.
+        """
+        return self.validate_many([(indicator_type, summary)])[0]
+
+    def validate_many(
+        self, indicators: Iterable[Union[dict, object, tuple]]
+    ) -> List[Optional[str]]:
+        """Validate a list of indicators, matching all values of each type at once.
+
+        Args:
+            indicators: The indicator dicts, objects, or (type, summary) tuples.
+
+        Returns:
+            list: The reason each indicator is invalid or None if the indicator is valid.
+        """
+        # group the values of each indicator type so each regex is applied in a single pass
+        by_type = {}
+        reasons = []
+        for index, indicator_data in enumerate(indicators):
+            if isinstance(indicator_data, tuple):
+                indicator_type, summary = indicator_data
+            elif isinstance(indicator_data, dict):
+                indicator_type = indicator_data.get('type')
+                summary = indicator_data.get('summary')
+            else:
+                indicator_type = indicator_data.type
+                summary = indicator_data.summary
+            reasons.append(None)
+            by_type.setdefault(indicator_type, []).append((index, summary))
+
+        for indicator_type, entries in by_type.items():
+            patterns = self.patterns(indicator_type)
+            if patterns is None:
+                for index, _ in entries:
+                    reasons[index] = 'unknown indicator type'
+                continue
+
+            single = len(patterns) == 1 and patterns[0] is not None
+            for index, summary in entries:
+                if not summary:
+                    reasons[index] = 'summary is empty'
+                elif single and ' : ' not in summary:
+                    # fast path for single valued types (e.g., Address, Host, URL)
+                    if patterns[0].search(summary.strip()) is None:
+                        reasons[index] = 'value1 does not match the indicator type regex'
+                else:
+                    reasons[index] = self._reason(patterns, self._values(summary))
+
+        with self._lock:
+            self.valid_count += reasons.count(None)
+        return reasons
@@ -1,13 +1,19 @@
 """ThreatConnect SecurityLabel Object"""
 # standard library
 import json
+from functools import lru_cache
 from typing import Optional
 
 
 class SecurityLabel:
-    """ThreatConnect Batch SecurityLabel Object."""
+    """ThreatConnect Batch SecurityLabel Object.
 
-    __slots__ = ['_label_data']
+    The label data (and its memoized JSON) is shared by all instances with the same name,
+    description, and color. Updating the color or description copies the data first. The
+    shared data is kept for the 10,000 most recently used labels.
+    """
+
+    __slots__ = ['_json', '_label_data']
 
     def __init__(self, name: str, description: Optional[str] = None, color: Optional[str] = None):
         """Initialize Class Properties.
@@ -17,12 +23,19 @@ class SecurityLabel:
             description: A description for this security label.
             color: A color (hex value) for this security label.
         """
-        self._label_data = {'name': name}
+        self._label_data, self._json = self._shared(name, description, color)
+
+    @staticmethod
+    @lru_cache(maxsize=10_000)
+    def _shared(name: str, description: Optional[str], color: Optional[str]) -> tuple:
+        """Return the shared label data and JSON (least recently used are evicted)."""
+        label_data = {'name': name}
         # add description if provided
         if description is not None:
-            self._label_data['description'] = description
+            label_data['description'] = description
         if color is not None:
-            self._label_data['color'] = color
+            label_data['color'] = color
+        return label_data, json.dumps(label_data)
 
     @property
     def color(self) -> str:
@@ -32,12 +45,13 @@ class SecurityLabel:
     @color.setter
     def color(self, color: str):
         """Set Security Label color."""
-        self._label_data['color'] = color
+        self._label_data = {**self._label_data, 'color': color}
+        self._json = None
 
     @property
     def data(self) -> dict:
-        """Return Security Label data."""
-        return self._label_data
+        """Return a copy of the Security Label data (the data is shared with other instances)."""
+        return dict(self._label_data)
 
     @property
     def description(self) -> str:
@@ -47,7 +61,15 @@ class SecurityLabel:
     @description.setter
     def description(self, description: str):
         """Set Security Label description."""
-        self._label_data['description'] = description
+        self._label_data = {**self._label_data, 'description': description}
+        self._json = None
+
+    @property
+    def json(self) -> str:
+        """Return the memoized JSON encoded Security Label data."""
+        if self._json is None:
+            self._json = json.dumps(self._label_data)
+        return self._json
 
     @property
     def name(self) -> str:
@@ -1,13 +1,19 @@
 """ThreatConnect Batch Import Module"""
 # standard library
 import json
+import sys
+from functools import lru_cache
 from typing import Callable, Optional
 
 
 class Tag:
-    """ThreatConnect Batch Tag Object"""
+    """ThreatConnect Batch Tag Object
 
-    __slots__ = ['_tag_data', '_valid']
+    Tags are immutable, so the Indicator and Group objects share a single Tag instance (and
+    its memoized JSON) for each tag name (see shared()).
+    """
+
+    __slots__ = ['_json', '_tag_data', '_valid']
 
     def __init__(self, name: str, formatter: Optional[Callable[[str], str]] = None):
         """Initialize Class Properties.
@@ -18,22 +24,59 @@ class Tag:
         """
         if formatter is not None:
             name = formatter(name)
+        if isinstance(name, str):
+            # the same tags are used on many indicators/groups, share a single copy
+            name = sys.intern(name)
+        self._json = None
         self._tag_data = {'name': name}
         # is tag not null or ''
         self._valid = True
         if not name:
             self._valid = False
 
+    @staticmethod
+    @lru_cache(maxsize=10_000)
+    def _shared(name: str) -> 'Tag':
+        """Return the shared Tag instance for the name (least recently used are evicted)."""
+        return Tag(name)
+
     @property
     def data(self) -> dict:
-        """Return Tag data."""
-        return self._tag_data
+        """Return a copy of the Tag data (the data is shared with other instances)."""
+        return dict(self._tag_data)
+
+    @property
+    def json(self) -> str:
+        """Return the memoized JSON encoded Tag data."""
+        if self._json is None:
+            self._json = json.dumps(self._tag_data)
+        return self._json
 
     @property
     def name(self) -> str:
         """Return Tag name."""
         return self._tag_data.get('name')
 
+    @classmethod
+    def shared(cls, name: str, formatter: Optional[Callable[[str], str]] = None) -> 'Tag':
+        """Return the shared Tag instance for the name.
+
+        The instances of the 10,000 most recently used tag names are shared.
+
+        Args:
+            name: The value for this tag.
+            formatter: A callable that take a tag value and returns a formatted tag.
+
+        Returns:
+            Tag: The shared instance of the Tag class.
+        """
+        if formatter is not None:
+            name = formatter(name)
+        if not isinstance(name, str):
+            return cls(name)
+
+        return cls._shared(name)
+
     @property
     def valid(self) -> bool:
         """Return valid data."""
@@ -54,6 +54,7 @@ class TcArgumentParser(ArgumentParser):
         self._logger_arguments()
         self._playbook_arguments()
         self._service_arguments()
+        self._session_arguments()
         self._standard_arguments()
 
         # default namespace
@@ -332,6 +333,65 @@ class TcArgumentParser(ArgumentParser):
         self.add_argument('--tc_svc_server_topic', help='Topic to send server messages')
         self.add_argument('--tcex_testing_context', help='A context for TcEx Framework testing')
 
+    def _session_arguments(self):
+        """Define API session connection pool args.
+
+        Args that are not provided use the requests defaults (10 pools of 10 connections
+        without blocking). Defaults for an App can be set with install.json params.
+
+        --tc_session_pool_connections count     The number of hosts to cache connection pools for.
+        --tc_session_pool_maxsize count         The max connections to keep in the pool per host.
+        --tc_session_pool_block                 Flag to wait for a free connection instead of
+                                                opening a new connection.
+        --tc_session_tcp_keepalive              Flag to enable TCP keep-alive on connections.
+        --tc_session_tcp_keepalive_idle seconds The idle time before keep-alive probes are sent.
+        --tc_session_tcp_keepalive_interval seconds
+                                                The time between keep-alive probes.
+        --tc_session_tcp_keepalive_count count  The failed probes before a connection is dropped.
+        """
+        self.add_argument(
+            '--tc_session_pool_connections',
+            default=None,
+            help='Number of hosts to cache connection pools for',
+            type=int,
+        )
+        self.add_argument(
+            '--tc_session_pool_maxsize',
+            default=None,
+            help='Max connections to keep in the pool per host',
+            type=int,
+        )
+        self.add_argument(
+            '--tc_session_pool_block',
+            action='store_true',
+            default=None,
+            help='Wait for a free connection instead of opening a new connection',
+        )
+        self.add_argument(
+            '--tc_session_tcp_keepalive',
+            action='store_true',
+            default=None,
+            help='Enable TCP keep-alive on connections',
+        )
+        self.add_argument(
+            '--tc_session_tcp_keepalive_idle',
+            default=None,
+            help='Idle seconds before keep-alive probes are sent',
+            type=int,
+        )
+        self.add_argument(
+            '--tc_session_tcp_keepalive_interval',
+            default=None,
+            help='Seconds between keep-alive probes',
+            type=int,
+        )
+        self.add_argument(
+            '--tc_session_tcp_keepalive_count',
+            default=None,
+            help='Failed keep-alive probes before a connection is dropped',
+            type=int,
+        )
+
     def _standard_arguments(self):
         """Define standard args passed to every TcEx App.
 
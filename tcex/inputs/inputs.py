@@ -408,6 +408,8 @@ class Inputs:
             'tc_proxy_external',
             'tc_proxy_tc',
             'tc_secure_params',
+            'tc_session_pool_block',
+            'tc_session_tcp_keepalive',
             'tc_verify',
         ]
 
@@ -444,6 +446,13 @@ class Inputs:
             'tc_proxy_external',
             'tc_proxy_tc',
             'tc_secure_params',
+            'tc_session_pool_block',
+            'tc_session_pool_connections',
+            'tc_session_pool_maxsize',
+            'tc_session_tcp_keepalive',
+            'tc_session_tcp_keepalive_count',
+            'tc_session_tcp_keepalive_idle',
+            'tc_session_tcp_keepalive_interval',
             'tc_temp_path',
             'tc_token',
             'tc_token_expires',
@@ -1,5 +1,6 @@
 """TcEx Framework Playbook module"""
 # standard library
+import os
 import re
 
 from .playbooks_base import PlaybooksBase
@@ -20,6 +21,7 @@ class Playbooks(PlaybooksBase):
 
         # properties
         self.output_data = {}
+        self.temp_files = []  # files of Binary outputs deleted once written (see write_output)
 
     def add_output(self, key, value, variable_type, append_array=True):
         """Dynamically add output to output_data dictionary to be written to DB later.
@@ -138,7 +140,8 @@ class Playbooks(PlaybooksBase):
 
         Args:
             key (str): The variable to write to the Key Value Store.
-            value (any): The data to write to the Key Value Store.
+            value (bytes|os.PathLike): The data to write to the Key Value Store, or the path to a
+                file containing the data (the file is read in chunks).
 
         Returns:
             (str): Result of Key Value Store write.
@@ -712,6 +715,23 @@ class Playbooks(PlaybooksBase):
         return var_type
 
     def write_output(self):
-        """Write all stored output data to storage."""
+        """Write all stored output data to storage.
+
+        The files in temp_files (e.g., a streamed download added as a Binary output) are deleted
+        once they are written, and their outputs are removed so write_output can be called again.
+        """
         for data in self.output_data.values():
             self.create_output(data.get('key'), data.get('value'), data.get('type'))
+
+        if self.temp_files:
+            self.output_data = {
+                index: data
+                for index, data in self.output_data.items()
+                if data.get('value') not in self.temp_files
+            }
+            for path in self.temp_files:
+                try:
+                    os.remove(path)
+                except OSError:  # pragma: no cover
+                    self.log.warning(f'Failed removing temp file {path}.')
+            self.temp_files = []
@@ -2,6 +2,7 @@
 # standard library
 import base64
 import json
+import os
 import re
 from collections import OrderedDict
 from collections.abc import Iterable
@@ -34,6 +35,33 @@ class PlaybooksBase:
         # match embedded variables without quotes (#App:7979:variable_name!StringArray)
         self._vars_keyvalue_embedded = re.compile(fr'(?:\"\:\s?)[^\"]?{self._variable_pattern}')
 
+    @staticmethod
+    def _b64encode_file(path, chunk_size=3 * 1024 * 1024):
+        """Return the JSON encoded base64 value of a file, reading the file in chunks.
+
+        The file is never fully loaded into memory, and each encoded chunk is copied into a
+        single buffer sized for the value, so the value is only held once (json.dumps is not
+        required as base64 has no characters that must be escaped).
+
+        Args:
+            path (os.PathLike): The path to the file.
+            chunk_size (int): The size of each chunk (must be a multiple of 3).
+
+        Returns:
+            (bytearray): The JSON encoded base64 value.
+        """
+        value = bytearray(4 * ((os.path.getsize(path) + 2) // 3) + 2)
+        value[0] = value[-1] = ord('"')
+        offset = 1
+        with open(path, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(chunk_size), b''):
+                encoded = base64.b64encode(chunk)
+                value[offset : offset + len(encoded)] = encoded
+                offset += len(encoded)
+        if offset != len(value) - 1:
+            raise RuntimeError(f'The file {path} was changed while it was being encoded.')
+        return value
+
     def _coerce_string_value(self, value):
         """Return a string value from an bool or int."""
         # coerce bool before int as python says a bool is an int
@@ -58,6 +86,16 @@ class PlaybooksBase:
         # get variable type from variable value
         variable_type = self.variable_type(key)
 
+        if variable_type == 'Binary' and isinstance(value, os.PathLike):
+            # a file reference (e.g., a streamed download) is encoded directly from disk
+            try:
+                return self.tcex.key_value_store.create(
+                    self._context, key.strip(), self._b64encode_file(value)
+                )
+            except RuntimeError as e:
+                self.log.error(e)
+            return None
+
         if variable_type == 'Binary':
             # if not isinstance(value, bytes):
             #     value = value.encode('utf-8')
@@ -1,4 +1,8 @@
 """Session module for TcEx Framework"""
 # flake8: noqa
+from .async_tc_session import AsyncTcSession
 from .external_session import ExternalSession
+from .http_metrics import HttpMetrics
+from .response_cache import ResponseCache
 from .tc_session import TcSession
+from .token_bucket import TokenBucketRateLimitHandler
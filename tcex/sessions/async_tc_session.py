@@ -0,0 +1,340 @@
+"""ThreatConnect Asyncio Session"""
+# standard library
+import asyncio
+import datetime
+import logging
+import os
+import ssl
+import time
+from typing import Optional, Union
+
+# third-party
+from requests import Request, Response, exceptions
+from requests.structures import CaseInsensitiveDict
+from requests.utils import default_headers, get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+from ..utils import Utils
+from .http_metrics import HttpMetrics
+from .tc_session import HmacAuth, TokenAuth
+
+try:
+    # third-party
+    import aiohttp
+    import yarl
+except ImportError:  # pragma: no cover
+    # aiohttp is only required for AsyncTcSession (pip install tcex[async])
+    aiohttp = None
+
+
+class AsyncTcSession:
+    """ThreatConnect REST API Asyncio Session
+
+    The async counterpart of TcSession for high fan-out workloads (e.g., enriching thousands of
+    indicators), where the requests are multiplexed over a pool of connections on one thread
+    instead of a thread per request. Requests are prepared and signed (HMAC or token) exactly
+    as in TcSession, and responses are returned as requests.Response objects, so response
+    handling (e.g., r.ok, r.json()) is unchanged.
+
+    The underlying aiohttp session is bound to the running event loop, so an instance should be
+    used (and closed) within a single event loop.
+
+    .. code-block:: python
+
+        async def main(tcex):
+            async with tcex.get_async_session() as session:
+                responses = await asyncio.gather(
+                    *[session.get(f'/v2/indicators/{i}') for i in indicators]
+                )
+
+    Args:
+        api_access_id: The ThreatConnect API access id.
+        api_secret_key: The ThreatConnect API secret key.
+        base_url: The ThreatConnect API URL.
+        logger: An instance of Logger.
+        limit: The max number of concurrent connections.
+        pool_config: The connection pool settings (see PoolAdapter). The pool_maxsize setting
+            limits the concurrent connections per host.
+    """
+
+    def __init__(
+        self,
+        api_access_id: str,
+        api_secret_key: str,
+        base_url: str,
+        logger: Optional[object] = None,
+        limit: Optional[int] = 100,
+        pool_config: Optional[dict] = None,
+    ):
+        """Initialize the Class properties."""
+        if aiohttp is None:  # pragma: no cover
+            raise RuntimeError('The aiohttp package is required for AsyncTcSession.')
+
+        self.api_access_id = api_access_id
+        self.api_secret_key = api_secret_key
+        self.base_url = base_url.strip('/')
+        self.limit = limit
+        self.log = logger or logging.getLogger('session')
+        self.pool_config = pool_config or {}
+
+        # properties
+        self._client = None
+        self._log_curl: bool = False
+        self._ssl_context = None  # the verify setting and the SSLContext built for it
+        self._token = None
+        self.auth = None
+        self.headers = default_headers()
+        self.metrics = HttpMetrics()
+        self.proxies = {}
+        self.utils = Utils()
+        self.verify = True
+
+        # Add Retry
+        self.retry()
+
+    def _backoff(self, retry_number: int) -> float:
+        """Return the seconds to sleep before a retry (matching the urllib3 Retry backoff)."""
+        if retry_number <= 1:
+            return 0
+        return min(self.backoff_factor * (2 ** (retry_number - 1)), Retry.DEFAULT_BACKOFF_MAX)
+
+    def _configure_auth(self):
+        """Return Auth property for session."""
+        # Add ThreatConnect Authorization
+        if self.token_available:
+            # service Apps only use tokens and playbook/runtime Apps will use token if available
+            self.auth = TokenAuth(self.token)
+            self.log.debug('feature=async-tc-session, event=auth, type=token')
+        elif self.api_access_id and self.api_secret_key:
+            # for external Apps or testing Apps locally
+            self.auth = HmacAuth(self.api_access_id, self.api_secret_key)
+            self.log.debug('feature=async-tc-session, event=auth, type=hmac')
+        else:  # pragma: no cover
+            raise RuntimeError('No valid ThreatConnect API credentials provided.')
+
+    def _is_retryable(
+        self, method: str, error: Union[exceptions.ConnectionError, exceptions.Timeout]
+    ) -> bool:
+        """Return True if a connection error or timeout can be retried (matching urllib3 Retry).
+
+        A request that failed to connect was never sent, so it is retried for all methods. A
+        request that failed or timed out after it was sent (e.g., the server disconnected) may
+        have been processed by the server, so it is only retried for idempotent methods.
+        """
+        if isinstance(error, exceptions.ConnectionError) and isinstance(
+            error.args[0], aiohttp.ClientConnectorError
+        ):
+            return True
+        return self.retry_policy._is_method_retryable(method)  # pylint: disable=protected-access
+
+    async def _send(self, prepared: object, timeout: Optional[float] = None) -> Response:
+        """Send the prepared request and return the response as a requests Response."""
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.pool_config.get('pool_maxsize') or 0
+            )
+            self._client = aiohttp.ClientSession(connector=connector, auto_decompress=True)
+
+        # aiohttp header values must be strings (e.g., the HMAC Timestamp header)
+        headers = {k: str(v) for k, v in prepared.headers.items()}
+        start = time.perf_counter()
+        try:
+            async with self._client.request(
+                prepared.method,
+                # the url is already encoded and signed, don't allow it to be requoted
+                yarl.URL(prepared.url, encoded=True),
+                data=prepared.body,
+                headers=headers,
+                proxy=self.proxies.get('https'),
+                ssl=self._ssl(),
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as r:
+                content = await r.read()
+        except asyncio.TimeoutError as e:
+            raise exceptions.Timeout(e, request=prepared)
+        except aiohttp.ClientConnectionError as e:
+            raise exceptions.ConnectionError(e, request=prepared)
+
+        response = Response()
+        response._content = content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.elapsed = datetime.timedelta(seconds=time.perf_counter() - start)
+        response.headers = CaseInsensitiveDict(r.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = r.reason
+        response.request = prepared
+        response.status_code = r.status
+        response.url = prepared.url
+        return response
+
+    def _ssl(self) -> Union[bool, ssl.SSLContext]:
+        """Return the aiohttp ssl setting for the verify setting (matching requests).
+
+        A CA bundle file or directory (str) is loaded into an SSLContext, which is reused until
+        the verify setting is changed.
+        """
+        if not isinstance(self.verify, str):
+            return bool(self.verify)
+
+        if self._ssl_context is None or self._ssl_context[0] != self.verify:
+            if os.path.isdir(self.verify):
+                context = ssl.create_default_context(capath=self.verify)
+            else:
+                context = ssl.create_default_context(cafile=self.verify)
+            self._ssl_context = (self.verify, context)
+        return self._ssl_context[1]
+
+    async def close(self) -> None:
+        """Close the underlying aiohttp session."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def delete(self, url: str, **kwargs) -> Response:
+        """Send a DELETE request."""
+        return await self.request('DELETE', url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> Response:
+        """Send a GET request."""
+        return await self.request('GET', url, **kwargs)
+
+    @property
+    def log_curl(self) -> bool:
+        """Return whether or not requests will be logged as a curl command."""
+        return self._log_curl
+
+    @log_curl.setter
+    def log_curl(self, log_curl: bool):
+        """Enable or disable logging curl commands."""
+        self._log_curl = log_curl
+
+    async def post(self, url: str, **kwargs) -> Response:
+        """Send a POST request."""
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> Response:
+        """Send a PUT request."""
+        return await self.request('PUT', url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs) -> Response:
+        """Send a signed request to the ThreatConnect API.
+
+        Args:
+            method: The HTTP method.
+            url: The URL or path for the request.
+            data (kwargs: Union[bytes, dict, str]): The request body.
+            headers (kwargs: dict): Additional request headers.
+            json (kwargs: Union[dict, list]): The request body as JSON.
+            params (kwargs: dict): The query params.
+            timeout (kwargs: float): The total timeout for each attempt (seconds).
+
+        Returns:
+            Response: The requests Response object.
+        """
+        if self.auth is None:
+            self._configure_auth()
+
+        # accept path for API calls instead of full URL
+        if not url.startswith('https'):
+            url = f'{self.base_url}{url}'
+
+        headers = CaseInsensitiveDict(self.headers)
+        headers.update(kwargs.get('headers') or {})
+        request = Request(
+            method.upper(),
+            url,
+            data=kwargs.get('data'),
+            headers=headers,
+            json=kwargs.get('json'),
+            params=kwargs.get('params'),
+        )
+
+        retry_number = 0
+        start = time.perf_counter()
+        while True:
+            # sign on each attempt so the HMAC timestamp is current
+            prepared = request.prepare()
+            self.auth(prepared)
+            try:
+                response = await self._send(prepared, kwargs.get('timeout'))
+            except (exceptions.ConnectionError, exceptions.Timeout) as e:
+                if retry_number >= self.retries or not self._is_retryable(prepared.method, e):
+                    self.metrics.record(method, prepared.url, time.perf_counter() - start)
+                    raise
+            else:
+                if retry_number >= self.retries or not self.retry_policy.is_retry(
+                    prepared.method, response.status_code
+                ):
+                    break
+
+            retry_number += 1
+            self.log.debug(
+                f'feature=async-tc-session, event=retry, request-url={prepared.url}, '
+                f'retry={retry_number}'
+            )
+            await asyncio.sleep(self._backoff(retry_number))
+        self.metrics.record_response(response, time.perf_counter() - start, retries=retry_number)
+
+        # don't show curl message for logging commands
+        if '/v2/logs/app' not in url:
+            # APP-79 - adding logging of request as curl commands
+            if not response.ok or self.log_curl:
+                try:
+                    self.log.debug(
+                        self.utils.requests_to_curl(
+                            response.request, proxies=self.proxies, verify=self.verify
+                        )
+                    )
+                except Exception:  # nosec
+                    pass  # logging curl command is best effort
+
+        self.log.debug(
+            f'feature=async-tc-session, request-url={response.request.url}, '
+            f'status_code={response.status_code}, elapsed={response.elapsed}'
+        )
+
+        return response
+
+    def retry(self, retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504)):
+        """Configure the retry policy (matching TcSession.retry).
+
+        Connection failures are retried for all methods. Errors and timeouts after the request
+        was sent (e.g., the server disconnected) and the status codes in status_forcelist are
+        retried for idempotent methods.
+        """
+        self.backoff_factor = backoff_factor
+        self.retries = retries
+        self.retry_policy = Retry(
+            total=retries,
+            read=retries,
+            connect=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+        )
+
+    @property
+    def token(self):
+        """Return token."""
+        return self._token
+
+    @token.setter
+    def token(self, token):
+        """Set token."""
+        self._token = token
+
+    @property
+    def token_available(self):
+        """Return true if the current App is a service App."""
+        return (
+            self.token is not None
+            and self.token.token is not None
+            and self.token.token_expires is not None
+        )
+
+    async def __aenter__(self):
+        """Return the session for use as an async context manager."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Close the session on exit of the async context manager."""
+        await self.close()
@@ -3,15 +3,20 @@
 import logging
 import time
 from typing import Callable, Optional
+from urllib.parse import urlsplit
 
 # third-party
 import urllib3
-from requests import Response, Session, adapters, exceptions
+from requests import Response, Session, exceptions
 from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, DEFAULT_RETRIES
 from urllib3.util.retry import Retry
 
 from ..utils import Utils
+from .http_metrics import HttpMetrics
+from .pool_adapter import PoolAdapter
 from .rate_limit_handler import RateLimitHandler
+from .response_cache import ResponseCache
+from .retry_scheduler import RetryScheduler
 
 # disable ssl warning message
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -44,7 +49,7 @@ def default_too_many_requests_handler(response: Response) -> float:
     return float(seconds)
 
 
-class CustomAdapter(adapters.HTTPAdapter):
+class CustomAdapter(PoolAdapter):
     """Custom Adapter to properly handle retries."""
 
     def __init__(
@@ -54,6 +59,7 @@ class CustomAdapter(adapters.HTTPAdapter):
         pool_maxsize=DEFAULT_POOLSIZE,
         max_retries=DEFAULT_RETRIES,
         pool_block=DEFAULT_POOLBLOCK,
+        **kwargs,
     ):
         """Initialize CustomAdapter.
 
@@ -63,8 +69,12 @@ class CustomAdapter(adapters.HTTPAdapter):
             pool_maxsize: passed to super
             max_retries: passed to super
             pool_block: passed to super
+            tcp_keepalive (kwargs: bool): passed to super
+            tcp_keepalive_idle (kwargs: int): passed to super
+            tcp_keepalive_interval (kwargs: int): passed to super
+            tcp_keepalive_count (kwargs: int): passed to super
         """
-        super().__init__(pool_connections, pool_maxsize, max_retries, pool_block)
+        super().__init__(pool_connections, pool_maxsize, max_retries, pool_block, **kwargs)
         self._rate_limit_handler = rate_limit_handler
 
     def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
@@ -109,6 +119,8 @@ class ExternalSession(Session):
     Args:
         base_url (Optional[str] = None): The base URL for all requests.
         logger (Optional[object] = None): An instance of Logger.
+        pool_config (Optional[dict] = None): The connection pool settings (see PoolAdapter),
+            e.g., pool_maxsize.
     """
 
     __attrs__ = [
@@ -129,16 +141,30 @@ class ExternalSession(Session):
         '_mask_headers',
         '_mask_patterns',
         'log',
+        'metrics',
+        'pool_config',
+        'response_cache',
+        'retry_scheduler',
         'utils',
     ]
 
-    def __init__(self, base_url: Optional[str] = None, logger: Optional[object] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        logger: Optional[object] = None,
+        pool_config: Optional[dict] = None,
+    ):
         """Initialize the Class properties."""
         super().__init__()
         self._base_url: str = base_url
         self.log: object = logger or logging.getLogger('session')
+        self.pool_config: dict = pool_config or {}
 
         self._custom_adapter: Optional[CustomAdapter] = None
+        self.metrics: HttpMetrics = HttpMetrics()
+        # an opt-in conditional request cache for GET requests (see ResponseCache)
+        self.response_cache: Optional[ResponseCache] = None
+        self.retry_scheduler: RetryScheduler = RetryScheduler()
         self.utils: object = Utils()
 
         # properties
@@ -152,6 +178,61 @@ class ExternalSession(Session):
         # Add default Retry
         self.retry()
 
+    def _send_with_retry(self, method: str, url: str, **kwargs) -> Response:
+        """Send the request, retrying 429 responses as scheduled by the RetryScheduler.
+
+        Args:
+            method: The HTTP method
+            url: The full URL for the request.
+
+        Returns:
+            Response: The requests Response object.
+        """
+        # this kwargs value is used to disable 429 handling, but the super method doesn't
+        # expect it so it needs to be removed.
+        tc_is_retry = kwargs.pop('tc_is_retry', False)
+
+        host = urlsplit(url).netloc
+        delay = 0.0
+        retry_number = 0
+        start = time.monotonic()
+        while True:
+            max_wait = None
+            if self.retry_scheduler.deadline is not None:
+                max_wait = self.retry_scheduler.deadline - (time.monotonic() - start)
+            self.retry_scheduler.wait_for_cooldown(host, max_wait)
+
+            response: Response = self.metrics.call(super().request, method, url, **kwargs)
+            if response.status_code != 429 or tc_is_retry:
+                break
+
+            delay = self.retry_scheduler.schedule(
+                retry_number,
+                self.too_many_requests_handler(response),
+                delay,
+                time.monotonic() - start,
+            )
+            if delay is None:
+                self.log.warning(
+                    f'feature=external-session, event=retry-budget-exhausted, '
+                    f'request-url={response.request.url}, retries={retry_number}'
+                )
+                break
+
+            # other threads wait for the cooldown instead of sending requests to the host
+            self.retry_scheduler.cooldown(host, delay)
+            self.metrics.record_retry(method, url, delay)
+            retry_number += 1
+            self.log.debug(
+                f'feature=external-session, event=retry, request-url={response.request.url}, '
+                f'retry={retry_number}, delay={delay:.3f}'
+            )
+            # release the connection of a streamed response before the retry
+            response.close()
+            time.sleep(delay)
+
+        return response
+
     @property
     def base_url(self) -> str:
         """Return the base url."""
@@ -202,6 +283,11 @@ class ExternalSession(Session):
         """Set property"""
         self._mask_patterns = patterns
 
+    @property
+    def pool_utilization(self) -> list:
+        """Return the utilization of the connection pool of each host (see PoolAdapter)."""
+        return PoolAdapter.session_utilization(self)
+
     @property
     def too_many_requests_handler(self) -> Callable[[Response], float]:
         """Get the too_many_requests_handler.
@@ -264,17 +350,12 @@ class ExternalSession(Session):
         if self.base_url is not None and not url.startswith('https'):
             url = f'{self.base_url}{url}'
 
-        # this kwargs value is used to signal 429 handling that this is a retry, but the super
-        # method doesn't expect it so it needs to be removed.
-        tc_is_retry = kwargs.pop('tc_is_retry', False)
-
-        response: Response = super().request(method, url, **kwargs)
-
-        if response.status_code == 429 and not tc_is_retry:
-            too_many_requests_handler = self.too_many_requests_handler
-            time.sleep(too_many_requests_handler(response))
-            kwargs['tc_is_retry'] = True
-            return self.request(method, url, **kwargs)
+        if self.response_cache is not None:
+            response = self.response_cache.call(
+                self._send_with_retry, method, url, session=self, **kwargs
+            )
+        else:
+            response = self._send_with_retry(method, url, **kwargs)
 
         # APP-79 - adding logging of request as curl commands
         if not response.ok or self.log_curl:
@@ -350,7 +431,9 @@ class ExternalSession(Session):
             self._custom_adapter.max_retries = retry_object
         else:
             self._custom_adapter = CustomAdapter(
-                rate_limit_handler=self.rate_limit_handler, max_retries=retry_object
+                rate_limit_handler=self.rate_limit_handler,
+                max_retries=retry_object,
+                **self.pool_config,
             )
 
         # mount the custom adapter
@@ -360,3 +443,26 @@ class ExternalSession(Session):
                 f'backoff-factor={backoff_factor}, status-forcelist={status_forcelist}, url={url}'
             )
             self.mount(url, self._custom_adapter)
+
+    def too_many_requests_config(
+        self,
+        max_retries: Optional[int] = 3,
+        base_delay: Optional[float] = 1.0,
+        max_delay: Optional[float] = 60.0,
+        deadline: Optional[float] = 300.0,
+    ):
+        """Configure the retries of 429 (Too Many Requests) responses.
+
+        The wait before the first retry is the value from the too_many_requests_handler, further
+        retries use decorrelated jitter (see RetryScheduler).
+
+        Args:
+            max_retries: The max number of retries of a request (0 to disable retries).
+            base_delay: The min delay (seconds) of the decorrelated jitter.
+            max_delay: The max delay (seconds) of the decorrelated jitter.
+            deadline: The max time (seconds) to spend on a request including the retries.
+        """
+        self.retry_scheduler.max_retries = max_retries
+        self.retry_scheduler.base_delay = base_delay
+        self.retry_scheduler.max_delay = max_delay
+        self.retry_scheduler.deadline = deadline
@@ -0,0 +1,350 @@
+"""ThreatConnect Requests Session HTTP Metrics"""
+# standard library
+import bisect
+import re
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+# the upper bound (ms) of each latency histogram bucket, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 30_000, 60_000)
+
+# the route recorded for new routes once the max routes are recorded
+OVERFLOW_ROUTE = '{other}'
+
+# the time spent waiting on a free pool connection by the current thread (see PoolStatsMixin)
+pool_wait = threading.local()
+
+
+class RouteMetrics:
+    """The metrics for a single method and route."""
+
+    __slots__ = (
+        'bytes_received',
+        'bytes_sent',
+        'count',
+        'errors',
+        'histogram',
+        'max_ms',
+        'pool_wait_ms',
+        'retries',
+        'retry_wait_ms',
+        'status_429',
+        'total_ms',
+    )
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.count = 0
+        self.errors = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.max_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self.retries = 0
+        self.retry_wait_ms = 0.0
+        self.status_429 = 0
+        self.total_ms = 0.0
+
+    @property
+    def data(self) -> dict:
+        """Return the metrics as a dict."""
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'status_429': self.status_429,
+            'retries': self.retries,
+            'retry_wait_ms': round(self.retry_wait_ms, 3),
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max_ms, 3),
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'pool_wait_ms': round(self.pool_wait_ms, 3),
+            'histogram': dict(zip([*LATENCY_BUCKETS_MS, 'inf'], self.histogram)),
+        }
+
+    def percentile(self, percent: float) -> float:
+        """Return the latency percentile (ms), as the upper bound of the histogram bucket."""
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.histogram):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return float(min(LATENCY_BUCKETS_MS[index], self.max_ms))
+                break
+        return self.max_ms
+
+
+class HttpMetrics:
+    """Per method and route HTTP metrics for TcSession, ExternalSession, and AsyncTcSession.
+
+    Each request is recorded against a route template, where the path segments that identify
+    an object (e.g., ids, indicator values, and hashes) are replaced with "{id}", so that
+    /v2/groups/documents/123 and /v2/groups/documents/456 are aggregated as
+    /v2/groups/documents/{id}. Tag and security label names in the path are replaced with
+    "{name}" (e.g., /v2/tags/{name}/groups). The latency is recorded in a fixed bucket
+    histogram, so recording a request is a dict lookup and a few additions under a lock.
+
+    Once max_routes routes are recorded, requests for new routes are recorded against the
+    "{other}" route, so paths the templating doesn't match can't grow the metrics without
+    bound.
+
+    Args:
+        route_formatter: An optional callable that returns the route template for a URL path
+            (returning None uses the default templating).
+        max_routes: The max number of method and route pairs to record.
+    """
+
+    # path segments that are the unique id of an object
+    id_pattern = re.compile(
+        r'^(?:'
+        r'\d+'  # numeric ids
+        r'|[0-9a-fA-F]{16,}'  # hashes and hex ids
+        r'|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'  # uuid
+        r'|.*[.@:%\s].*'  # indicator values (e.g., addresses, hosts, emails, urls)
+        r')$'
+    )
+
+    # path segments followed by an object name (e.g., /v2/tags/{name})
+    name_parents = {'securityLabels', 'tags'}
+
+    def __init__(
+        self,
+        route_formatter: Optional[Callable[[str], Optional[str]]] = None,
+        max_routes: Optional[int] = 1_000,
+    ):
+        """Initialize Class properties."""
+        self.max_routes = max_routes
+        self.route_formatter = route_formatter
+
+        # properties
+        self._lock = threading.Lock()
+        self._routes = {}
+        self.enabled = True
+
+    def _route_metrics(self, key: tuple) -> RouteMetrics:
+        """Return the metrics for a method and route, called with the lock held."""
+        metrics = self._routes.get(key)
+        if metrics is None:
+            if len(self._routes) >= self.max_routes:
+                key = (key[0], OVERFLOW_ROUTE)
+                metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = RouteMetrics()
+        return metrics
+
+    def call(self, send: Callable[..., object], method: str, url: str, **kwargs) -> object:
+        """Send a request with the send method (e.g., Session.request) and record it.
+
+        Args:
+            send: The method that sends the request and returns a requests Response.
+            method: The HTTP method.
+            url: The full URL of the request.
+
+        Returns:
+            object: The requests Response object.
+        """
+        pool_wait.seconds = 0.0
+        start = time.perf_counter()
+        try:
+            response = send(method, url, **kwargs)
+        except Exception:
+            self.record(method, url, time.perf_counter() - start)
+            raise
+
+        self.record_response(
+            response,
+            time.perf_counter() - start,
+            pool_wait_seconds=pool_wait.seconds,
+            stream=kwargs.get('stream'),
+        )
+        return response
+
+    def clear(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._routes = {}
+
+    def log_summary(self, logger: object, limit: Optional[int] = 25) -> None:
+        """Log a summary of the routes with the highest total latency.
+
+        Args:
+            logger: An instance of Logger.
+            limit: The max number of routes to log.
+        """
+        summary = self.summary()
+        if not summary:
+            return
+
+        for route in summary[:limit]:
+            logger.info(
+                f'feature=http-metrics, method={route["method"]}, route={route["route"]}, '
+                f'count={route["count"]:,}, errors={route["errors"]:,}, '
+                f'status-429={route["status_429"]:,}, retries={route["retries"]:,}, '
+                f'retry-wait-ms={route["retry_wait_ms"]:,.0f}, '
+                f'total-ms={route["total_ms"]:,.0f}, p50-ms={route["p50_ms"]:,.0f}, '
+                f'p95-ms={route["p95_ms"]:,.0f}, max-ms={route["max_ms"]:,.0f}, '
+                f'bytes-sent={route["bytes_sent"]:,}, bytes-received={route["bytes_received"]:,}, '
+                f'pool-wait-ms={route["pool_wait_ms"]:,.0f}'
+            )
+        if len(summary) > limit:
+            logger.info(
+                f'feature=http-metrics, event=summary, routes-not-logged={len(summary) - limit}'
+            )
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        elapsed: float,
+        status_code: Optional[int] = None,
+        bytes_sent: Optional[int] = 0,
+        bytes_received: Optional[int] = 0,
+        retries: Optional[int] = 0,
+        pool_wait_seconds: Optional[float] = 0.0,
+    ) -> None:
+        """Record a request.
+
+        Args:
+            method: The HTTP method.
+            url: The full URL of the request.
+            elapsed: The total time of the request (seconds) including any retries.
+            status_code: The status code of the response (None if no response was received).
+            bytes_sent: The size of the request body.
+            bytes_received: The size of the response body.
+            retries: The number of retries to get the response.
+            pool_wait_seconds: The time spent waiting for a free connection.
+        """
+        if not self.enabled:
+            return
+
+        key = (method.upper(), self.route(url))
+        elapsed_ms = elapsed * 1000
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)
+        with self._lock:
+            metrics = self._route_metrics(key)
+            metrics.count += 1
+            metrics.histogram[bucket] += 1
+            metrics.total_ms += elapsed_ms
+            if elapsed_ms > metrics.max_ms:
+                metrics.max_ms = elapsed_ms
+            if status_code is None or status_code >= 400:
+                metrics.errors += 1
+            if status_code == 429:
+                metrics.status_429 += 1
+            metrics.retries += retries
+            metrics.bytes_sent += bytes_sent or 0
+            metrics.bytes_received += bytes_received or 0
+            metrics.pool_wait_ms += pool_wait_seconds * 1000
+
+    def record_response(
+        self, response: object, elapsed: float, retries: Optional[int] = None, **kwargs
+    ) -> None:
+        """Record a requests Response.
+
+        Args:
+            response: The requests Response object.
+            elapsed: The total time of the request (seconds) including any retries.
+            retries: The number of retries (defaults to the urllib3 retry history).
+            stream (kwargs: bool): If True, the response body has not been read.
+        """
+        request = response.request
+        if retries is None:
+            retries = len(getattr(getattr(response.raw, 'retries', None), 'history', None) or [])
+
+        # don't read the body of a streamed response
+        if kwargs.get('stream'):
+            bytes_received = int(response.headers.get('Content-Length') or 0)
+        else:
+            bytes_received = len(response.content or b'')
+
+        self.record(
+            request.method,
+            request.url,
+            elapsed,
+            status_code=response.status_code,
+            bytes_sent=self.request_size(request),
+            bytes_received=bytes_received,
+            retries=retries,
+            pool_wait_seconds=kwargs.get('pool_wait_seconds', 0.0),
+        )
+
+    def record_retry(self, method: str, url: str, wait_seconds: Optional[float] = 0.0) -> None:
+        """Record a retry that is not handled by the urllib3 Retry (e.g., on a 429 response).
+
+        Args:
+            method: The HTTP method.
+            url: The full URL of the request.
+            wait_seconds: The time waited before the retry.
+        """
+        if not self.enabled:
+            return
+
+        key = (method.upper(), self.route(url))
+        with self._lock:
+            metrics = self._route_metrics(key)
+            metrics.retries += 1
+            metrics.retry_wait_ms += wait_seconds * 1000
+
+    @staticmethod
+    def request_size(request: object) -> int:
+        """Return the size of the body of a PreparedRequest (0 for a streamed body)."""
+        body = request.body
+        if isinstance(body, (bytes, str)):
+            return len(body)
+        return int(request.headers.get('Content-Length') or 0)
+
+    def route(self, url: str) -> str:
+        """Return the route template for a URL (e.g., api.example.com/v2/indicators/{id})."""
+        parts = urlsplit(url)
+        template = None
+        if self.route_formatter is not None:
+            template = self.route_formatter(parts.path)
+        if template is None:
+            segments = parts.path.split('/')
+            v2 = segments[1:2] == ['v2']
+            for index, segment in enumerate(segments[1:], 1):
+                if not segment:
+                    continue
+                if segments[index - 1] in self.name_parents:
+                    segments[index] = '{name}'
+                elif v2 and index > 2 and segments[index - 2] == 'indicators':
+                    # the value of a v2 indicator (e.g., /v2/indicators/asns/{id})
+                    segments[index] = '{id}'
+                elif self.id_pattern.match(segment):
+                    segments[index] = '{id}'
+            template = '/'.join(segments)
+        return f'{parts.netloc}{template}'
+
+    def summary(self) -> list:
+        """Return the metrics of each route, ordered by the total latency.
+
+        Returns:
+            list: A dict of metrics (e.g., count, p95_ms, bytes_received) for each route.
+        """
+        with self._lock:
+            routes = [
+                {'method': method, 'route': route, **metrics.data}
+                for (method, route), metrics in self._routes.items()
+            ]
+        return sorted(routes, key=lambda r: r['total_ms'], reverse=True)
+
+    def __getstate__(self) -> dict:
+        """Return the state for pickling (without the lock)."""
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the state from pickling."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,203 @@
+"""ThreatConnect Requests Connection Pool Adapter"""
+# standard library
+import socket
+import threading
+import time
+from typing import Optional
+
+# third-party
+from requests import adapters
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, DEFAULT_RETRIES
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .http_metrics import pool_wait
+
+
+class PoolStatsMixin:
+    """Track the utilization of a urllib3 connection pool.
+
+    A connection is "in use" from the time it is taken from the pool until it is returned. A
+    request is "waiting" when the pool had no free connection when the request started. With
+    pool_block enabled the request blocks until a connection is returned, otherwise a new
+    connection is opened and discarded when it is returned to the full pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize Class properties."""
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.discarded = 0
+        self.in_use = 0
+        self.wait_count = 0
+        self.wait_seconds = 0.0
+        self.waiting = 0
+
+    def _get_conn(self, timeout: Optional[float] = None) -> HTTPConnection:
+        """Get a connection from the pool, tracking the time spent waiting for a connection."""
+        if self.pool is None or not self.pool.empty():
+            conn = super()._get_conn(timeout)
+            with self._stats_lock:
+                self.in_use += 1
+            return conn
+
+        with self._stats_lock:
+            self.waiting += 1
+        start = time.perf_counter()
+        try:
+            conn = super()._get_conn(timeout)
+        finally:
+            wait_seconds = time.perf_counter() - start
+            pool_wait.seconds = getattr(pool_wait, 'seconds', 0.0) + wait_seconds
+            with self._stats_lock:
+                self.waiting -= 1
+                self.wait_count += 1
+                self.wait_seconds += wait_seconds
+        with self._stats_lock:
+            self.in_use += 1
+        return conn
+
+    def _put_conn(self, conn: Optional[HTTPConnection]) -> None:
+        """Return a connection to the pool, counting connections discarded by a full pool."""
+        with self._stats_lock:
+            self.in_use = max(self.in_use - 1, 0)
+            if conn is not None and self.pool is not None and self.pool.full():
+                self.discarded += 1
+        super()._put_conn(conn)
+
+    @property
+    def stats(self) -> dict:
+        """Return the current utilization of the pool."""
+        idle = 0
+        if self.pool is not None:
+            with self.pool.mutex:
+                idle = sum(1 for c in self.pool.queue if c is not None)
+        return {
+            'host': f'{self.scheme}://{self.host}:{self.port}',
+            'maxsize': self.pool.maxsize if self.pool is not None else 0,
+            'block': self.block,
+            'in_use': self.in_use,
+            'idle': idle,
+            'waiting': self.waiting,
+            'wait_count': self.wait_count,
+            'wait_seconds': self.wait_seconds,
+            'discarded': self.discarded,
+        }
+
+
+class StatsHTTPConnectionPool(PoolStatsMixin, HTTPConnectionPool):
+    """HTTP connection pool with utilization stats."""
+
+
+class StatsHTTPSConnectionPool(PoolStatsMixin, HTTPSConnectionPool):
+    """HTTPS connection pool with utilization stats."""
+
+
+class PoolAdapter(adapters.HTTPAdapter):
+    """HTTP Adapter with configurable connection pooling, TCP keep-alive, and pool stats.
+
+    The default requests adapter keeps 10 connections per host (pool_maxsize). When more threads
+    than that share a session the extra connections are opened and then discarded ("Connection
+    pool is full"). Setting pool_maxsize to the number of worker threads lets every thread reuse a
+    connection, and pool_block caps the connections per host at pool_maxsize.
+
+    Args:
+        pool_connections: The number of hosts to cache connection pools for.
+        pool_maxsize: The max number of connections to keep in the pool of each host.
+        max_retries: The urllib3 Retry configuration.
+        pool_block: If True, requests wait for a free connection instead of opening a new one.
+        tcp_keepalive: If True, enable TCP keep-alive on new connections.
+        tcp_keepalive_idle: Seconds a connection is idle before keep-alive probes are sent.
+        tcp_keepalive_interval: Seconds between keep-alive probes.
+        tcp_keepalive_count: The number of failed probes before the connection is dropped.
+    """
+
+    __attrs__ = adapters.HTTPAdapter.__attrs__ + [
+        'tcp_keepalive',
+        'tcp_keepalive_count',
+        'tcp_keepalive_idle',
+        'tcp_keepalive_interval',
+    ]
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = DEFAULT_POOLSIZE,
+        pool_maxsize: Optional[int] = DEFAULT_POOLSIZE,
+        max_retries: Optional[object] = DEFAULT_RETRIES,
+        pool_block: Optional[bool] = DEFAULT_POOLBLOCK,
+        tcp_keepalive: Optional[bool] = False,
+        tcp_keepalive_idle: Optional[int] = 60,
+        tcp_keepalive_interval: Optional[int] = 15,
+        tcp_keepalive_count: Optional[int] = 4,
+    ):
+        """Initialize Class properties."""
+        # set before super().__init__() which initializes the pool manager
+        self.tcp_keepalive = tcp_keepalive
+        self.tcp_keepalive_count = tcp_keepalive_count
+        self.tcp_keepalive_idle = tcp_keepalive_idle
+        self.tcp_keepalive_interval = tcp_keepalive_interval
+        super().__init__(pool_connections, pool_maxsize, max_retries, pool_block)
+
+    @staticmethod
+    def _stats_pool_classes(manager: object) -> object:
+        """Update a urllib3 pool/proxy manager to create pools that track utilization."""
+        manager.pool_classes_by_scheme = {
+            'http': StatsHTTPConnectionPool,
+            'https': StatsHTTPSConnectionPool,
+        }
+        return manager
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: Optional[bool] = DEFAULT_POOLBLOCK, **kwargs
+    ):
+        """Initialize the urllib3 PoolManager with keep-alive socket options and pool stats."""
+        if self.socket_options:
+            kwargs.setdefault('socket_options', self.socket_options)
+        super().init_poolmanager(connections, maxsize, block, **kwargs)
+        self._stats_pool_classes(self.poolmanager)
+
+    @property
+    def pool_utilization(self) -> list:
+        """Return the utilization of the connection pool of each host."""
+        utilization = []
+        for manager in [self.poolmanager, *self.proxy_manager.values()]:
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if isinstance(pool, PoolStatsMixin):
+                    utilization.append(pool.stats)
+        return utilization
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs) -> object:
+        """Return the urllib3 ProxyManager for the proxy with keep-alive and pool stats."""
+        if self.socket_options:
+            proxy_kwargs.setdefault('socket_options', self.socket_options)
+        new_manager = proxy not in self.proxy_manager
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if new_manager:
+            self._stats_pool_classes(manager)
+        return manager
+
+    @staticmethod
+    def session_utilization(session: object) -> list:
+        """Return the utilization of the connection pools of all PoolAdapters of a session."""
+        adapters_ = {id(a): a for a in session.adapters.values() if isinstance(a, PoolAdapter)}
+        return [u for a in adapters_.values() for u in a.pool_utilization]
+
+    @property
+    def socket_options(self) -> Optional[list]:
+        """Return the socket options for new connections (None for the urllib3 defaults)."""
+        if not self.tcp_keepalive:
+            return None
+
+        options = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        # the keep-alive timers are not available on all platforms
+        for name, value in [
+            ('TCP_KEEPIDLE', self.tcp_keepalive_idle),
+            ('TCP_KEEPINTVL', self.tcp_keepalive_interval),
+            ('TCP_KEEPCNT', self.tcp_keepalive_count),
+        ]:
+            if hasattr(socket, name) and value is not None:
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), int(value)))
+        return options
@@ -112,21 +112,39 @@ class RateLimitHandler:
         ):
             self.sleep(request)
 
-    def sleep(self, request: PreparedRequest) -> None:  # pylint: disable=unused-argument
-        """Sleeps to rate-limit.
-
-        Sleeps until the time specified in X-RateLimit-Reset.
+    @staticmethod
+    def seconds_until_reset(reset_value: object) -> float:
+        """Return the seconds until the rate limit resets.
 
         Args:
-            request:  The request that will be sent.
+            reset_value: The value of the limit_reset_header, either a timestamp/date or the
+                number of seconds until the reset.
+
+        Returns:
+            float: The number of seconds until the reset.
         """
+        try:
+            # header values are strings, a small number is the delta in seconds (not a timestamp)
+            if float(reset_value) < 1_000_000_000:
+                return float(reset_value)
+        except (TypeError, ValueError):
+            pass
+
         utils = Utils()
-        wait_until = self.last_limit_reset_value
         try:
             seconds = (
-                float(utils.datetime.format_datetime(wait_until, date_format='%s')) - time.time()
+                float(utils.datetime.format_datetime(reset_value, date_format='%s')) - time.time()
             )
         except RuntimeError:
-            seconds = wait_until
+            seconds = reset_value
+        return float(seconds)
 
-        time.sleep(float(seconds))
+    def sleep(self, request: PreparedRequest) -> None:  # pylint: disable=unused-argument
+        """Sleeps to rate-limit.
+
+        Sleeps until the time specified in X-RateLimit-Reset.
+
+        Args:
+            request:  The request that will be sent.
+        """
+        time.sleep(self.seconds_until_reset(self.last_limit_reset_value))
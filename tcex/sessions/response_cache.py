@@ -0,0 +1,479 @@
+"""ThreatConnect Requests Session Conditional Response Cache"""
+# standard library
+import datetime
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+# third-party
+from requests import PreparedRequest, Request, Response, Session, exceptions
+from requests.sessions import merge_setting
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# request headers that hold credentials (included in the cache key)
+CREDENTIAL_HEADERS = re.compile(
+    r'^(?:authorization|cookie|proxy-authorization)$|api[-_]?key|secret|token', re.IGNORECASE
+)
+
+# response headers that don't apply to the decoded body stored in the cache
+EXCLUDED_HEADERS = ['content-encoding', 'content-length', 'transfer-encoding']
+
+
+class ResponseCache:
+    """A size-bounded on-disk cache of GET responses using conditional requests.
+
+    Responses with an ETag or Last-Modified header are stored on disk. When the same URL is
+    requested again the If-None-Match and If-Modified-Since headers are sent, and on a 304 (Not
+    Modified) response the cached body is returned as a 200 response, so a feed that hasn't
+    changed is not downloaded again. When the cache exceeds max_size the least recently used
+    responses are removed.
+
+    The cache policy can be set per URL with a dict of regex patterns and policy settings, where
+    the first matching pattern is used:
+
+    * cache (bool): If False, requests for the URL are not cached.
+    * max_age (int): The seconds a response is used without revalidating it (default 0).
+    * stale_if_error (int): The seconds since a response was last validated that it may be
+      returned when the request fails or returns a 5xx response (default 0).
+
+    .. code-block:: python
+
+        session = tcex.session_external
+        session.response_cache = ResponseCache(
+            os.path.join(tcex.args.tc_temp_path, 'http-cache'),
+            policies={r'/feeds/': {'stale_if_error': 86400}},
+        )
+
+    The cache key is a hash of the namespace, the URL, and the credentials of the request (the
+    auth and any Authorization, Cookie, API key, or token headers), so a response is never
+    returned for a request with other credentials. A cached response is only used if the
+    request headers named in its Vary header match.
+
+    Streamed requests and requests that already have a conditional header are not cached.
+
+    Args:
+        path: The directory of the cache (e.g., in tc_temp_path, which is not shared by Apps).
+        max_size: The max size of the cached bodies (bytes).
+        max_age: The default seconds a response is used without revalidating it.
+        stale_if_error: The default seconds a response may be returned when the request fails.
+        policies: The cache policy settings by URL regex pattern.
+        logger: An instance of Logger.
+        namespace: A value included in the cache key (e.g., to separate the users of a path).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: Optional[int] = 512 * 1024 * 1024,
+        max_age: Optional[int] = 0,
+        stale_if_error: Optional[int] = 0,
+        policies: Optional[dict] = None,
+        logger: Optional[object] = None,
+        namespace: Optional[str] = None,
+    ):
+        """Initialize Class properties."""
+        self.log = logger or logging.getLogger('session')
+        self.max_size = max_size
+        self.namespace = namespace
+        self.path = path
+        self.policies = [
+            (re.compile(pattern), settings) for pattern, settings in (policies or {}).items()
+        ]
+        self.default_policy = {'cache': True, 'max_age': max_age, 'stale_if_error': stale_if_error}
+
+        # properties
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.fresh_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.size = 0
+        self.stale_hits = 0
+
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+
+    def _entry_path(self, key: str, extension: str) -> str:
+        """Return the file path of the metadata (json) or body (body) of a cache entry."""
+        return os.path.join(self.path, f'{key}.{extension}')
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache is within max_size."""
+        with self._lock:
+            while self.size > self.max_size and self._entries:
+                key, size = self._entries.popitem(last=False)
+                self.size -= size
+                self.evictions += 1
+                self._remove_files(key)
+
+    def _load(self) -> None:
+        """Load the index of the entries on disk, ordered by the last access time."""
+        entries = []
+        for filename in os.listdir(self.path):
+            if not filename.endswith('.json'):
+                continue
+            filename = os.path.join(self.path, filename)
+            try:
+                with open(filename) as fh:
+                    metadata = json.load(fh)
+                entries.append((os.path.getmtime(filename), metadata['key'], metadata['size']))
+            except (KeyError, OSError, ValueError):
+                continue
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self.size += size
+        self._evict()
+
+    def _remove_files(self, key: str) -> None:
+        """Remove the files of a cache entry."""
+        for extension in ['body', 'json']:
+            try:
+                os.remove(self._entry_path(key, extension))
+            except OSError:
+                pass
+
+    def _write(self, filename: str, data: bytes) -> None:
+        """Write a file atomically (readers never see a partially written file)."""
+        fd, temp_filename = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(temp_filename, filename)
+        except OSError:
+            os.remove(temp_filename)
+            raise
+
+    def call(
+        self,
+        send: Callable[..., Response],
+        method: str,
+        url: str,
+        session: Optional[Session] = None,
+        **kwargs,
+    ) -> Response:
+        """Send a request with the send method (e.g., Session.request) using the cache.
+
+        Args:
+            send: The method that sends the request and returns a requests Response.
+            method: The HTTP method.
+            url: The full URL of the request.
+            session: The session the request is sent with (its headers and auth are merged with
+                the request headers and auth for the cache key).
+            auth (kwargs: Union[tuple, AuthBase]): The request auth.
+            headers (kwargs: dict): The request headers.
+            params (kwargs: dict): The query params.
+            stream (kwargs: bool): If True, the request is not cached.
+
+        Returns:
+            Response: The requests Response object.
+        """
+        headers = CaseInsensitiveDict(kwargs.get('headers') or {})
+        if (
+            method.upper() != 'GET'
+            or kwargs.get('stream')
+            or 'If-None-Match' in headers
+            or 'If-Modified-Since' in headers
+        ):
+            return send(method, url, **kwargs)
+
+        key_url = self.key_url(url, kwargs.get('params'))
+        policy = self.policy(key_url)
+        if not policy.get('cache', True):
+            return send(method, url, **kwargs)
+
+        # the headers and auth the request is sent with
+        auth = kwargs.get('auth')
+        request_headers = headers
+        if session is not None:
+            auth = auth or session.auth
+            request_headers = merge_setting(
+                headers, session.headers, dict_class=CaseInsensitiveDict
+            )
+
+        key = self.key(key_url, request_headers, auth)
+        metadata = self.get(key)
+        if metadata is not None and not self.vary_matches(metadata, request_headers):
+            # the cached response is for other request headers (e.g., Accept)
+            metadata = None
+        if metadata is not None and time.time() - metadata['validated'] < (
+            policy.get('max_age') or 0
+        ):
+            try:
+                response = self.response(key, metadata)
+            except OSError:
+                # the entry was evicted by another thread
+                metadata = None
+            else:
+                with self._lock:
+                    self.fresh_hits += 1
+                return response
+
+        request_kwargs = dict(kwargs)
+        if metadata is not None:
+            # send the validators of the cached response
+            if metadata.get('etag'):
+                headers['If-None-Match'] = metadata['etag']
+            if metadata.get('last_modified'):
+                headers['If-Modified-Since'] = metadata['last_modified']
+            request_kwargs['headers'] = headers
+
+        try:
+            response = send(method, url, **request_kwargs)
+        except exceptions.RequestException:
+            if self.stale(metadata, policy):
+                return self.response(key, metadata, stale=True)
+            raise
+
+        if metadata is not None and response.status_code == 304:
+            with self._lock:
+                self.not_modified += 1
+            metadata = self.revalidate(key, metadata, response)
+            try:
+                return self.response(key, metadata, response.request)
+            except OSError:
+                # the entry was evicted by another thread, send the request without validators
+                response = send(method, url, **kwargs)
+
+        if response.status_code >= 500 and self.stale(metadata, policy):
+            return self.response(key, metadata, response.request, stale=True)
+
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            self.put(key, key_url, response)
+        return response
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            for key in self._entries:
+                self._remove_files(key)
+            self._entries = OrderedDict()
+            self.size = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the metadata of a cache entry (None if the entry is not cached).
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            Optional[dict]: The metadata (e.g., etag, headers, validated time).
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+        filename = self._entry_path(key, 'json')
+        try:
+            with open(filename) as fh:
+                metadata = json.load(fh)
+            # the metadata mtime is the access time used to restore the LRU order
+            os.utime(filename)
+        except (OSError, ValueError):
+            return None
+        if not os.path.isfile(self._entry_path(key, 'body')):
+            return None
+        return metadata
+
+    def key(self, url: str, headers: Optional[dict] = None, auth: Optional[object] = None) -> str:
+        """Return the cache key of a request.
+
+        Args:
+            url: The URL including the query params (see key_url).
+            headers: The request headers.
+            auth: The request auth (e.g., a tuple or an AuthBase instance).
+
+        Returns:
+            str: The hash of the namespace, URL, and credentials of the request.
+        """
+        credentials = sorted(
+            (name.lower(), str(value))
+            for name, value in (headers or {}).items()
+            if value is not None and CREDENTIAL_HEADERS.search(name)
+        )
+        if auth is not None:
+            # auth classes (e.g., HTTPBasicAuth) hold the credentials as attributes
+            auth_data = sorted(vars(auth).items()) if hasattr(auth, '__dict__') else auth
+            credentials.append(('auth', repr(auth_data)))
+        key_data = json.dumps([self.namespace, url, credentials])
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    @staticmethod
+    def key_url(url: str, params: Optional[dict] = None) -> str:
+        """Return the URL including the query params (the cache key of the request)."""
+        prepared = PreparedRequest()
+        prepared.prepare_url(url, params)
+        return prepared.url
+
+    def policy(self, url: str) -> dict:
+        """Return the cache policy for the URL (the first matching policy pattern).
+
+        Args:
+            url: The URL of the request.
+
+        Returns:
+            dict: The cache policy settings.
+        """
+        for pattern, settings in self.policies:
+            if pattern.search(url):
+                return {**self.default_policy, **settings}
+        return self.default_policy
+
+    def put(self, key: str, url: str, response: Response) -> None:
+        """Store a response that has an ETag or Last-Modified header.
+
+        Args:
+            key: The cache key.
+            url: The URL of the request.
+            response: The requests Response object.
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        vary = [v.strip().lower() for v in response.headers.get('Vary', '').split(',') if v.strip()]
+        content = response.content or b''
+        if (etag is None and last_modified is None) or '*' in vary or len(content) > self.max_size:
+            return
+
+        metadata = {
+            'etag': etag,
+            'headers': {
+                k: v for k, v in response.headers.items() if k.lower() not in EXCLUDED_HEADERS
+            },
+            'key': key,
+            'last_modified': last_modified,
+            'reason': response.reason,
+            'size': len(content),
+            'url': url,
+            'validated': time.time(),
+            # the values of the request headers the response varies on
+            'vary': {name: response.request.headers.get(name) for name in vary},
+        }
+        try:
+            self._write(self._entry_path(key, 'body'), content)
+            self._write(self._entry_path(key, 'json'), json.dumps(metadata).encode())
+        except OSError as e:
+            self.log.warning(f'feature=response-cache, event=store-failed, url={url}, error={e}')
+            return
+
+        with self._lock:
+            self.size += len(content) - self._entries.pop(key, 0)
+            self._entries[key] = len(content)
+        self._evict()
+
+    def response(
+        self,
+        key: str,
+        metadata: dict,
+        request: Optional[PreparedRequest] = None,
+        stale: Optional[bool] = False,
+    ) -> Response:
+        """Return a requests Response for a cache entry.
+
+        Args:
+            key: The cache key.
+            metadata: The metadata of the cache entry.
+            request: The request that was sent (e.g., the request of the 304 response).
+            stale: If True, the response is returned because the request failed.
+
+        Returns:
+            Response: The requests Response object (with from_cache set to True).
+        """
+        with open(self._entry_path(key, 'body'), 'rb') as fh:
+            content = fh.read()
+
+        if stale:
+            with self._lock:
+                self.stale_hits += 1
+            self.log.warning(
+                f'feature=response-cache, event=serving-stale-response, url={metadata["url"]}'
+            )
+
+        response = Response()
+        # the body is read, so iter_content and iter_lines use the content (raw can be read too)
+        response._content = content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.raw = io.BytesIO(content)
+        response.elapsed = datetime.timedelta(0)
+        response.from_cache = True
+        response.headers = CaseInsensitiveDict(metadata['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = metadata.get('reason') or 'OK'
+        response.request = request or Request('GET', metadata['url']).prepare()
+        response.status_code = 200
+        response.url = metadata['url']
+        return response
+
+    def revalidate(self, key: str, metadata: dict, response: Response) -> dict:
+        """Update the metadata of a cache entry from a 304 response.
+
+        Args:
+            key: The cache key.
+            metadata: The metadata of the cache entry.
+            response: The 304 response.
+
+        Returns:
+            dict: The updated metadata.
+        """
+        for name, value in response.headers.items():
+            if name.lower() not in EXCLUDED_HEADERS:
+                metadata['headers'][name] = value
+        metadata['etag'] = response.headers.get('ETag') or metadata['etag']
+        metadata['last_modified'] = (
+            response.headers.get('Last-Modified') or metadata['last_modified']
+        )
+        metadata['validated'] = time.time()
+        try:
+            self._write(self._entry_path(key, 'json'), json.dumps(metadata).encode())
+        except OSError:  # pragma: no cover
+            pass  # the entry is revalidated again on the next request
+        return metadata
+
+    @staticmethod
+    def stale(metadata: Optional[dict], policy: dict) -> bool:
+        """Return True if a cache entry can be returned for a failed request."""
+        if metadata is None:
+            return False
+        return time.time() - metadata['validated'] <= (policy.get('stale_if_error') or 0)
+
+    @property
+    def stats(self) -> dict:
+        """Return the cache stats."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self.size,
+                'fresh_hits': self.fresh_hits,
+                'not_modified': self.not_modified,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    @staticmethod
+    def vary_matches(metadata: dict, headers: dict) -> bool:
+        """Return True if the request headers match the headers the cached response varies on."""
+        return all(headers.get(name) == value for name, value in metadata.get('vary', {}).items())
+
+    def __getstate__(self) -> dict:
+        """Return the state for pickling (without the lock)."""
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the state from pickling."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,179 @@
+"""ThreatConnect Requests Session 429 Retry Scheduler"""
+# standard library
+import random
+import threading
+import time
+from typing import Optional
+
+
+class RetryScheduler:
+    """Schedule the retries of 429 (Too Many Requests) responses for ExternalSession.
+
+    The first retry waits for the Retry-After value (see too_many_requests_handler) plus a
+    random spread of up to jitter * Retry-After, so threads that were rate limited at the same
+    moment don't all retry at the same moment. Further retries use decorrelated jitter (a random
+    delay between base_delay and 3x the previous delay, capped at max_delay), but never less than
+    the Retry-After value. A request is not retried more than max_retries times or when the
+    retry would end after the deadline (seconds since the request started), in which case the
+    429 response is returned.
+
+    A 429 response also starts a cooldown for the host that is shared by all sessions in the
+    process. Requests to the host from other threads wait for the cooldown to end (with the same
+    spread) instead of adding to the requests that are being rate limited.
+
+    Args:
+        max_retries: The max number of retries of a request.
+        base_delay: The min delay (seconds) of the decorrelated jitter.
+        max_delay: The max delay (seconds) of the decorrelated jitter.
+        deadline: The max time (seconds) to spend on a request including the retries.
+        jitter: The max random spread added to a wait, as a fraction of the wait.
+    """
+
+    # the monotonic time the cooldown of each host ends
+    _cooldowns = {}
+    _cooldowns_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = 3,
+        base_delay: Optional[float] = 1.0,
+        max_delay: Optional[float] = 60.0,
+        deadline: Optional[float] = 300.0,
+        jitter: Optional[float] = 0.1,
+    ):
+        """Initialize Class properties."""
+        self.base_delay = base_delay
+        self.deadline = deadline
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+
+        # properties
+        self._lock = threading.Lock()
+        self.budget_exhausted = 0
+        self.cooldown_wait_count = 0
+        self.cooldown_wait_seconds = 0.0
+        self.retries = 0
+        self.retry_wait_seconds = 0.0
+
+    def _spread(self, seconds: float) -> float:
+        """Return a random spread for a wait of the number of seconds."""
+        return random.uniform(0, seconds * self.jitter)  # nosec
+
+    @classmethod
+    def cooldown(cls, host: str, seconds: float) -> None:
+        """Start (or extend) the cooldown of a host.
+
+        Args:
+            host: The host (netloc) that returned the 429 response.
+            seconds: The length of the cooldown.
+        """
+        until = time.monotonic() + seconds
+        with cls._cooldowns_lock:
+            if until > cls._cooldowns.get(host, 0):
+                cls._cooldowns[host] = until
+
+    @classmethod
+    def cooldown_remaining(cls, host: str) -> float:
+        """Return the seconds until the cooldown of a host ends (0 when not in a cooldown)."""
+        with cls._cooldowns_lock:
+            until = cls._cooldowns.get(host)
+            if until is None:
+                return 0.0
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                del cls._cooldowns[host]
+                return 0.0
+            return remaining
+
+    def delay(self, retry_number: int, retry_after: float, previous: float) -> float:
+        """Return the delay before a retry.
+
+        Args:
+            retry_number: The number of retries already sent for the request.
+            retry_after: The seconds to wait from the 429 response (e.g., Retry-After).
+            previous: The delay before the previous retry.
+
+        Returns:
+            float: The seconds to wait before the retry.
+        """
+        retry_after = max(float(retry_after or 0), 0.0)
+        delay = retry_after + self._spread(retry_after)
+        if retry_number > 0:
+            backoff = random.uniform(self.base_delay, max(previous, self.base_delay) * 3)  # nosec
+            delay = max(delay, min(backoff, self.max_delay))
+        return delay
+
+    def schedule(
+        self, retry_number: int, retry_after: float, previous: float, elapsed: float
+    ) -> Optional[float]:
+        """Return the delay before the next retry or None if the request should not be retried.
+
+        Args:
+            retry_number: The number of retries already sent for the request.
+            retry_after: The seconds to wait from the 429 response (e.g., Retry-After).
+            previous: The delay before the previous retry.
+            elapsed: The seconds since the request was started.
+
+        Returns:
+            Optional[float]: The seconds to wait before the retry.
+        """
+        delay = None
+        if retry_number < self.max_retries:
+            delay = self.delay(retry_number, retry_after, previous)
+            if self.deadline is not None and elapsed + delay > self.deadline:
+                delay = None
+
+        with self._lock:
+            if delay is None:
+                self.budget_exhausted += 1
+            else:
+                self.retries += 1
+                self.retry_wait_seconds += delay
+        return delay
+
+    @property
+    def stats(self) -> dict:
+        """Return the retry and wait stats."""
+        with self._lock:
+            return {
+                'retries': self.retries,
+                'retry_wait_seconds': self.retry_wait_seconds,
+                'budget_exhausted': self.budget_exhausted,
+                'cooldown_wait_count': self.cooldown_wait_count,
+                'cooldown_wait_seconds': self.cooldown_wait_seconds,
+            }
+
+    def wait_for_cooldown(self, host: str, max_wait: Optional[float] = None) -> float:
+        """Wait for the cooldown of a host to end.
+
+        Args:
+            host: The host (netloc) of the request.
+            max_wait: The max number of seconds to wait (e.g., the remaining deadline).
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        remaining = self.cooldown_remaining(host)
+        if remaining <= 0:
+            return 0.0
+
+        seconds = remaining + self._spread(remaining)
+        if max_wait is not None:
+            seconds = max(min(seconds, max_wait), 0.0)
+        time.sleep(seconds)
+        with self._lock:
+            self.cooldown_wait_count += 1
+            self.cooldown_wait_seconds += seconds
+        return seconds
+
+    def __getstate__(self) -> dict:
+        """Return the state for pickling (without the lock)."""
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the state from pickling."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -5,13 +5,16 @@ import hashlib
 import hmac
 import logging
 import time
+from typing import Optional
 
 # third-party
 import urllib3
-from requests import Session, adapters, auth
+from requests import Session, auth
 from urllib3.util.retry import Retry
 
 from ..utils import Utils
+from .http_metrics import HttpMetrics
+from .pool_adapter import PoolAdapter
 
 # disable ssl warning message
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -54,20 +57,37 @@ class TokenAuth(auth.AuthBase):
 
 
 class TcSession(Session):
-    """ThreatConnect REST API Requests Session"""
-
-    def __init__(self, api_access_id, api_secret_key, base_url, logger=None):
+    """ThreatConnect REST API Requests Session
+
+    Args:
+        api_access_id: The ThreatConnect API access id.
+        api_secret_key: The ThreatConnect API secret key.
+        base_url: The ThreatConnect API URL.
+        logger: An instance of Logger.
+        pool_config: The connection pool settings (see PoolAdapter), e.g., pool_maxsize.
+    """
+
+    def __init__(
+        self,
+        api_access_id,
+        api_secret_key,
+        base_url,
+        logger=None,
+        pool_config: Optional[dict] = None,
+    ):
         """Initialize the Class properties."""
         super().__init__()
         self.api_access_id = api_access_id
         self.api_secret_key = api_secret_key
         self.base_url = base_url.strip('/')
         self.log = logger or logging.getLogger('session')
+        self.pool_config = pool_config or {}
 
         # properties
         self._log_curl: bool = False
         self._token = None
         self.auth = None
+        self.metrics = HttpMetrics()
         self.utils = Utils()
 
         # Add Retry
@@ -100,6 +120,11 @@ class TcSession(Session):
         """Enable or disable logging curl commands."""
         self._log_curl = log_curl
 
+    @property
+    def pool_utilization(self) -> list:
+        """Return the utilization of the connection pool of each host (see PoolAdapter)."""
+        return PoolAdapter.session_utilization(self)
+
     @property
     def token(self):
         """Return token."""
@@ -127,7 +152,7 @@ class TcSession(Session):
         # accept path for API calls instead of full URL
         if not url.startswith('https'):
             url = f'{self.base_url}{url}'
-        response = super().request(method, url, **kwargs)
+        response = self.metrics.call(super().request, method, url, **kwargs)
 
         # don't show curl message for logging commands
         if '/v2/logs/app' not in url:
@@ -162,4 +187,4 @@ class TcSession(Session):
             status_forcelist=status_forcelist,
         )
         # mount all https requests
-        self.mount('https://', adapters.HTTPAdapter(max_retries=retries))
+        self.mount('https://', PoolAdapter(max_retries=retries, **self.pool_config))
@@ -0,0 +1,225 @@
+"""Shared token-bucket rate limiting for ExternalSession."""
+# standard library
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+# third-party
+from requests import PreparedRequest, Response
+
+from .rate_limit_handler import RateLimitHandler
+
+
+class TokenBucket:
+    """A thread-safe token bucket that paces requests at a fixed rate.
+
+    Each acquire() reserves the next available token under a lock and then sleeps (outside of the
+    lock) until the reserved time. The token count is allowed to go negative, so each waiter
+    reserves a later slot than the waiters before it and waiters are released in the order they
+    arrived (FIFO), one every 1/rate seconds, instead of all waking together.
+
+    Args:
+        rate: The number of tokens added per second.
+        capacity: The max number of tokens that can accumulate (the burst size).
+    """
+
+    # shared TokenBucket instances by key
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, rate: Optional[float] = 10.0, capacity: Optional[float] = 1.0):
+        """Initialize Class properties."""
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+
+        # properties
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self.wait_count = 0
+        self.wait_seconds = 0.0
+        self.waiting = 0
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last update (must hold the lock)."""
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available.
+
+        Returns:
+            float: The number of seconds spent waiting for the token.
+        """
+        seconds = self.reserve()
+        if seconds > 0:
+            with self._lock:
+                self.waiting += 1
+            try:
+                time.sleep(seconds)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+                    self.wait_count += 1
+                    self.wait_seconds += seconds
+        return seconds
+
+    def pause(self, seconds: float) -> None:
+        """Stop adding tokens for the number of seconds (e.g., until the rate limit resets).
+
+        Args:
+            seconds: The number of seconds before tokens are added again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + seconds)
+
+    def reserve(self) -> float:
+        """Reserve the next token and return the seconds to wait before it can be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # the tokens refill from _updated, which is in the future while the bucket is paused
+            seconds = max(self._updated - now, 0.0)
+            if self._tokens < 0:
+                seconds += -self._tokens / self.rate
+            return seconds
+
+    @classmethod
+    def shared(cls, key: str, **kwargs) -> 'TokenBucket':
+        """Return the TokenBucket shared by all sessions (and threads) in the process for the key.
+
+        Args:
+            key: The key for the bucket (e.g., the API host or API key).
+            rate (kwargs: float): The initial rate of a new bucket.
+            capacity (kwargs: float): The initial capacity of a new bucket.
+
+        Returns:
+            TokenBucket: The shared instance.
+        """
+        with cls._instances_lock:
+            bucket = cls._instances.get(key)
+            if bucket is None:
+                bucket = cls._instances[key] = cls(**kwargs)
+            return bucket
+
+    @property
+    def stats(self) -> dict:
+        """Return the current state and wait stats of the bucket."""
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'tokens': self._tokens,
+                'waiting': self.waiting,
+                'wait_count': self.wait_count,
+                'wait_seconds': self.wait_seconds,
+            }
+
+    def update(self, rate: Optional[float] = None, tokens: Optional[float] = None) -> None:
+        """Update the rate and/or cap the available tokens (e.g., from rate limit headers).
+
+        Args:
+            rate: The new number of tokens added per second.
+            tokens: The max number of tokens currently available.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if rate is not None and rate > 0:
+                self.rate = float(rate)
+            if tokens is not None:
+                self._tokens = min(self._tokens, float(tokens))
+
+
+class TokenBucketRateLimitHandler(RateLimitHandler):
+    """Rate-limiting with a token bucket shared across threads and sessions.
+
+    The default RateLimitHandler only sleeps once the X-RateLimit-Remaining value drops to the
+    remaining_threshold, and each session tracks the value on its own. Threads sharing a vendor
+    API therefore send requests as fast as they can until the limit is reached and then all
+    pause until the reset. This handler paces every request through a TokenBucket that is shared
+    by all handlers with the same key (the request host by default), so the requests are spread
+    evenly across the rate limit window.
+
+    The rate is learned from the responses. When the limit_remaining_header and
+    limit_reset_header are returned the rate is set to the remaining requests (less the
+    remaining_threshold) divided by the seconds until the reset, and the available tokens are
+    capped at the remaining requests. When the remaining requests reach the remaining_threshold
+    the bucket is paused until the reset.
+
+    .. code-block:: python
+
+        session = tcex.session_external
+        session.rate_limit_handler = TokenBucketRateLimitHandler(key=api_key, rate=5)
+
+    Args:
+        key: The key of the shared TokenBucket (e.g., an API key), defaults to the request host.
+        rate: The initial number of requests per second (before one is learned).
+        capacity: The max number of requests that can be sent in a burst.
+        limit_remaining_header: Name of the header that has the limit remaining value.
+        limit_reset_header: Name of the header that contains the limit reset value.
+        remaining_threshold: Number of remaining requests to keep in reserve.
+    """
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        rate: Optional[float] = 10.0,
+        capacity: Optional[float] = 1.0,
+        limit_remaining_header: Optional[str] = 'X-RateLimit-Remaining',
+        limit_reset_header: Optional[str] = 'X-RateLimit-Reset',
+        remaining_threshold: Optional[int] = 0,
+    ):
+        """Initialize Class properties."""
+        super().__init__(limit_remaining_header, limit_reset_header, remaining_threshold)
+        self.capacity = capacity
+        self.key = key
+        self.rate = rate
+
+    def bucket(self, request: PreparedRequest) -> TokenBucket:
+        """Return the shared TokenBucket for the request."""
+        key = self.key or urlsplit(request.url).netloc
+        return TokenBucket.shared(key, rate=self.rate, capacity=self.capacity)
+
+    def post_send(self, response: Response) -> None:
+        """Update the shared TokenBucket from the rate limit headers of the response.
+
+        The headers are also read from non-2xx responses (e.g., 429), which typically report
+        that no requests remain.
+
+        Args:
+            response: The response from the request.
+        """
+        super().post_send(response)
+
+        remaining = response.headers.get(self.limit_remaining_header)
+        reset = response.headers.get(self.limit_reset_header)
+        if remaining is None or reset is None or response.request is None:
+            return
+
+        try:
+            available = int(remaining) - self.remaining_threshold
+            seconds = self.seconds_until_reset(reset)
+        except (TypeError, ValueError):
+            return
+
+        bucket = self.bucket(response.request)
+        if available <= 0:
+            bucket.pause(max(seconds, 0.0))
+        elif seconds > 0:
+            bucket.update(rate=available / seconds, tokens=available)
+        else:
+            bucket.update(tokens=available)
+
+    def pre_send(self, request: PreparedRequest) -> None:
+        """Wait for a token from the shared TokenBucket before the request is sent.
+
+        Args:
+            request: The request to be sent.  Should not be modified in any way.
+        """
+        self.bucket(request).acquire()
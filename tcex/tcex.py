@@ -49,6 +49,7 @@ class TcEx:
         self._default_args = None
         self._error_codes = None
         self._exit_code = 0
+        self._http_metrics = None
         self._indicator_associations_types_data = {}
         self._indicator_types = None
         self._indicator_types_data = None
@@ -60,6 +61,7 @@ class TcEx:
         self._service = None
         self._session = None
         self._session_external = None
+        self._session_pool_config = None
         self._stix_model = None
         self._utils = None
         self._token = None
@@ -112,20 +114,28 @@ class TcEx:
         self.exit(exit_code, 'The App received an interrupt signal and will now exit.')
 
     def advanced_request(
-        self, session: object, timeout: Optional[int] = 600, output_prefix: Optional[str] = None
+        self,
+        session: object,
+        timeout: Optional[int] = 600,
+        output_prefix: Optional[str] = None,
+        stream: Optional[bool] = False,
+        hash_algorithm: Optional[str] = None,
     ) -> 'AdvancedRequest':  # noqa: F821
         """Return instance of AdvancedRequest.
 
         Args:
             session (object): An instance of requests.Session.
             timeout (int): The number of second before timing out the request.
+            output_prefix (str): The prefix for the output variables.
+            stream (bool): If True, the response is streamed to a temp file.
+            hash_algorithm (str): The hashlib algorithm used to hash a streamed response.
 
         Returns:
             object: An instance of AdvancedRequest
         """
         from .app_feature import AdvancedRequest
 
-        return AdvancedRequest(session, self, timeout, output_prefix)
+        return AdvancedRequest(session, self, timeout, output_prefix, stream, hash_algorithm)
 
     def aot_rpush(self, exit_code: int) -> None:
         """Push message to AOT action channel."""
@@ -178,6 +188,25 @@ class TcEx:
             security_label_write_type,
         )
 
+    def batch_router(self, concurrency: Optional[int] = 4, **kwargs) -> 'BatchRouter':  # noqa: F821
+        """Return instance of BatchRouter
+
+        Args:
+            concurrency: The max number of owners to submit at once.
+            batch_callback (kwargs: Callable): A method called with each new Batch.
+            action (kwargs: str): Action for the batch job ['Create', 'Delete'].
+            attribute_write_type (kwargs: str): Write type for TI attributes ['Append', 'Replace'].
+            halt_on_error (kwargs: bool): If True any batch error will halt the batch job.
+            security_label_write_type (kwargs: str): Write type for labels ['Append', 'Replace'].
+            tag_write_type (kwargs: str): Write type for tags ['Append', 'Replace'].
+
+        Returns:
+            object: An instance of the BatchRouter Class.
+        """
+        from .batch.batch_router import BatchRouter
+
+        return BatchRouter(self, concurrency, **kwargs)
+
     def batch_submit(
         self,
         owner: str,
@@ -222,10 +251,18 @@ class TcEx:
         Args:
             tcex: An instance of TcEx object.
             output_dir: Deprecated input, will not be used.
+            output_compress_level (kwargs: int): The gzip compression level for output files
+                (default 9).
             output_extension (kwargs: str): Append this extension to output files.
+            output_max_count (kwargs: int): The max number of groups and indicators in each
+                output file (default 100,000).
+            output_max_size (kwargs: int): The max size in bytes of the uncompressed group and
+                indicator data in each output file (default 75,000,000).
+            output_workers (kwargs: int): The number of threads compressing and writing output
+                files in parallel (default 1, files are written on the calling thread).
             write_callback (kwargs: Callable): A callback method to call when a batch json file
                 is written. The callback will be passed the fully qualified name of the written
-                file.
+                file. With output_workers the callback is called from the worker threads.
             write_callback_kwargs (kwargs: dict): Additional values to send to callback method.
 
         Returns:
@@ -346,6 +383,10 @@ class TcEx:
         # exit token renewal thread
         self.token.shutdown = True
 
+        # log the per route summary of the API and external requests
+        if self._http_metrics is not None:
+            self._http_metrics.log_summary(self.log)
+
         self.log.info(f'Exit Code: {code}')
         sys.exit(code)
 
@@ -406,6 +447,48 @@ class TcEx:
 
         return indicator_list
 
+    def get_async_session(self) -> 'AsyncTcSession':  # noqa: F821
+        """Return an instance of AsyncTcSession configured for the ThreatConnect API.
+
+        The session is bound to the event loop it is first used in and should be closed (or used
+        as an async context manager) in that loop. Requires the aiohttp package.
+        """
+        from .sessions import AsyncTcSession
+
+        _session = AsyncTcSession(
+            logger=self.log,
+            api_access_id=self.default_args.api_access_id,
+            api_secret_key=self.default_args.api_secret_key,
+            base_url=self.default_args.tc_api_path,
+            pool_config=self.session_pool_config,
+        )
+
+        # set verify
+        _session.verify = self.default_args.tc_verify
+
+        # set token
+        _session.token = self.token
+
+        # share the HTTP metrics of all sessions
+        _session.metrics = self.http_metrics
+
+        # update User-Agent
+        _session.headers.update({'User-Agent': f'TcEx: {__import__(__name__).__version__}'})
+
+        # add proxy support if requested
+        if self.default_args.tc_proxy_tc:
+            _session.proxies = self.proxies
+            self.log.info(
+                f'Using proxy host {self.default_args.tc_proxy_host}:'
+                f'{self.default_args.tc_proxy_port} for ThreatConnect async session.'
+            )
+
+        # enable curl logging if tc_log_curl param is set.
+        if self.default_args.tc_log_curl:
+            _session.log_curl = True
+
+        return _session
+
     # TODO: [high] testing ... organize this later
     def get_session(self) -> 'TcSession':  # noqa: F821
         """Return an instance of Requests Session configured for the ThreatConnect API."""
@@ -416,6 +499,7 @@ class TcEx:
             api_access_id=self.default_args.api_access_id,
             api_secret_key=self.default_args.api_secret_key,
             base_url=self.default_args.tc_api_path,
+            pool_config=self.session_pool_config,
         )
 
         # set verify
@@ -424,6 +508,9 @@ class TcEx:
         # set token
         _session.token = self.token
 
+        # share the HTTP metrics of all sessions
+        _session.metrics = self.http_metrics
+
         # update User-Agent
         _session.headers.update({'User-Agent': f'TcEx: {__import__(__name__).__version__}'})
 
@@ -442,14 +529,17 @@ class TcEx:
         # return session
         return _session
 
-    def get_ti(self) -> 'ThreatIntelligence':  # noqa: F821
+    def get_ti(self, page_workers: Optional[int] = 1) -> 'ThreatIntelligence':  # noqa: F821
         """Include the Threat Intel Module.
 
         .. Note:: Threat Intel methods can be accessed using ``tcex.ti.<method>``.
+
+        Args:
+            page_workers: The number of threads used to fetch the pages of paginated requests.
         """
         from .threat_intelligence import ThreatIntelligence
 
-        return ThreatIntelligence(session=self.get_session())
+        return ThreatIntelligence(session=self.get_session(), page_workers=page_workers)
 
     @property
     def group_types(self) -> list:
@@ -535,6 +625,21 @@ class TcEx:
         if raise_error:
             raise RuntimeError(code, message)
 
+    @property
+    def http_metrics(self) -> 'HttpMetrics':  # noqa: F821
+        """Return the per method and route HTTP metrics shared by the TcEx sessions.
+
+        .. code-block:: python
+
+            for route in tcex.http_metrics.summary():
+                print(route['method'], route['route'], route['count'], route['p95_ms'])
+        """
+        if self._http_metrics is None:
+            from .sessions.http_metrics import HttpMetrics
+
+            self._http_metrics = HttpMetrics()
+        return self._http_metrics
+
     @property
     def indicator_associations_types_data(self) -> dict:
         """Return ThreatConnect associations type data.
@@ -977,7 +1082,10 @@ class TcEx:
         if self._session_external is None:
             from .sessions import ExternalSession
 
-            self._session_external = ExternalSession(logger=self.log)
+            self._session_external = ExternalSession(
+                logger=self.log, pool_config=self.session_pool_config
+            )
+            self._session_external.metrics = self.http_metrics
 
             # add User-Agent to headers
             self._session_external.headers.update(
@@ -996,6 +1104,39 @@ class TcEx:
                 self._session_external.log_curl = True
         return self._session_external
 
+    @property
+    def session_pool_config(self) -> dict:
+        """Return the connection pool settings for the API, external, and token sessions.
+
+        Settings are read from the tc_session_* args (e.g., tc_session_pool_maxsize), so an App
+        can set its defaults with install.json params of the same name. Settings that are not
+        provided use the requests defaults.
+        """
+        if self._session_pool_config is None:
+            self._session_pool_config = {}
+            for key in [
+                'pool_block',
+                'pool_connections',
+                'pool_maxsize',
+                'tcp_keepalive',
+                'tcp_keepalive_count',
+                'tcp_keepalive_idle',
+                'tcp_keepalive_interval',
+            ]:
+                value = getattr(self.default_args, f'tc_session_{key}', None)
+                if value is None:
+                    continue
+
+                if key in ['pool_block', 'tcp_keepalive']:
+                    self._session_pool_config[key] = self.utils.to_bool(value)
+                else:
+                    self._session_pool_config[key] = int(value)
+            if self._session_pool_config:
+                self.log.info(
+                    f'feature=tcex, event=session-pool-config, config={self._session_pool_config}'
+                )
+        return self._session_pool_config
+
     @property
     def stix_model(self) -> 'StixModel':  # noqa: F821
         """Include the Threat Intel Module.
@@ -1023,7 +1164,11 @@ class TcEx:
         if self._token is None:
             sleep_interval = int(os.getenv('TC_TOKEN_SLEEP_INTERVAL', '30'))
             self._token = Tokens(
-                self.default_args.tc_api_path, sleep_interval, self.default_args.tc_verify, self.log
+                self.default_args.tc_api_path,
+                sleep_interval,
+                self.default_args.tc_verify,
+                self.log,
+                self.session_pool_config,
             )
         return self._token
 
@@ -0,0 +1,384 @@
+"""ThreatConnect Threat Intelligence Asyncio Module"""
+# standard library
+import hashlib
+from typing import AsyncIterator, Iterator, Optional
+
+# third-party
+from requests import Response
+
+from .tcex_ti_tc_request import TiTcRequest
+
+
+class AsyncTiTcRequest(TiTcRequest):
+    """Async counterparts of the common API calls to ThreatConnect (see TiTcRequest).
+
+    Uses an AsyncTcSession so thousands of requests can be multiplexed on a single thread. All
+    methods that return a Response in TiTcRequest are coroutines returning the Response, and all
+    methods that yield entities are async generators.
+
+    .. code-block:: python
+
+        ti_requests = AsyncTiTcRequest(tcex.get_async_session())
+        responses = await asyncio.gather(
+            *[ti_requests.single('indicators', 'addresses', ip) for ip in addresses]
+        )
+        async for tag in ti_requests.tags('indicators', 'addresses', '1.1.1.1'):
+            ...
+
+    Args:
+        session: An instance of AsyncTcSession.
+    """
+
+    async def _association(
+        self,
+        main_type,
+        sub_type,
+        unique_id,
+        target_type,
+        target_sub_type,
+        target_unique_id,
+        action='ADD',
+        owner=None,
+    ):
+        """Add or delete an association (see TiTcRequest._association)."""
+        action = action.upper()
+        if action not in ['ADD', 'DELETE']:
+            self.log.error('associations error')
+            return None
+
+        params = {'owner': owner} if owner else {}
+        params['createActivityLog'] = False
+        if not sub_type and not target_sub_type:
+            url = f'/v2/{main_type}/{unique_id}/{target_type}/{target_unique_id}'
+        elif not sub_type:
+            url = f'/v2/{main_type}/{unique_id}/{target_type}/{target_sub_type}/{target_unique_id}'
+        elif not target_sub_type:
+            url = f'/v2/{main_type}/{sub_type}/{unique_id}/{target_type}/{target_unique_id}'
+        else:
+            url = (
+                f'/v2/{main_type}/{sub_type}/{unique_id}/{target_type}/{target_sub_type}'
+                f'/{target_unique_id}'
+            )
+
+        if action == 'ADD':
+            return await self._response(self._post(url, {}, params))
+        return await self._response(self._delete(url, params))
+
+    async def _delete(self, url, params=None):
+        """Delete data from API."""
+        return await self._request('DELETE', 'deleting', url, params)
+
+    async def _get(self, url, params=None):
+        """Get data from API."""
+        return await self._request('GET', 'getting', url, params)
+
+    def _iterate(self, url, params, api_entity) -> Iterator[tuple]:
+        """Return the pagination request for the URL.
+
+        The inherited methods that iterate over API pagination yield the request from this
+        method, which is then paginated asynchronously by the _paginate method.
+        """
+        yield url, params, api_entity
+
+    async def _iterate_async(self, url, params, api_entity) -> AsyncIterator[dict]:
+        """Iterate over API pagination."""
+        params['resultLimit'] = self.result_limit
+
+        result_start = params.get('resultStart', 0)
+        try:
+            result_start = int(result_start)
+        except Exception:
+            result_start = 0
+            self.log.error('Invalid ResultStart Param. Starting at 0')
+        while True:
+            params['resultStart'] = result_start
+            r = await self._get(url, params=params)
+            if not self.success(r):
+                err = r.text or r.reason
+                self._handle_error(950, [r.status_code, err, r.url])
+            data = r.json().get('data', {})
+            if api_entity:
+                data = data.get(api_entity, [])
+
+            for d in data:
+                yield d
+
+            if len(data) < self.result_limit:
+                break
+            result_start += self.result_limit
+
+    async def _paginate(self, pagination_requests: Iterator[tuple]) -> AsyncIterator[dict]:
+        """Iterate over the API pagination of the requests from the _iterate method."""
+        for url, params, api_entity in pagination_requests:
+            async for d in self._iterate_async(url, params, api_entity):
+                yield d
+
+    async def _post(self, url, data, params=None):
+        """Post data to API."""
+        if len(data) < 50 and not isinstance(data, bytes):
+            self.log.trace(f'body: {data}')
+        return await self._request('POST', 'posting', url, params, data=data)
+
+    async def _post_json(self, url, json_data, params=None):
+        """Post JSON data to API."""
+        self.log.trace(f'body: {json_data}')
+        return await self._request('POST', 'posting', url, params, json=json_data)
+
+    async def _put_json(self, url, json_data, params=None):
+        """Put JSON data to API."""
+        if len(json_data) < 50 and not isinstance(json_data, bytes):
+            self.log.trace(f'body: {json_data}')
+        return await self._request('PUT', 'updating', url, params, json=json_data)
+
+    async def _request(
+        self, method: str, action: str, url: str, params: Optional[dict] = None, **kwargs
+    ) -> Response:
+        """Send a request to the API logging the same details as the TiTcRequest methods."""
+        params = params or {}
+        params['createActivityLog'] = params.get('createActivityLog') or 'false'
+
+        r = await self.session.request(method, url, params=params, **kwargs)
+        self.log.debug(
+            f'Method: ({r.request.method.upper()}), '
+            f'Params: ({params}), '
+            f'Status Code: {r.status_code}, '
+            f'URL: ({r.url})'
+        )
+        if len(r.content) < 500:
+            self.log.trace(f'response: {r.text}')
+        if not r.ok:
+            err = r.text or r.reason
+            self.log.error(f'Error {action} data ({err}')
+        return r
+
+    async def _response(self, r: Response) -> Response:
+        """Log the status of an awaited response."""
+        r = await r
+        if r is not None:
+            self.log.debug(f'status code: {r.status_code}')
+            self.log.trace(f'url: {r.request.url}')
+        return r
+
+    async def _set_flag(self, field, name, main_type, sub_type, unique_id, value, owner=None):
+        """Set a boolean field of an indicator."""
+        data = {}
+        if self.is_true(value) or self.is_false(value):
+            data[field] = self.is_true(value)
+        else:
+            self._handle_error(925, ['option', name, 'value', value])
+
+        return await self._response(
+            self._put_json(
+                self._sub_resource_url(main_type, sub_type, unique_id),
+                data,
+                {'owner': owner} if owner else {},
+            )
+        )
+
+    @staticmethod
+    def _sub_resource_url(main_type, sub_type, unique_id, resource=None):
+        """Return the URL of a TI object or a sub resource of the TI object."""
+        url = f'/v2/{main_type}/{unique_id}'
+        if sub_type:
+            url = f'/v2/{main_type}/{sub_type}/{unique_id}'
+        if resource:
+            url = f'{url}/{resource}'
+        return url
+
+    async def add_false_positive(self, main_type, sub_type, unique_id, owner=None):
+        """Add a false positive (see TiTcRequest.add_false_positive)."""
+        params = {'owner': owner} if owner else {}
+        url = f'/v2/{main_type}/{sub_type}/{unique_id}/falsePositive'
+        return await self._response(self._post(url, {}, params))
+
+    async def add_observations(self, main_type, sub_type, unique_id, data, owner=None):
+        """Add observations (see TiTcRequest.add_observations)."""
+        params = {'owner': owner} if owner else {}
+        url = f'/v2/{main_type}/{sub_type}/{unique_id}/observations'
+        return await self._response(self._post_json(url, data, params))
+
+    def adversary_assets(self, *args, **kwargs):
+        """Yield the Adversary assets (see TiTcRequest.adversary_assets)."""
+        return self._paginate(super().adversary_assets(*args, **kwargs))
+
+    def adversary_handle_assets(self, *args, **kwargs):
+        """Yield the Adversary handle assets (see TiTcRequest.adversary_handle_assets)."""
+        return self._paginate(super().adversary_handle_assets(*args, **kwargs))
+
+    def adversary_phone_assets(self, *args, **kwargs):
+        """Yield the Adversary phone assets (see TiTcRequest.adversary_phone_assets)."""
+        return self._paginate(super().adversary_phone_assets(*args, **kwargs))
+
+    def adversary_url_assets(self, *args, **kwargs):
+        """Yield the Adversary URL assets (see TiTcRequest.adversary_url_assets)."""
+        return self._paginate(super().adversary_url_assets(*args, **kwargs))
+
+    def assignees(self, *args, **kwargs):
+        """Yield the assignees (see TiTcRequest.assignees)."""
+        return self._paginate(super().assignees(*args, **kwargs))
+
+    def attribute_labels(self, *args, **kwargs):
+        """Yield the attribute labels (see TiTcRequest.attribute_labels)."""
+        return self._paginate(super().attribute_labels(*args, **kwargs))
+
+    def attributes(self, *args, **kwargs):
+        """Yield the attributes (see TiTcRequest.attributes)."""
+        return self._paginate(super().attributes(*args, **kwargs))
+
+    async def deleted(
+        self, main_type, sub_type, deleted_since=None, owner=None, filters=None, params=None
+    ):
+        """Yield the deleted indicators (see TiTcRequest.deleted)."""
+        params = params or {}
+
+        if filters and filters.filters:
+            params['filters'] = filters.filters_string
+        if owner:
+            params['owner'] = owner
+        if deleted_since:
+            params['deletedSince'] = deleted_since
+
+        url = f'/v2/{main_type}/deleted'
+        if sub_type:
+            url = f'/v2/{main_type}/{sub_type}/deleted'
+
+        r = await self._get(url, params)
+        if not self.success(r):
+            err = r.text or r.reason
+            self._handle_error(950, [r.status_code, err, r.url])
+
+        for d in r.json().get('data', {}).get('indicator', []):
+            yield d
+
+    async def dns_resolution(self, main_type, sub_type, unique_id, owner=None):
+        """Get the DNS resolutions (see TiTcRequest.dns_resolution)."""
+        return await self._response(
+            self._get(
+                self._sub_resource_url(main_type, sub_type, unique_id, 'dnsResolution'),
+                {'owner': owner} if owner else {},
+            )
+        )
+
+    def escalatees(self, *args, **kwargs):
+        """Yield the escalatees (see TiTcRequest.escalatees)."""
+        return self._paginate(super().escalatees(*args, **kwargs))
+
+    def file_occurrences(self, *args, **kwargs):
+        """Yield the file occurrences (see TiTcRequest.file_occurrences)."""
+        return self._paginate(super().file_occurrences(*args, **kwargs))
+
+    def get_file_actions(self, *args, **kwargs):
+        """Yield the file actions (see TiTcRequest.get_file_actions)."""
+        return self._paginate(super().get_file_actions(*args, **kwargs))
+
+    async def get_file_hash(self, main_type, sub_type, unique_id, hash_type='sha256'):
+        """Get the hash of a file (see TiTcRequest.get_file_hash)."""
+        if hash_type == 'sha256':
+            hashed_file = hashlib.sha256()  # nosec
+        elif hash_type == 'sha1':
+            hashed_file = hashlib.sha1()  # nosec
+        else:
+            hashed_file = hashlib.md5()  # nosec
+
+        r = await self.session.get(
+            self._sub_resource_url(main_type, sub_type, unique_id, 'download')
+        )
+        hashed_file.update(r.content)
+        return hashed_file
+
+    def group_associations(self, *args, **kwargs):
+        """Yield the group associations (see TiTcRequest.group_associations)."""
+        return self._paginate(super().group_associations(*args, **kwargs))
+
+    def group_associations_types(self, *args, **kwargs):
+        """Yield the group associations by type (see TiTcRequest)."""
+        return self._paginate(super().group_associations_types(*args, **kwargs))
+
+    def groups_from_tag(self, *args, **kwargs):
+        """Yield the groups with a tag (see TiTcRequest.groups_from_tag)."""
+        return self.pivot_from_tag(*args, **kwargs)
+
+    def indicator_associations(self, *args, **kwargs):
+        """Yield the indicator associations (see TiTcRequest.indicator_associations)."""
+        return self._paginate(super().indicator_associations(*args, **kwargs))
+
+    def indicator_associations_types(self, *args, **kwargs):
+        """Yield the indicator associations by type (see TiTcRequest)."""
+        return self._paginate(super().indicator_associations_types(*args, **kwargs))
+
+    def indicators_from_tag(self, *args, **kwargs):
+        """Yield the indicators with a tag (see TiTcRequest.indicators_from_tag)."""
+        return self.pivot_from_tag(*args, **kwargs)
+
+    def labels(self, *args, **kwargs):
+        """Yield the security labels (see TiTcRequest.labels)."""
+        return self._paginate(super().labels(*args, **kwargs))
+
+    def many(self, *args, **kwargs):
+        """Yield the TI objects (see TiTcRequest.many)."""
+        return self._paginate(super().many(*args, **kwargs))
+
+    async def observation_count(self, main_type, sub_type, unique_id, owner=None):
+        """Get the observation count (see TiTcRequest.observation_count)."""
+        return await self._response(
+            self._get(
+                self._sub_resource_url(main_type, sub_type, unique_id, 'observationCount'),
+                {'owner': owner} if owner else {},
+            )
+        )
+
+    async def observations(self, main_type, sub_type, unique_id, owner=None, params=None):
+        """Get the observations (see TiTcRequest.observations)."""
+        params = params or {}
+        if owner:
+            params['owner'] = owner
+        return await self._response(
+            self._get(
+                self._sub_resource_url(main_type, sub_type, unique_id, 'observations'), params
+            )
+        )
+
+    async def owners(self, main_type, sub_type, unique_id, owner=None):
+        """Get the owners (see TiTcRequest.owners)."""
+        return await self._response(
+            self._get(
+                self._sub_resource_url(main_type, sub_type, unique_id, 'owners'),
+                {'owner': owner} if owner else {},
+            )
+        )
+
+    def pivot_from_tag(self, *args, **kwargs):
+        """Yield the TI objects with a tag (see TiTcRequest.pivot_from_tag)."""
+        return self._paginate(super().pivot_from_tag(*args, **kwargs))
+
+    async def set_dns_resolution(self, main_type, sub_type, unique_id, value, owner=None):
+        """Set the DNS resolution flag (see TiTcRequest.set_dns_resolution)."""
+        return await self._set_flag(
+            'dnsActive', 'dns value', main_type, sub_type, unique_id, value, owner
+        )
+
+    async def set_whois(self, main_type, sub_type, unique_id, value, owner=None):
+        """Set the whois flag (see TiTcRequest.set_whois)."""
+        return await self._set_flag(
+            'whoisActive', 'whois value', main_type, sub_type, unique_id, value, owner
+        )
+
+    def tags(self, *args, **kwargs):
+        """Yield the tags (see TiTcRequest.tags)."""
+        return self._paginate(super().tags(*args, **kwargs))
+
+    def victim_asset_associations(self, *args, **kwargs):
+        """Yield the victim asset associations (see TiTcRequest.victim_asset_associations)."""
+        return self._paginate(super().victim_asset_associations(*args, **kwargs))
+
+    def victim_assets(self, *args, **kwargs):
+        """Yield the victim assets (see TiTcRequest.victim_assets)."""
+        return self._paginate(super().victim_assets(*args, **kwargs))
+
+    def victims(self, *args, **kwargs):
+        """Yield the victims (see TiTcRequest.victims)."""
+        return self._paginate(super().victims(*args, **kwargs))
+
+    def victims_from_tag(self, *args, **kwargs):
+        """Yield the victims with a tag (see TiTcRequest.victims_from_tag)."""
+        return self.pivot_from_tag(*args, **kwargs)
@@ -41,7 +41,7 @@ class Mappings:
         # properties
         self._data = {}
         self.log = logger
-        self._tc_requests = TiTcRequest(ti.session)
+        self._tc_requests = TiTcRequest(ti.session, ti.page_workers)
         self._unique_id = None
         self._utils = Utils()
 
@@ -13,7 +13,7 @@ class Owner:
         self._api_type = 'owners'
         self._api_entity = 'owner'
 
-        self._tc_requests = TiTcRequest(ti.session)
+        self._tc_requests = TiTcRequest(ti.session, ti.page_workers)
 
     @property
     def type(self):
@@ -23,7 +23,7 @@ class Tag:
         self._api_entity = 'tag'
         self._api_sub_type = None
         self._api_type = None
-        self._tc_requests = TiTcRequest(ti.session)
+        self._tc_requests = TiTcRequest(ti.session, ti.page_workers)
         self._type = 'tags'
         self._utils = Utils()
         self.ti = ti
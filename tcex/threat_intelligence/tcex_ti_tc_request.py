@@ -2,6 +2,8 @@
 # standard library
 import hashlib
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from typing import Optional
 from urllib.parse import quote
@@ -20,10 +22,17 @@ logger = logging.getLogger('tcex')
 
 
 class TiTcRequest:
-    """Common API calls to ThreatConnect"""
+    """Common API calls to ThreatConnect
 
-    def __init__(self, session: Session) -> None:
+    Args:
+        session: An instance of TcSession.
+        page_workers: The number of threads used to fetch the pages of paginated requests (the
+            pages are fetched one at a time when 1).
+    """
+
+    def __init__(self, session: Session, page_workers: Optional[int] = 1) -> None:
         """Initialize Class properties."""
+        self.page_workers = page_workers or 1
         self.session = session
 
         # properties
@@ -105,7 +114,11 @@ class TiTcRequest:
             raise RuntimeError(code, message)
 
     def _iterate(self, url, params, api_entity):
-        """Iterate over API pagination."""
+        """Iterate over API pagination.
+
+        When page_workers is greater than 1, the remaining pages (from the resultCount of the
+        first page) are fetched concurrently and yielded in order.
+        """
         params['resultLimit'] = self.result_limit
 
         should_iterate = True
@@ -117,13 +130,7 @@ class TiTcRequest:
             self.log.error('Invalid ResultStart Param. Starting at 0')
         while should_iterate:
             params['resultStart'] = result_start
-            r = self._get(url, params=params)
-            if not self.success(r):
-                err = r.text or r.reason
-                self._handle_error(950, [r.status_code, err, r.url])
-            data = r.json().get('data', {})
-            if api_entity:
-                data = data.get(api_entity, [])
+            data, result_count = self._iterate_page(url, params, api_entity)
 
             if len(data) < self.result_limit:
                 should_iterate = False
@@ -131,6 +138,66 @@ class TiTcRequest:
 
             yield from data
 
+            if should_iterate and self.page_workers > 1 and result_count is not None:
+                starts = range(result_start, int(result_count), self.result_limit)
+                data = []
+                for data in self._iterate_parallel(url, params, api_entity, starts):
+                    yield from data
+
+                # the last page is full if entities were added during the pagination, continue
+                # one page at a time from there
+                should_iterate = len(data) == self.result_limit
+                if starts:
+                    result_start = starts[-1] + self.result_limit
+
+    def _iterate_page(self, url, params, api_entity):
+        """Return the entities and the resultCount (if available) of a page."""
+        r = self._get(url, params=params)
+        if not self.success(r):
+            err = r.text or r.reason
+            self._handle_error(950, [r.status_code, err, r.url])
+        data = r.json().get('data', {})
+        result_count = None
+        if isinstance(data, dict):
+            result_count = data.get('resultCount')
+        if api_entity:
+            data = data.get(api_entity, [])
+        return data, result_count
+
+    def _iterate_parallel(self, url, params, api_entity, starts):
+        """Yield the entities of each remaining page in order, fetching the pages concurrently.
+
+        The pages are fetched by a pool of page_workers threads with at most 2x page_workers
+        pages in flight, so the pages that are fetched ahead of the page being consumed (the
+        reorder buffer) are bounded.
+        """
+        starts = iter(starts)
+        pending = deque()
+        with ThreadPoolExecutor(
+            max_workers=self.page_workers, thread_name_prefix='ti-page'
+        ) as executor:
+
+            def submit():
+                start = next(starts, None)
+                if start is not None:
+                    pending.append(
+                        executor.submit(
+                            self._iterate_page, url, {**params, 'resultStart': start}, api_entity
+                        )
+                    )
+
+            try:
+                for _ in range(self.page_workers * 2):
+                    submit()
+                while pending:
+                    data, _ = pending.popleft().result()
+                    submit()
+                    yield data
+            finally:
+                # the consumer stopped iterating or a page failed
+                for future in pending:
+                    future.cancel()
+
     def _post(self, url, data, params=None):
         """Post data to API."""
         params = params or {}
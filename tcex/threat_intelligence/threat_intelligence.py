@@ -45,10 +45,17 @@ logger = logging.getLogger('tcex')
 
 
 class ThreatIntelligence:
-    """ThreatConnect Threat Intelligence Module"""
+    """ThreatConnect Threat Intelligence Module
 
-    def __init__(self, session: Session) -> None:
+    Args:
+        session: An instance of TcSession.
+        page_workers: The number of threads used to fetch the pages of paginated requests
+            (e.g., indicator().many()). The session pool_maxsize should be at least this value.
+    """
+
+    def __init__(self, session: Session, page_workers: Optional[int] = 1) -> None:
         """Initialize Class properties."""
+        self.page_workers = page_workers
         self.session = session
 
         # properties
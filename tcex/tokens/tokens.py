@@ -6,16 +6,24 @@ from typing import Optional
 
 # third-party
 from requests import Session, exceptions
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from ..sessions.pool_adapter import PoolAdapter
 from ..utils import Utils
 
 
-def retry_session(retries=3, backoff_factor=0.8, status_forcelist=(500, 502, 504)):
+def retry_session(
+    retries=3, backoff_factor=0.8, status_forcelist=(500, 502, 504), pool_config=None
+):
     """Add retry to Requests Session.
 
     https://urllib3.readthedocs.io/en/latest/reference/urllib3.util.html#urllib3.util.retry.Retry
+
+    Args:
+        retries (int, optional): The number of retry attempts.
+        backoff_factor (float, optional): The backoff factor for retries.
+        status_forcelist (tuple, optional): The status codes to retry on.
+        pool_config (dict, optional): The connection pool settings (see PoolAdapter).
     """
     session = Session()
     retries = Retry(
@@ -26,14 +34,21 @@ def retry_session(retries=3, backoff_factor=0.8, status_forcelist=(500, 502, 504
         status_forcelist=status_forcelist,
     )
     # mount all https requests
-    session.mount('https://', HTTPAdapter(max_retries=retries))
+    session.mount('https://', PoolAdapter(max_retries=retries, **(pool_config or {})))
     return session
 
 
 class Tokens:
     """Service methods for customer Service (e.g., Triggers)."""
 
-    def __init__(self, token_url: str, sleep_interval: int, verify: bool, logger: object):
+    def __init__(
+        self,
+        token_url: str,
+        sleep_interval: int,
+        verify: bool,
+        logger: object,
+        pool_config: Optional[dict] = None,
+    ):
         """Initialize the Class properties.
 
         Args:
@@ -41,6 +56,7 @@ class Tokens:
             sleep_interval: Token monitor sleep interval.
             verify: A boolean to enable/disable SSL verification.
             logger: An pre-configured instance of a logger.
+            pool_config: The connection pool settings for the token renewal session.
         """
         self.token_url = token_url
         self.sleep_interval = sleep_interval
@@ -50,7 +66,7 @@ class Tokens:
         # properties
         self.lock = threading.Lock()
         # session with retry for token renewal
-        self.session: Session = retry_session()
+        self.session: Session = retry_session(pool_config=pool_config)
         # shutdown boolean
         self.shutdown = False
         # token map for storing keys -> tokens -> threads
@@ -2,6 +2,8 @@
 
 
 # standard library
+import base64
+import hashlib
 import json
 
 
@@ -77,6 +79,47 @@ class TestAdvancedRequest:
         assert data.get('args', {}).get('one') == '1'
         assert data.get('args', {}).get('two') == ''
 
+    def test_advanced_request_get_stream(self, playbook_app: callable):
+        """Test advanced request feature streaming the response to disk
+
+        Args:
+            playbook_app (callable, fixture): The playbook_app fixture.
+        """
+        tcex = playbook_app(
+            config_data={
+                'tc_adv_req_exclude_null_params': False,
+                'tc_adv_req_fail_on_error': False,
+                'tc_adv_req_urlencode_body': False,
+                'tc_adv_req_body': None,
+                'tc_adv_req_headers': {'key': 'pytest', 'value': 'pytest'},
+                'tc_adv_req_http_method': 'GET',
+                'tc_adv_req_params': [],
+                'tc_adv_req_path': '/bytes/102400',
+                'tc_playbook_out_variables': self.tc_playbook_out_variables,
+            }
+        ).tcex
+
+        se = tcex.session_external
+        se.base_url = 'https://httpbin.tci.ninja'
+        se.verify = False
+
+        ar = tcex.advanced_request(session=se, timeout=60, stream=True, hash_algorithm='sha256')
+
+        r = ar.request()
+        content = ar.content_file.read_bytes()
+
+        assert r.status_code == 200
+        assert len(content) == 102400
+        assert ar.content_hash == hashlib.sha256(content).hexdigest()
+
+        # the Binary output is written from the file
+        tcex.playbook.write_output()
+        data = self._load_data(tcex, tcex.args.tc_playbook_db_context)
+        binary = data.get('#App:0001:pytest.request.content.binary!Binary')
+        assert base64.b64decode(binary) == content
+        # the temp file is deleted once the output is written
+        assert not ar.content_file.exists()
+
     def test_advanced_request_get_500(self, playbook_app: callable):
         """Test advanced request feature
 
@@ -119,3 +119,45 @@ class TestAttributes:
             'b40930bbcf80744c86c46a12bc9da056641d722716c378f5659b9e555ef833e1'
         )
         assert batch._indicator_values(indicator_data) == indicator_data.split(' : ')
+
+    @staticmethod
+    def test_batch_submit_all_concurrent(request, tcex):
+        """Test batch submit_all with multiple jobs in flight."""
+        batch = tcex.batch(owner=os.getenv('TC_OWNER'))
+        batch._batch_max_chunk = 2
+        for i in range(1, 7):
+            batch.address(
+                ip=f'3.33.34.{i}', xid=batch.generate_xid(['pytest', request.node.name, str(i)])
+            )
+
+        batch_status = batch.submit_all(concurrency=3)
+        assert len(batch_status) == 3
+        # status is returned in submission order
+        batch_ids = [status.get('id') for status in batch_status]
+        assert batch_ids == sorted(batch_ids)
+        for status in batch_status:
+            assert status.get('status') == 'Completed'
+            assert status.get('successCount') == 2
+
+    @staticmethod
+    def test_batch_requeue_journal(request, tcex, tmp_path):
+        """Test an entity requeued after an error is resubmitted with the journal enabled."""
+        batch = tcex.batch(owner=os.getenv('TC_OWNER'))
+        batch.enable_error_requeue = True
+        batch.enable_journal = True
+        batch.journal_fqfn = os.path.join(tmp_path, 'batch-journal.db')
+        batch.retryable_error_codes = {'0x1004'}
+        xid = batch.generate_xid(['pytest', request.node.name])
+        batch.address(ip='3.33.34.1', xid=xid)
+
+        # the chunk completes with a retryable error for the indicator
+        content = batch.data
+        chunk_id = batch._journal_start(content, {})
+        errors = [{'errorCode': '0x1004', 'errorSource': f'{{"xid": "{xid}"}}'}]
+        assert batch.requeue_errors(errors, content) == 1
+        batch._journal_complete(chunk_id, {'status': 'Completed'})
+
+        # the requeued indicator is in the next chunk
+        content = batch.data
+        assert [i.get('xid') for i in content.get('indicator')] == [xid]
+        batch.close()
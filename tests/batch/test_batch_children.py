@@ -0,0 +1,76 @@
+"""Test the TcEx Batch Indicator and Group child lists."""
+# standard library
+import json
+import pickle  # nosec
+
+# first-party
+from tcex.batch.group import Incident
+from tcex.batch.indicator import Address, File, FileAction
+
+
+class TestBatchChildren:
+    """Test the TcEx Batch Indicator and Group child lists."""
+
+    @staticmethod
+    def test_file_action_children():
+        """Test nested file actions are included in the file action data."""
+        action = FileAction('file-1', 'drop')
+        assert action.data.get('children') is None
+
+        action.action('archive')
+        action.action('traffic')
+        children = action.data.get('children')
+        assert [c.get('relationship') for c in children] == ['archive', 'traffic']
+        assert [c.get('parentIndicatorXid') for c in children] == [action.xid] * 2
+        # the children list is not rebuilt on each call
+        assert action.data.get('children') is children
+
+    @staticmethod
+    def test_file_unset_children():
+        """Test a file indicator without file actions or occurrences."""
+        ti = File(md5='a' * 32, xid='file-1')
+
+        assert 'fileAction' not in ti.data
+        assert 'fileOccurrence' not in ti.data
+        assert json.loads(ti.json()) == ti.data
+
+        ti.action('drop').action('archive')
+        file_action = ti.data.get('fileAction')
+        assert [c.get('relationship') for c in file_action.get('children')] == ['drop']
+        nested = file_action.get('children')[0].get('children')
+        assert [c.get('relationship') for c in nested] == ['archive']
+        assert json.loads(ti.json()) == json.loads(json.dumps(ti.data))
+
+    @staticmethod
+    def test_group_unset_children():
+        """Test a group without attributes, labels, or tags."""
+        ti = Incident('incident-1', xid='incident-1')
+        data = {'name': 'incident-1', 'type': 'Incident', 'xid': 'incident-1'}
+
+        assert ti.data == data
+        assert json.loads(ti.json()) == data
+
+        restored = pickle.loads(pickle.dumps(ti))  # nosec
+        assert restored.data == data
+        assert json.loads(restored.json()) == data
+
+        # the child lists are created on first use
+        restored.tag('pytest')
+        assert restored.data.get('tag') == [{'name': 'pytest'}]
+
+    @staticmethod
+    def test_indicator_unset_children():
+        """Test an indicator without attributes, labels, occurrences, or tags."""
+        ti = Address('1.1.1.1', xid='address-1')
+        data = {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'address-1'}
+
+        assert ti.data == data
+        assert json.loads(ti.json()) == data
+
+        restored = pickle.loads(pickle.dumps(ti))  # nosec
+        assert restored.data == data
+        assert json.loads(restored.json()) == data
+
+        # the child lists are created on first use
+        restored.attribute('Description', 'pytest')
+        assert restored.data.get('attribute') == [{'type': 'Description', 'value': 'pytest'}]
@@ -0,0 +1,56 @@
+"""Test the TcEx Batch Chunk Module."""
+# standard library
+import json
+
+# first-party
+from tcex.batch.batch_chunk import BatchChunk
+
+
+class TestBatchChunk:
+    """Test the TcEx Batch Chunk Module."""
+
+    @staticmethod
+    def test_batch_chunk_json():
+        """Test the body assembled from fragments matches a full encode."""
+        chunk = BatchChunk()
+        group = {'name': 'pytest-adversary', 'type': 'Adversary', 'xid': 'g-1'}
+        indicator = {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i-1', 'tag': [{'name': 'é'}]}
+        group_size = chunk.append('group', group)
+        indicator_size = chunk.append('indicator', indicator)
+        chunk['file']['g-1'] = {'fileContent': b'content'}
+
+        assert group_size == len(json.dumps(group).encode())
+        assert chunk.size == group_size + indicator_size
+        assert json.loads(chunk.json()) == {'group': [group], 'indicator': [indicator]}
+        assert chunk.json() == json.dumps({'group': [group], 'indicator': [indicator]})
+
+    @staticmethod
+    def test_batch_chunk_modified():
+        """Test a chunk modified after entities were added is fully encoded."""
+        chunk = BatchChunk()
+        chunk.append('indicator', {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i-1'})
+        chunk['indicator'].append({'summary': '1.1.1.2', 'type': 'Address', 'xid': 'i-2'})
+
+        assert not chunk.fragments_valid
+        assert len(json.loads(chunk.json()).get('indicator')) == 2
+
+    @staticmethod
+    def test_batch_chunk_entity_replaced():
+        """Test an entity replaced after it was added is encoded with the full chunk."""
+        chunk = BatchChunk()
+        chunk.append('indicator', {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i-1'})
+        chunk.append('indicator', {'summary': '1.1.1.2', 'type': 'Address', 'xid': 'i-2'})
+        assert chunk.fragments_valid
+
+        # an appended entity is frozen, a change is made by replacing the entity
+        chunk['indicator'][0] = {**chunk['indicator'][0], 'rating': 5}
+        assert not chunk.fragments_valid
+        assert chunk.json() == json.dumps(
+            {
+                'group': [],
+                'indicator': [
+                    {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i-1', 'rating': 5},
+                    {'summary': '1.1.1.2', 'type': 'Address', 'xid': 'i-2'},
+                ],
+            }
+        )
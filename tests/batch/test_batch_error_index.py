@@ -0,0 +1,73 @@
+"""Test the TcEx Batch Error Index Module."""
+# standard library
+import json
+
+# first-party
+from tcex.batch.batch_error_index import BatchErrorIndex
+
+ERROR_CODES = {
+    '0x1001': 'General Error',
+    '0x1004': 'Internal Error',
+    '0x1005': 'Invalid Indicator Error',
+    '0x1006': 'Invalid Group Error',
+    '0x1009': 'Association Error',
+}
+
+
+class TestBatchErrorIndex:
+    """Test the TcEx Batch Error Index Module."""
+
+    @staticmethod
+    def test_batch_error_index():
+        """Test errors are matched to entities and classified by error code."""
+        content = {
+            'group': [{'name': 'incident-001', 'type': 'Incident', 'xid': 'g-1'}],
+            'indicator': [
+                {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i-1'},
+                {'summary': '1.1.1.2', 'type': 'Address', 'xid': 'i-2'},
+                {'summary': '1.1.1.3', 'type': 'Address', 'xid': 'i-3'},
+            ],
+        }
+        errors = [
+            # matched on name, code inferred from the reason
+            {
+                'errorReason': 'Incident incident-001 has an invalid status.',
+                'errorSource': 'incident-001 is not valid.',
+            },
+            # matched on xid from the JSON encoded source
+            {'errorCode': '0x1004', 'errorSource': json.dumps({'xid': 'i-1'})},
+            # matched on xid token
+            {'errorReason': 'Association to group failed for i-2.', 'errorSource': ''},
+            # matched on summary
+            {'errorReason': 'Indicator 1.1.1.3 could not be saved.', 'errorSource': None},
+            {'errorReason': 'Unknown failure.', 'errorSource': 'unknown'},
+        ]
+
+        index = BatchErrorIndex(ERROR_CODES)
+        records = index.add(errors, content)
+
+        assert [(r.get('xid'), r.get('code')) for r in records] == [
+            ('g-1', '0x1006'),
+            ('i-1', '0x1004'),
+            ('i-2', '0x1009'),
+            ('i-3', 'unclassified'),
+            (None, 'unclassified'),
+        ]
+        assert index.get('g-1')[0].get('description') == 'Invalid Group Error'
+        assert index.get('i-4') == []
+        assert len(index.unmatched) == 1
+        assert index.get('i-3')[0].get('description') == 'Unclassified Error'
+        assert index.counts == {'0x1004': 1, '0x1006': 1, '0x1009': 1, 'unclassified': 2}
+
+    @staticmethod
+    def test_batch_error_index_unclassified():
+        """Test errors without a known code or matching reason are unclassified."""
+        content = {'indicator': [{'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i-1'}]}
+        errors = [
+            {'errorReason': 'An unexpected exception occurred for i-1.'},
+            {'errorCode': '0x9999', 'errorReason': 'Something failed for i-1.'},
+        ]
+
+        records = BatchErrorIndex(ERROR_CODES).add(errors, content)
+
+        assert [r.get('code') for r in records] == ['unclassified', 'unclassified']
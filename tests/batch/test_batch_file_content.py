@@ -0,0 +1,49 @@
+"""Test the TcEx Batch File Content Module."""
+# standard library
+import io
+import os
+import pathlib
+
+# first-party
+from tcex.batch.batch_file_content import BatchFileContent
+
+
+class TestBatchFileContent:
+    """Test the TcEx Batch File Content Module."""
+
+    @staticmethod
+    def _read(body):
+        """Return the full content of a request body."""
+        if isinstance(body, (bytes, str)):
+            return body
+        if hasattr(body, 'read'):
+            return body.read()
+        return b''.join(body)
+
+    def test_batch_file_content_iterator_replay(self):
+        """Test iterator content can be sent a second time from the spool."""
+        with BatchFileContent(iter([b'pytest ', 'content'])) as file_content:
+            assert self._read(file_content.body()) == b'pytest content'
+            assert file_content.measure() == 14
+            assert self._read(file_content.body()) == b'pytest content'
+            assert file_content.measure() == 14
+
+    def test_batch_file_content_path(self, tmp_path):
+        """Test path content is streamed from the file and rewound for each body."""
+        fqfn = pathlib.Path(os.path.join(tmp_path, 'pytest.txt'))
+        fqfn.write_bytes(b'x' * 1_000)
+
+        with BatchFileContent(fqfn) as file_content:
+            assert self._read(file_content.body()) == b'x' * 1_000
+            assert file_content.measure() == 1_000
+            assert self._read(file_content.body()) == b'x' * 1_000
+
+    def test_batch_file_content_write(self, tmp_path):
+        """Test content written to disk is still available for upload."""
+        fqfn = os.path.join(tmp_path, 'pytest.txt')
+        with BatchFileContent(io.BytesIO(b'pytest content')) as file_content:
+            file_content.write(fqfn)
+            assert self._read(file_content.body()) == b'pytest content'
+
+        with open(fqfn, 'rb') as fh:
+            assert fh.read() == b'pytest content'
@@ -0,0 +1,117 @@
+"""Test the TcEx Batch shared Tag, Security Label, and Attribute data."""
+# standard library
+import json
+
+# first-party
+from tcex.batch.attribute import Attribute
+from tcex.batch.group import Incident
+from tcex.batch.indicator import Address, File
+from tcex.batch.security_label import SecurityLabel
+from tcex.batch.tag import Tag
+
+
+class TestBatchFlyweights:
+    """Test the TcEx Batch shared Tag, Security Label, and Attribute data."""
+
+    @staticmethod
+    def test_attribute_copy_on_write():
+        """Test updating a shared attribute does not change other attributes."""
+        attribute_1 = Attribute('Description', 'shared description')
+        attribute_2 = Attribute('Description', 'shared description')
+        assert attribute_1.json is attribute_2.json
+        # the returned data is a copy, changing it does not change the shared data
+        attribute_1.data['value'] = 'changed'
+        assert attribute_2.value == 'shared description'
+
+        attribute_2.source = 'feed'
+        assert attribute_1.data == {'type': 'Description', 'value': 'shared description'}
+        assert json.loads(attribute_2.json) == {
+            'type': 'Description',
+            'value': 'shared description',
+            'source': 'feed',
+        }
+
+    @staticmethod
+    def test_indicator_json():
+        """Test the spliced indicator/group JSON matches the indicator/group data."""
+        ti = File(md5='a' * 32, xid='file-1')
+        ti.action('drop')
+        ti.occurrence('drop.exe', '/tmp', '2020-01-01')
+        ti.attribute('Description', 'shared description')
+        ti.security_label('TLP:GREEN')
+        ti.tag('shared tag')
+        assert json.loads(ti.json()) == json.loads(json.dumps(ti.data))
+        # the data is unchanged by a second call
+        assert json.loads(ti.json()) == json.loads(json.dumps(ti.data))
+
+        ti = Incident('incident-1', xid='incident-1')
+        ti.tag('shared tag')
+        ti.tag('')  # invalid tags are not included
+        assert json.loads(ti.json()) == ti.data
+
+        ti = Address('1.1.1.1', xid='address-1')
+        assert json.loads(ti.json()) == ti.data
+
+    @staticmethod
+    def test_security_label_copy_on_write():
+        """Test updating a shared security label does not change other labels."""
+        label_1 = SecurityLabel('TLP:GREEN', color='00ff00')
+        label_2 = SecurityLabel('TLP:GREEN', color='00ff00')
+        assert label_1.json is label_2.json
+        label_1.data['color'] = 'ffffff'
+        assert label_2.color == '00ff00'
+
+        label_2.description = 'shared label'
+        assert label_1.description is None
+        assert json.loads(label_1.json) == {'name': 'TLP:GREEN', 'color': '00ff00'}
+
+    @staticmethod
+    def test_tag_shared():
+        """Test indicators and groups share a single Tag instance for each name."""
+        tag_1 = Address('1.1.1.1').tag('shared tag')
+        tag_2 = Incident('incident-1').tag('shared tag')
+        assert tag_1 is tag_2
+        assert tag_1.json == '{"name": "shared tag"}'
+        assert Tag.shared('Shared Tag', formatter=str.lower) is tag_1
+        tag_1.data['name'] = 'changed'
+        assert tag_2.name == 'shared tag'
+
+    @staticmethod
+    def test_tag_shared_lru():
+        """Test the least recently used tags are evicted from the shared instances."""
+        oldest = Tag.shared('pytest tag oldest')
+        recent = Tag.shared('pytest tag recent')
+        for i in range(Tag._shared.cache_info().maxsize - 1):  # pylint: disable=no-member
+            Tag.shared(f'pytest tag {i}')
+            if i % 1_000 == 0:
+                assert Tag.shared('pytest tag recent') is recent
+
+        # the recently used tag is still shared, the oldest tag was evicted
+        assert Tag.shared('pytest tag recent') is recent
+        assert Tag.shared('pytest tag oldest') is not oldest
+
+    @staticmethod
+    def test_unpickle_lazy():
+        """Test the attributes, labels, and tags of an unpickled indicator are built when used."""
+        # standard library
+        import pickle  # nosec
+
+        ti = Address('1.1.1.1', xid='address-1')
+        ti.attribute('Description', 'shared description')
+        ti.security_label('TLP:GREEN')
+        ti.tag('shared tag')
+        data = json.loads(json.dumps(ti.data))
+
+        restored = pickle.loads(pickle.dumps(ti))  # nosec
+        # pickled again before use, the objects are not built
+        restored = pickle.loads(pickle.dumps(restored))  # nosec
+        assert restored._pickled.keys() == {  # pylint: disable=protected-access
+            '_attributes',
+            '_labels',
+            '_tags',
+        }
+
+        assert json.loads(restored.json()) == data
+        assert restored._pickled == {}  # pylint: disable=protected-access
+        assert restored.tag('shared tag') is ti.tag('shared tag')
+        assert json.loads(json.dumps(restored.data)) == data
@@ -0,0 +1,77 @@
+"""Test the TcEx Batch Journal Module."""
+# standard library
+import os
+import sqlite3
+import time
+
+# first-party
+from tcex.batch.batch_journal import BatchJournal
+
+
+class TestBatchJournal:
+    """Test the TcEx Batch Journal Module."""
+
+    @staticmethod
+    def test_batch_journal_resume(tmp_path):
+        """Test chunk status survives reopening the journal."""
+        fqfn = os.path.join(tmp_path, 'batch-journal.db')
+        journal = BatchJournal(fqfn)
+        completed = journal.start(['g-1', 'i-1'])
+        journal.submitted(completed, 101)
+        journal.complete(completed, {'id': 101, 'status': 'Completed', 'errorCount': 1})
+        in_flight = journal.start(['i-2'], file_count=1)
+        journal.submitted(in_flight, 102)
+        pending = journal.start(['i-3'])
+        journal.close()
+
+        # reopen as the next execution would
+        journal = BatchJournal(fqfn)
+        assert journal.is_completed('g-1') is True
+        assert journal.is_completed('i-2') is False
+        assert journal.chunks('Submitted') == [(in_flight, 102, 'Submitted', 1)]
+        assert journal.summary() == {'Completed': 1, 'Pending': 1, 'Submitted': 1}
+        assert journal.resumable is True
+
+        # resubmitted xids are tracked by the latest chunk
+        journal.fail(in_flight, 'file upload status unknown')
+        resubmitted = journal.start(['i-2', 'i-3'])
+        journal.complete(resubmitted, {'status': 'Completed'})
+        # chunks completed by this run are not skipped (e.g., an xid requeued after an error)
+        assert journal.is_completed('i-3') is False
+        assert pending != resubmitted
+        assert journal.resumable is False
+        journal.close()
+
+        # the next execution skips them
+        journal = BatchJournal(fqfn)
+        assert journal.is_completed('i-3') is True
+
+        journal.delete()
+        assert not os.path.isfile(fqfn)
+
+    @staticmethod
+    def test_batch_journal_expired(tmp_path):
+        """Test chunks of a previous run older than max_age are removed when opened."""
+        fqfn = os.path.join(tmp_path, 'batch-journal.db')
+        journal = BatchJournal(fqfn)
+        expired = journal.start(['i-1'])
+        journal.complete(expired, {'status': 'Completed'})
+        recent = journal.start(['i-2'])
+        journal.complete(recent, {'status': 'Completed'})
+        journal.close()
+
+        # age the first chunk past max_age
+        with sqlite3.connect(fqfn) as conn:
+            conn.execute('UPDATE chunk SET updated = ? WHERE id = ?', (time.time() - 7200, expired))
+
+        journal = BatchJournal(fqfn, max_age=3600)
+        assert journal.is_completed('i-1') is False
+        assert journal.is_completed('i-2') is True
+        assert journal.summary() == {'Completed': 1}
+        journal.delete()
+
+    @staticmethod
+    def test_batch_journal_xids():
+        """Test the xids are returned for groups and indicators in chunk content."""
+        content = {'group': [{'xid': 'g-1'}], 'indicator': [{'xid': 'i-1'}, {'xid': 'i-2'}]}
+        assert BatchJournal.xids(content) == ['g-1', 'i-1', 'i-2']
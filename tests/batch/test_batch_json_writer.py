@@ -0,0 +1,145 @@
+"""Test the TcEx Batch JSON Writer Module."""
+# standard library
+import gzip
+import json
+import os
+
+# third-party
+import pytest
+
+# first-party
+from tcex.batch.batch_json_writer import BatchJsonWriter, ShardedBatchJsonWriter
+
+
+class TestBatchJsonWriter:
+    """Test the TcEx Batch JSON Writer Module."""
+
+    @staticmethod
+    def _filename(tmp_path):
+        """Return a callable that returns a new filename for each call."""
+        counter = {'file': 0}
+
+        def filename():
+            counter['file'] += 1
+            return os.path.join(tmp_path, f'batch-{counter["file"]}.json.gz')
+
+        return filename
+
+    @staticmethod
+    def _read(fqfn):
+        """Return the JSON content of a gzip file."""
+        with gzip.open(fqfn, mode='rt', encoding='utf-8') as fh:
+            return json.load(fh)
+
+    def test_batch_json_writer_rotate(self, tmp_path):
+        """Test files are rotated at max count and each file is a valid batch document."""
+        completed = []
+        writer = BatchJsonWriter(
+            filename=self._filename(tmp_path), max_count=2, write_callback=completed.append
+        )
+        with writer:
+            writer.write('group', {'name': 'pytest-adversary', 'type': 'Adversary', 'xid': 'g-1'})
+            for i in range(3):
+                writer.write('indicator', json.dumps({'summary': f'1.1.1.{i}', 'xid': f'i-{i}'}))
+                writer.rotate()
+
+        assert writer.files == completed
+        assert len(writer.files) == 2
+        assert writer.count == {'group': 1, 'indicator': 3}
+        assert self._read(writer.files[0]) == {
+            'group': [{'name': 'pytest-adversary', 'type': 'Adversary', 'xid': 'g-1'}],
+            'indicator': [{'summary': '1.1.1.0', 'xid': 'i-0'}],
+        }
+        assert len(self._read(writer.files[1]).get('indicator')) == 2
+
+    def test_batch_json_writer_group_after_indicator(self, tmp_path):
+        """Test a group written after indicators starts a new file."""
+        with BatchJsonWriter(filename=self._filename(tmp_path)) as writer:
+            writer.write('indicator', {'summary': '1.1.1.1', 'xid': 'i-1'})
+            writer.write('group', {'name': 'pytest-adversary', 'xid': 'g-1'})
+
+        assert len(writer.files) == 2
+        assert self._read(writer.files[0]) == {
+            'group': [],
+            'indicator': [{'summary': '1.1.1.1', 'xid': 'i-1'}],
+        }
+        assert self._read(writer.files[1]) == {
+            'group': [{'name': 'pytest-adversary', 'xid': 'g-1'}],
+            'indicator': [],
+        }
+
+    def test_batch_json_writer_max_size(self, tmp_path):
+        """Test rotate does not close the file until the max size is reached."""
+        with BatchJsonWriter(filename=self._filename(tmp_path), max_size=1_000) as writer:
+            for i in range(100):
+                writer.write('indicator', {'summary': f'1.1.1.{i}', 'xid': f'i-{i}'})
+                writer.rotate()
+
+        assert len(writer.files) > 1
+        indicators = []
+        for fqfn in writer.files:
+            indicators.extend(self._read(fqfn).get('indicator'))
+        assert [i.get('xid') for i in indicators] == [f'i-{i}' for i in range(100)]
+
+    def test_sharded_batch_json_writer(self, tmp_path):
+        """Test files written in parallel match the files written by the BatchJsonWriter."""
+        completed = []
+        with ShardedBatchJsonWriter(
+            filename=self._filename(tmp_path),
+            max_count=10,
+            workers=3,
+            write_callback=completed.append,
+        ) as writer:
+            writer.write('group', {'name': 'pytest-adversary', 'type': 'Adversary', 'xid': 'g-1'})
+            for i in range(95):
+                writer.write('indicator', {'summary': f'1.1.1.{i}', 'xid': f'i-{i}'})
+                writer.rotate()
+
+        # filenames are assigned in order, callbacks are sent as each file is written
+        assert writer.files == [os.path.join(tmp_path, f'batch-{i}.json.gz') for i in range(1, 11)]
+        assert sorted(completed) == sorted(writer.files)
+        assert not [f for f in os.listdir(tmp_path) if f.endswith('.tmp')]
+        assert self._read(writer.files[0]).get('group') == [
+            {'name': 'pytest-adversary', 'type': 'Adversary', 'xid': 'g-1'}
+        ]
+        indicators = [i for f in writer.files for i in self._read(f).get('indicator')]
+        assert [i.get('xid') for i in indicators] == [f'i-{i}' for i in range(95)]
+
+    def test_sharded_batch_json_writer_max_buffered_size(self, tmp_path):
+        """Test the files waiting to be written are bounded by bytes."""
+        buffered = []
+
+        def write_callback(fqfn):  # pylint: disable=unused-argument
+            buffered.append(writer._buffered)  # pylint: disable=protected-access
+
+        writer = ShardedBatchJsonWriter(
+            filename=self._filename(tmp_path),
+            max_count=10,
+            max_buffered_size=1_000,
+            workers=2,
+            write_callback=write_callback,
+        )
+        with writer:
+            for i in range(200):
+                writer.write('indicator', {'summary': f'1.1.1.{i}', 'xid': f'i-{i}'})
+                writer.rotate()
+
+        assert len(writer.files) == 20
+        assert max(buffered) <= 1_000
+        assert writer._buffered == 0  # pylint: disable=protected-access
+        indicators = [i for f in writer.files for i in self._read(f).get('indicator')]
+        assert [i.get('xid') for i in indicators] == [f'i-{i}' for i in range(200)]
+
+    @staticmethod
+    def test_sharded_batch_json_writer_write_error(tmp_path):
+        """Test the temporary file is removed when a file fails to be written."""
+        # a directory at the filename makes the rename of the written file fail
+        fqfn = os.path.join(tmp_path, 'batch-1.json.gz')
+        os.mkdir(fqfn)
+
+        writer = ShardedBatchJsonWriter(filename=lambda: fqfn, max_count=10, workers=1)
+        writer.write('indicator', {'summary': '1.1.1.1', 'xid': 'i-1'})
+        with pytest.raises(OSError):
+            writer.wait()
+
+        assert not [f for f in os.listdir(tmp_path) if f.endswith('.tmp')]
@@ -0,0 +1,59 @@
+"""Test the TcEx Batch Poller Module."""
+# standard library
+import logging
+import time
+from types import SimpleNamespace
+
+# first-party
+from tcex.batch.batch_poller import BatchPoller
+
+
+class MockSession:
+    """Session returning a Completed status once a job has been polled *polls* times."""
+
+    def __init__(self, polls: int):
+        """Initialize Class properties."""
+        self.polls = polls
+        self.requests = {}
+
+    def get(self, url: str, **kwargs):  # pylint: disable=unused-argument
+        """Return the batch status for the batch id in the URL."""
+        batch_id = int(url.split('/')[-1])
+        self.requests[batch_id] = self.requests.get(batch_id, 0) + 1
+        status = 'Completed' if self.requests[batch_id] >= self.polls else 'Running'
+        data = {'status': 'Success', 'data': {'batchStatus': {'id': batch_id, 'status': status}}}
+        return SimpleNamespace(
+            headers={'content-type': 'application/json'},
+            json=lambda: data,
+            ok=True,
+            status_code=200,
+            text='',
+        )
+
+
+class TestBatchPoller:
+    """Test the TcEx Batch Poller Module."""
+
+    @staticmethod
+    def test_batch_poller_many_jobs():
+        """Test a single poller resolves a future and callback for each job."""
+        session = MockSession(polls=2)
+        tcex = SimpleNamespace(log=logging.getLogger('pytest'), session=session)
+        poller = BatchPoller(tcex, max_interval=0.01)
+
+        completed = []
+        futures = [
+            poller.submit(batch_id, callback=completed.append, interval=0.01, retry_seconds=0)
+            for batch_id in range(1, 11)
+        ]
+        start = time.time()
+        results = [f.result(timeout=5) for f in futures]
+        poller.shutdown()
+
+        assert time.time() - start < 5
+        assert [r.get('data').get('batchStatus').get('id') for r in results] == list(range(1, 11))
+        assert len(completed) == 10
+        # one status request per poll for each job
+        assert session.requests == {batch_id: 2 for batch_id in range(1, 11)}
+        assert poller.interval is not None
+        assert poller.pending == 0
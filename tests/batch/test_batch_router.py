@@ -0,0 +1,92 @@
+"""Test the TcEx Batch Router Module."""
+# standard library
+import logging
+import os
+from types import SimpleNamespace
+
+# third-party
+import pytest
+
+# first-party
+from tcex.batch.batch_router import BatchRouter
+
+
+class TestBatchRouter:
+    """Test the TcEx Batch Router Module."""
+
+    @staticmethod
+    def test_batch_router(request, tcex):
+        """Test entities are routed to a Batch per owner."""
+        router = tcex.batch_router(
+            concurrency=2, batch_callback=lambda b: setattr(b, 'submit_concurrency', 1)
+        )
+        owner = os.getenv('TC_OWNER')
+        router.add_indicator(
+            owner, {'summary': '1.1.1.1', 'type': 'Address', 'xid': f'{request.node.name}-1'}
+        )
+        router.indicator(owner, 'Host', 'www.example.com', xid=f'{request.node.name}-2')
+        router.group('Other Owner', 'Incident', request.node.name, xid=request.node.name)
+
+        assert router.batch(owner) is router.batch(owner)
+        assert router.owners == [owner, 'Other Owner']
+        assert len(router.batch(owner)) == 2
+        assert len(router.batch('Other Owner')) == 1
+        router.close()
+
+    @staticmethod
+    def test_batch_router_submit_all(request, tcex):
+        """Test the Batch for each owner is submitted."""
+        router = tcex.batch_router()
+        owner = os.getenv('TC_OWNER')
+        router.indicator(owner, 'Host', 'www.example.com', xid=request.node.name)
+
+        results = router.submit_all()
+        assert list(results) == [owner]
+        assert results[owner][0].get('successCount') == 1
+        router.close()
+
+    @staticmethod
+    def test_batch_router_submit_all_errors():
+        """Test all owners are submitted and closed before a combined error is raised."""
+        closed = []
+
+        class FakeBatch:
+            """A Batch that fails to submit for some owners."""
+
+            def __init__(self, owner: str):
+                """Initialize Class properties."""
+                self.owner = owner
+
+            def close(self):
+                """Record the Batch was closed."""
+                closed.append(self.owner)
+
+            def submit_all(self, *args):  # pylint: disable=unused-argument
+                """Return the Batch status or raise an error."""
+                if self.owner in ['owner-1', 'owner-3']:
+                    raise RuntimeError(f'{self.owner} failed')
+                return [{'errorCount': 0, 'successCount': 1}]
+
+        def handle_error(code, message_values=None, raise_error=True):
+            """Raise the error the same as TcEx.handle_error."""
+            if raise_error:
+                raise RuntimeError(code, message_values)
+
+        tcex = SimpleNamespace(
+            batch=lambda owner, **kwargs: FakeBatch(owner),
+            handle_error=handle_error,
+            log=logging.getLogger('pytest'),
+        )
+        router = BatchRouter(tcex)
+        for owner in ['owner-1', 'owner-2', 'owner-3']:
+            router.batch(owner)
+
+        results = router.submit_all(halt_on_error=False)
+        assert results['owner-2'] == [{'errorCount': 0, 'successCount': 1}]
+        assert not closed
+
+        with pytest.raises(RuntimeError) as exc_info:
+            router.submit_all()
+        message = exc_info.value.args[1][0]
+        assert 'owner-1 failed' in message and 'owner-3 failed' in message
+        assert closed == ['owner-1', 'owner-2', 'owner-3']
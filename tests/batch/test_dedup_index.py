@@ -0,0 +1,81 @@
+"""Test the TcEx Batch Dedup Index Module."""
+# first-party
+from tcex.batch.dedup_index import DedupIndex
+from tcex.batch.indicator import Address
+
+
+class TestDedupIndex:
+    """Test the TcEx Batch Dedup Index Module."""
+
+    @staticmethod
+    def test_dedup_index_key():
+        """Test summaries are normalized for the indicator type."""
+        index = DedupIndex()
+
+        assert index.key({'summary': ' EXAMPLE.com ', 'type': 'Host'}) == ('Host', 'example.com')
+        assert index.key({'summary': 'A1B2 : C3D4', 'type': 'File'}) == ('File', 'a1b2 : c3d4')
+        assert index.key({'summary': 'http://Example.com/Path', 'type': 'URL'}) == (
+            'URL',
+            'http://Example.com/Path',
+        )
+
+    @staticmethod
+    def test_dedup_index_merge():
+        """Test list fields are combined without duplicates."""
+        index = DedupIndex()
+        primary = {
+            'summary': '1.1.1.1',
+            'type': 'Address',
+            'xid': 'xid-1',
+            'attribute': [{'type': 'Description', 'value': 'one'}],
+            'tag': [{'name': 'pytest'}],
+        }
+        duplicate = {
+            'summary': '1.1.1.1',
+            'type': 'Address',
+            'xid': 'xid-2',
+            'rating': 3.0,
+            'associatedGroups': [{'groupXid': 'group-1'}],
+            'attribute': [
+                {'type': 'Description', 'value': 'one'},
+                {'type': 'Description', 'value': 'two'},
+            ],
+            'securityLabel': [{'name': 'TLP:WHITE'}],
+            'tag': [{'name': 'pytest'}, {'name': 'feed'}],
+        }
+        merged = index.merge(primary, duplicate)
+
+        assert index.merge_count == 1
+        assert merged.get('xid') == 'xid-1'
+        assert merged.get('rating') == 3.0
+        assert merged.get('associatedGroups') == [{'groupXid': 'group-1'}]
+        assert [a.get('value') for a in merged.get('attribute')] == ['one', 'two']
+        assert merged.get('securityLabel') == [{'name': 'TLP:WHITE'}]
+        assert [t.get('name') for t in merged.get('tag')] == ['pytest', 'feed']
+
+    @staticmethod
+    def test_dedup_index_merge_object():
+        """Test a duplicate is merged into an Indicator object in place."""
+        index = DedupIndex()
+        primary = Address('1.1.1.1', xid='xid-1')
+        primary.tag('pytest')
+        duplicate = {
+            'summary': '1.1.1.1',
+            'type': 'Address',
+            'xid': 'xid-2',
+            'rating': 3.0,
+            'associatedGroups': [{'groupXid': 'group-1'}],
+            'attribute': [{'type': 'Description', 'value': 'two'}],
+            'tag': [{'name': 'pytest'}, {'name': 'feed'}],
+        }
+
+        assert index.merge(primary, duplicate) is primary
+        # tags added to the object after the merge are still submitted
+        primary.tag('later')
+
+        data = primary.data
+        assert data.get('xid') == 'xid-1'
+        assert data.get('rating') == 3.0
+        assert data.get('associatedGroups') == [{'groupXid': 'group-1'}]
+        assert [a.get('value') for a in data.get('attribute')] == ['two']
+        assert [t.get('name') for t in data.get('tag')] == ['pytest', 'feed', 'later']
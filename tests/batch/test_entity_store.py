@@ -0,0 +1,147 @@
+"""Test the TcEx Batch Entity Store Module."""
+# standard library
+import os
+import shelve
+
+# first-party
+from tcex.batch.entity_store import EntityStore
+from tcex.batch.group import Document
+from tcex.batch.indicator import File
+
+
+class TestEntityStore:
+    """Test the TcEx Batch Entity Store Module."""
+
+    @staticmethod
+    def test_entity_store_mapping(tmp_path):
+        """Test get, set, contains, len, and delete of entities."""
+        store = EntityStore(os.path.join(tmp_path, 'indicators'), high_water_mark=2)
+        store['xid-1'] = {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'xid-1'}
+        store['xid-2'] = {'summary': '1.1.1.2', 'type': 'Address', 'xid': 'xid-2'}
+        store['xid-3'] = {'summary': '1.1.1.3', 'type': 'Address', 'xid': 'xid-3'}
+        # replace an existing (flushed) entity
+        store['xid-1'] = {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'xid-1', 'rating': 5}
+
+        assert len(store) == 3
+        assert 'xid-2' in store
+        assert 'xid-4' not in store
+        assert store.get('xid-1').get('rating') == 5
+        assert store.get('xid-4') is None
+
+        del store['xid-2']
+        assert len(store) == 2
+        assert 'xid-2' not in store
+        store.delete()
+        assert not os.path.isfile(store.fqfn)
+
+    @staticmethod
+    def test_entity_store_iterate_delete(tmp_path):
+        """Test ordered iteration while deleting entities."""
+        store = EntityStore(os.path.join(tmp_path, 'groups'), page_size=3)
+        for i in range(10):
+            store[f'xid-{i}'] = {'name': f'group-{i}', 'type': 'Adversary', 'xid': f'xid-{i}'}
+
+        xids = []
+        for xid, group_data in store.items():
+            assert group_data.get('xid') == xid
+            xids.append(xid)
+            del store[xid]
+
+        assert xids == [f'xid-{i}' for i in range(10)]
+        assert len(store) == 0
+        store.close()
+
+    @staticmethod
+    def test_entity_store_update_keeps_position(tmp_path):
+        """Test updating an entity while iterating doesn't move it to the end."""
+        store = EntityStore(os.path.join(tmp_path, 'groups'), high_water_mark=1, page_size=2)
+        for i in range(5):
+            store[f'xid-{i}'] = {'name': f'group-{i}', 'xid': f'xid-{i}'}
+
+        xids = []
+        for xid, group_data in store.items():
+            xids.append(xid)
+            # e.g., merging a duplicate into the shelved primary
+            store['xid-0'] = {**store['xid-0'], 'merged': xid}
+            assert group_data.get('xid') == xid
+
+        assert xids == [f'xid-{i}' for i in range(5)]
+        assert store['xid-0']['merged'] == 'xid-4'
+        assert len(store) == 5
+        store.close()
+
+    @staticmethod
+    def test_entity_store_objects(tmp_path):
+        """Test group and indicator objects are restored from the minimal pickled state."""
+        store = EntityStore(os.path.join(tmp_path, 'entities'), high_water_mark=1)
+        ti = File(sha256='a' * 64, xid='file-1', rating=3)
+        ti.occurrence('drop.exe', '/tmp', '2020-01-01')
+        ti.attribute('Description', 'spilled', displayed=True, source='feed')
+        ti.attribute('Source', '')  # invalid attributes are kept, but not in the data
+        ti.security_label('TLP:GREEN', color='00ff00')
+        tag = ti.tag('spilled')
+        ti_data = ti.data
+        store['file-1'] = ti
+
+        group = Document('document-1', 'document.txt', file_content='content', xid='document-1')
+        group.tag('spilled')
+        group.processed = True
+        store['document-1'] = group
+
+        store.flush()
+        restored = store.get('file-1')
+        assert restored is not ti
+        assert restored.data == ti_data
+        assert restored.tag('spilled') is tag  # tags are restored as the shared instance
+
+        restored = store.get('document-1')
+        assert restored.data == group.data
+        assert restored.file_data.get('fileContent') == 'content'
+        assert restored.processed is True
+        store.delete()
+
+    @staticmethod
+    def test_entity_store_reopen(tmp_path):
+        """Test reopening a previously saved store."""
+        fqfn = os.path.join(tmp_path, 'indicators-saved')
+        store = EntityStore(fqfn)
+        store['xid-1'] = {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'xid-1'}
+        store.close()
+
+        store = EntityStore(fqfn)
+        assert len(store) == 1
+        assert list(store.keys()) == ['xid-1']
+        store.delete()
+
+    @staticmethod
+    def test_entity_store_count(tmp_path):
+        """Test the count is loaded after pending writes, including replaced entities."""
+        store = EntityStore(os.path.join(tmp_path, 'indicators'), high_water_mark=2)
+        for i in range(5):
+            store[f'xid-{i}'] = {'summary': f'1.1.1.{i}', 'xid': f'xid-{i}'}
+        store['xid-0'] = {'summary': '1.1.1.0', 'xid': 'xid-0', 'rating': 5}
+
+        assert len(store) == 5
+        del store['xid-1']
+        assert len(store) == 4
+        store['xid-1'] = {'summary': '1.1.1.1', 'xid': 'xid-1'}
+        assert len(store) == 5
+        store.delete()
+
+    @staticmethod
+    def test_entity_store_shelve(tmp_path):
+        """Test a shelve file saved by an earlier version is imported."""
+        fqfn = os.path.join(tmp_path, 'groups-saved')
+        with shelve.open(fqfn) as shelf:
+            shelf['xid-1'] = {'name': 'pytest-1', 'xid': 'xid-1'}
+            shelf['xid-2'] = {'name': 'pytest-2', 'xid': 'xid-2'}
+
+        store = EntityStore(fqfn)
+        assert len(store) == 2
+        assert store.get('xid-2') == {'name': 'pytest-2', 'xid': 'xid-2'}
+        store.close()
+
+        # the store is only imported once
+        store = EntityStore(fqfn)
+        assert sorted(store.keys()) == ['xid-1', 'xid-2']
+        store.delete()
@@ -0,0 +1,57 @@
+"""Test the TcEx Batch Group Chunk Planner Module."""
+# first-party
+from tcex.batch.group_chunk_planner import GroupChunkPlanner
+
+
+class TestGroupChunkPlanner:
+    """Test the TcEx Batch Group Chunk Planner Module."""
+
+    @staticmethod
+    def test_group_chunk_planner_components():
+        """Test associated groups are planned into the same chunk."""
+        planner = GroupChunkPlanner(max_count=4, max_size=1_000)
+        planner.add('g-1', ['g-2'])
+        planner.add('g-2')
+        # association to a group that is added later
+        planner.add('g-3', ['g-5'])
+        planner.add('g-4')
+        planner.add('g-5', ['g-6'])
+        planner.add('g-6')
+
+        chunks = planner.plan({f'g-{i}': 10 for i in range(1, 7)})
+
+        # largest component first, only the open chunk is filled once a new chunk is started
+        assert chunks == [['g-3', 'g-5', 'g-6'], ['g-1', 'g-2', 'g-4']]
+
+    @staticmethod
+    def test_group_chunk_planner_limits():
+        """Test chunks are packed to the count and size limits."""
+        planner = GroupChunkPlanner(max_count=10, max_size=100)
+        sizes = {f'g-{i}': 30 for i in range(10)}
+        # a component larger than the limits is placed in a chunk of its own
+        planner.add('big-1', ['big-2'])
+        sizes.update({'big-1': 90, 'big-2': 90})
+
+        chunks = planner.plan(sizes)
+
+        assert chunks[0] == ['big-1', 'big-2']
+        assert [len(chunk) for chunk in chunks[1:]] == [3, 3, 3, 1]
+        # the layout is deterministic
+        assert planner.plan(sizes) == chunks
+
+    @staticmethod
+    def test_group_chunk_planner_remove():
+        """Test submitted groups are removed from the index."""
+        planner = GroupChunkPlanner(max_count=10, max_size=1_000)
+        planner.add('g-1', ['g-2', 'g-9'])
+        planner.add('g-2')
+        planner.add('g-3')
+
+        planner.remove('g-1')
+        planner.remove('g-missing')
+
+        assert planner.xids == ['g-2', 'g-3']
+        assert len(planner) == 2
+        # the association to the unknown group is dropped with the group
+        assert not planner._waiting  # pylint: disable=protected-access
+        assert planner.plan({'g-2': 10, 'g-3': 10}) == [['g-2', 'g-3']]
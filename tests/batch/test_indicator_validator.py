@@ -0,0 +1,83 @@
+"""Test the TcEx Batch Indicator Validator Module."""
+# first-party
+from tcex.batch.indicator_validator import IndicatorValidator
+
+INDICATOR_TYPES_DATA = {
+    'Address': {'name': 'Address', 'regex': r'^\d{1,3}(\.\d{1,3}){3}$'},
+    'File': {
+        'name': 'File',
+        'value1Label': 'MD5',
+        'value2Label': 'SHA1',
+        'value3Label': 'SHA256',
+        'regex1': '^[a-fA-F0-9]{32}$',
+        'regex2': '^[a-fA-F0-9]{40}$',
+        'regex3': '^[a-fA-F0-9]{64}$',
+    },
+    'Hashtag': {'name': 'Hashtag', 'value1Label': 'Hashtag', 'regex1': '^#[A-Za-z0-9_]+$'},
+    # unicode property classes are java only and the regex is skipped
+    'Mutex': {'name': 'Mutex', 'value1Label': 'Mutex', 'regex1': r'^\p{L}+$'},
+}
+
+
+class TestIndicatorValidator:
+    """Test the TcEx Batch Indicator Validator Module."""
+
+    @staticmethod
+    def test_indicator_validator():
+        """Test indicators are validated against the regexes of the indicator type."""
+        md5 = 'a' * 32
+        sha256 = 'b' * 64
+        indicators = [
+            {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i-1'},
+            {'summary': 'not-an-ip', 'type': 'Address', 'xid': 'i-2'},
+            {'summary': f'{md5} : {"c" * 40} : {sha256}', 'type': 'File', 'xid': 'i-3'},
+            # a partial file is matched against any of the file hash regexes
+            {'summary': sha256, 'type': 'File', 'xid': 'i-4'},
+            {'summary': f'{sha256} : {md5}', 'type': 'File', 'xid': 'i-5'},
+            {'summary': 'xyz', 'type': 'File', 'xid': 'i-6'},
+            {'summary': '#tcex', 'type': 'Hashtag', 'xid': 'i-7'},
+            {'summary': 'tcex', 'type': 'Hashtag', 'xid': 'i-8'},
+            {'summary': 'Global\\tcex', 'type': 'Mutex', 'xid': 'i-9'},
+            {'summary': 'tcex', 'type': 'Unknown', 'xid': 'i-10'},
+        ]
+
+        validator = IndicatorValidator(INDICATOR_TYPES_DATA)
+        reasons = validator.validate_many(indicators)
+        assert reasons == [
+            None,
+            'value1 does not match the indicator type regex',
+            None,
+            None,
+            None,
+            'value1 does not match the indicator type regex',
+            None,
+            'value1 does not match the indicator type regex',
+            None,
+            'unknown indicator type',
+        ]
+        assert validator.validate('File', f'{md5} : {md5} : {sha256}') == (
+            'value2 does not match the indicator type regex'
+        )
+        assert validator.skipped_patterns == {'Mutex': [r'^\p{L}+$']}
+
+    @staticmethod
+    def test_indicator_validator_report():
+        """Test invalid indicators are counted and quarantined."""
+        validator = IndicatorValidator(INDICATOR_TYPES_DATA)
+        indicator_data = {'summary': 'tcex', 'type': 'Hashtag', 'xid': 'i-1'}
+        reason = validator.validate('Hashtag', 'tcex')
+        validator.add('Hashtag', reason, 'i-1', indicator_data)
+        validator.add('Address', 'unknown indicator type', 'i-2')
+        validator.validate('Address', '1.1.1.1')
+
+        assert validator.invalid_count == 2
+        assert validator.quarantined == {'i-1': {'indicator': indicator_data, 'reason': reason}}
+        assert validator.report == {
+            'valid': 1,
+            'invalid': 2,
+            'quarantined': 1,
+            'types': {
+                'Address': {'unknown indicator type': 1},
+                'Hashtag': {'value1 does not match the indicator type regex': 1},
+            },
+        }
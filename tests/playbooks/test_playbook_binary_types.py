@@ -31,6 +31,25 @@ class TestUtils:
         tcex.playbook.delete(variable)
         assert tcex.playbook.read(variable) is None
 
+    def test_playbook_binary_file(self, tcex, tmp_path):
+        """Test creating a Binary variable from a file reference.
+
+        Args:
+            tcex (TcEx, fixture): An instantiated instance of TcEx object.
+            tmp_path (pathlib.Path, fixture): A temp directory.
+        """
+        variable = '#App:0002:b5!Binary'
+        value = bytes(range(256)) * 50_000
+        filename = tmp_path / 'binary.bin'
+        filename.write_bytes(value)
+
+        tcex.playbook.create_binary(variable, filename)
+        result = tcex.playbook.read_binary(variable)
+        assert result == value, 'result does not match the file content'
+
+        tcex.playbook.delete(variable)
+        assert tcex.playbook.read(variable) is None
+
     @pytest.mark.parametrize(
         'variable,value',
         [
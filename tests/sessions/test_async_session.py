@@ -0,0 +1,191 @@
+"""Test the TcEx Asyncio Session Module."""
+# standard library
+import asyncio
+import json
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# third-party
+import certifi
+import pytest
+from requests import exceptions
+
+# first-party
+from tcex.sessions import AsyncTcSession
+
+pytest.importorskip('aiohttp')
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Record the request and fail the first request for each path with a 502."""
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        paths = [r['path'] for r in self.requests]
+        self.requests.append({'path': self.path, 'headers': dict(self.headers)})
+
+        status = 200 if self.path in paths else 502
+        body = json.dumps({'status': 'Success'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Disable request logging."""
+
+
+class DisconnectHandler(BaseHTTPRequestHandler):
+    """Record the request and close the connection without sending a response."""
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST requests."""
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.requests.append({'path': self.path})
+        self.close_connection = True
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Disable request logging."""
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Record the request and delay the response to the first request for each path."""
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def _respond(self):
+        """Send the response, after a delay for the first request to the path."""
+        paths = [r['path'] for r in self.requests]
+        self.requests.append({'path': self.path})
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path not in paths:
+            time.sleep(1)
+
+        body = json.dumps({'status': 'Success'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        self._respond()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST requests."""
+        self._respond()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Disable request logging."""
+
+
+class TestAsyncSession:
+    """Test the TcEx Asyncio Session Module."""
+
+    @staticmethod
+    def test_async_session_hmac_retry():
+        """Test requests are signed with HMAC and retried on a 5xx status code."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), ApiHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        async def run():
+            async with AsyncTcSession(
+                'access-id', 'secret-key', f'http://127.0.0.1:{server.server_address[1]}'
+            ) as session:
+                session.retry(retries=2, backoff_factor=0)
+                return await asyncio.gather(
+                    *[session.get(f'/v2/indicators/{i}', params={'owner': 'Org'}) for i in range(5)]
+                )
+
+        try:
+            responses = asyncio.run(run())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert [r.status_code for r in responses] == [200] * 5
+        assert responses[0].json() == {'status': 'Success'}
+        assert b''.join(responses[0].iter_content(chunk_size=4)) == responses[0].content
+        # each request is retried once
+        assert len(ApiHandler.requests) == 10
+        for request in ApiHandler.requests:
+            assert request['path'].endswith('?owner=Org')
+            assert request['headers']['Authorization'].startswith('TC access-id:')
+            assert request['headers']['Timestamp'].isdigit()
+
+    @staticmethod
+    def test_async_session_post_not_retried():
+        """Test a POST is not sent again when the server disconnects after it was sent."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), DisconnectHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        async def run():
+            async with AsyncTcSession(
+                'access-id', 'secret-key', f'http://127.0.0.1:{server.server_address[1]}'
+            ) as session:
+                session.retry(retries=2, backoff_factor=0)
+                return await session.post('/v2/groups/adversaries', json={'name': 'pytest'})
+
+        try:
+            with pytest.raises(exceptions.ConnectionError):
+                asyncio.run(run())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert len(DisconnectHandler.requests) == 1
+
+    @staticmethod
+    def test_async_session_ssl_ca_bundle():
+        """Test a CA bundle path is loaded into a reused SSLContext."""
+        session = AsyncTcSession('access-id', 'secret-key', 'https://127.0.0.1')
+        assert session._ssl() is True  # pylint: disable=protected-access
+
+        session.verify = False
+        assert session._ssl() is False  # pylint: disable=protected-access
+
+        session.verify = certifi.where()
+        context = session._ssl()  # pylint: disable=protected-access
+        assert isinstance(context, ssl.SSLContext)
+        assert context.verify_mode == ssl.CERT_REQUIRED
+        assert session._ssl() is context  # pylint: disable=protected-access
+
+    @staticmethod
+    def test_async_session_timeout_retry():
+        """Test a read timeout is retried for a GET, but not for a POST."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        async def run():
+            async with AsyncTcSession(
+                'access-id', 'secret-key', f'http://127.0.0.1:{server.server_address[1]}'
+            ) as session:
+                session.retry(retries=2, backoff_factor=0)
+                response = await session.get('/v2/indicators', timeout=0.5)
+                with pytest.raises(exceptions.Timeout):
+                    await session.post('/v2/groups/adversaries', json={}, timeout=0.5)
+                return response
+
+        try:
+            response = asyncio.run(run())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response.status_code == 200
+        assert [r['path'] for r in SlowHandler.requests] == [
+            '/v2/indicators',
+            '/v2/indicators',
+            '/v2/groups/adversaries',
+        ]
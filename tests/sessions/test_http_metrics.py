@@ -0,0 +1,132 @@
+"""Test the TcEx Session HTTP Metrics Module."""
+# standard library
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# first-party
+from tcex.sessions import ExternalSession, HttpMetrics
+
+
+class RateLimitedHandler(BaseHTTPRequestHandler):
+    """Respond with a 429 to the first request for each path."""
+
+    protocol_version = 'HTTP/1.1'
+    paths = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        status = 200 if self.path in self.paths else 429
+        self.paths.append(self.path)
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Disable request logging."""
+
+
+class TestHttpMetrics:
+    """Test the TcEx Session HTTP Metrics Module."""
+
+    @staticmethod
+    def test_http_metrics_record():
+        """Test requests are aggregated by method and route."""
+        metrics = HttpMetrics()
+        metrics.record('get', 'https://api.example.com/v2/groups/documents/123', 0.004, 200)
+        metrics.record('GET', 'https://api.example.com/v2/groups/documents/456', 0.2, 200)
+        metrics.record('GET', 'https://api.example.com/v2/groups/documents/789', 3.0, 500)
+        metrics.record('POST', 'https://api.example.com/v2/groups/documents', 0.1, 201, 10, 20)
+
+        summary = metrics.summary()
+        assert [(r['method'], r['route']) for r in summary] == [
+            ('GET', 'api.example.com/v2/groups/documents/{id}'),
+            ('POST', 'api.example.com/v2/groups/documents'),
+        ]
+        documents = summary[0]
+        assert documents['count'] == 3
+        assert documents['errors'] == 1
+        assert documents['p50_ms'] == 250
+        assert documents['max_ms'] == 3000
+        assert documents['histogram'][5] == 1
+        assert summary[1]['bytes_sent'] == 10
+        assert summary[1]['bytes_received'] == 20
+
+    @staticmethod
+    def test_http_metrics_route():
+        """Test the object ids in a URL path are templated."""
+        metrics = HttpMetrics()
+        for url, route in [
+            (
+                'https://api.example.com/v2/indicators/addresses/1.1.1.1/tags',
+                '/addresses/{id}/tags',
+            ),
+            ('https://api.example.com/v2/indicators/files/' + 'a' * 32, '/files/{id}'),
+            (
+                'https://api.example.com/v2/indicators/emailAddresses/a%40b.com',
+                '/emailAddresses/{id}',
+            ),
+            ('https://api.example.com/v2/indicators/asns/ASN1234', '/v2/indicators/asns/{id}'),
+            ('https://api.example.com/v2/tags/malware?owner=Org', '/v2/tags/{name}'),
+            (
+                'https://api.example.com/v2/groups/adversaries/1/securityLabels/TLP%20RED',
+                '/v2/groups/adversaries/{id}/securityLabels/{name}',
+            ),
+            (
+                'https://api.example.com/v2/tags/APT/groups/adversaries',
+                '/v2/tags/{name}/groups/adversaries',
+            ),
+        ]:
+            assert metrics.route(url).endswith(route)
+
+        metrics = HttpMetrics(route_formatter=lambda path: '/custom' if 'tags' in path else None)
+        assert metrics.route('https://api.example.com/v2/tags/malware') == 'api.example.com/custom'
+        assert (
+            metrics.route('https://api.example.com/v2/owners/1') == 'api.example.com/v2/owners/{id}'
+        )
+
+    @staticmethod
+    def test_http_metrics_max_routes():
+        """Test new routes are recorded against the overflow route once max routes is reached."""
+        metrics = HttpMetrics(max_routes=2)
+        for name in ['documents', 'emails', 'incidents', 'reports']:
+            metrics.record('GET', f'https://api.example.com/v2/groups/{name}', 0.1, 200)
+        metrics.record_retry('GET', 'https://api.example.com/v2/groups/signatures', 0.5)
+        metrics.record('GET', 'https://api.example.com/v2/groups/documents', 0.1, 200)
+
+        routes = {r['route']: r for r in metrics.summary()}
+        assert sorted(routes) == [
+            'api.example.com/v2/groups/documents',
+            'api.example.com/v2/groups/emails',
+            '{other}',
+        ]
+        assert routes['api.example.com/v2/groups/documents']['count'] == 2
+        assert routes['{other}']['count'] == 2
+        assert routes['{other}']['retries'] == 1
+
+    @staticmethod
+    def test_http_metrics_session(caplog):
+        """Test the ExternalSession records each request and the 429 retries."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), RateLimitedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            session = ExternalSession()
+            for i in range(3):
+                assert session.get(f'http://127.0.0.1:{server.server_address[1]}/items/{i}').ok
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        summary = session.metrics.summary()
+        assert len(summary) == 1
+        assert summary[0]['route'].endswith('/items/{id}')
+        assert summary[0]['count'] == 6
+        assert summary[0]['status_429'] == 3
+        assert summary[0]['retries'] == 3
+        assert summary[0]['bytes_received'] == 12
+
+        with caplog.at_level(logging.INFO):
+            session.metrics.log_summary(logging.getLogger('test'))
+        assert 'feature=http-metrics, method=GET' in caplog.text
@@ -0,0 +1,89 @@
+"""Test the TcEx Session PoolAdapter Module."""
+# standard library
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# third-party
+from requests import Session
+
+# first-party
+from tcex.sessions import ExternalSession
+from tcex.sessions.pool_adapter import PoolAdapter
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Respond to each request after a short delay using HTTP/1.1 keep-alive."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        time.sleep(0.1)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Disable request logging."""
+
+
+class TestPoolAdapter:
+    """Test the TcEx Session PoolAdapter Module."""
+
+    @staticmethod
+    def _fetch_concurrently(adapter: PoolAdapter, threads: int = 8) -> list:
+        """Send concurrent requests through a session using the adapter (left open for stats)."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}/'
+        try:
+            session = Session()
+            session.mount('http://', adapter)
+            with ThreadPoolExecutor(threads) as executor:
+                responses = list(executor.map(lambda _: session.get(url), range(threads * 2)))
+        finally:
+            server.shutdown()
+            server.server_close()
+        return responses
+
+    def test_pool_block(self):
+        """Test a blocking pool caps the connections and tracks the waiting requests."""
+        adapter = PoolAdapter(pool_maxsize=2, pool_block=True)
+        responses = self._fetch_concurrently(adapter)
+        assert all(r.status_code == 200 for r in responses)
+
+        stats = adapter.pool_utilization[0]
+        assert stats['maxsize'] == 2
+        assert stats['in_use'] == 0
+        assert stats['idle'] == 2
+        assert stats['waiting'] == 0
+        assert stats['wait_count'] > 0
+        assert stats['discarded'] == 0
+
+    def test_pool_no_block(self):
+        """Test a non-blocking pool discards the connections beyond pool_maxsize."""
+        adapter = PoolAdapter(pool_maxsize=2)
+        responses = self._fetch_concurrently(adapter)
+        assert all(r.status_code == 200 for r in responses)
+
+        stats = adapter.pool_utilization[0]
+        assert stats['in_use'] == 0
+        assert stats['discarded'] > 0
+
+    @staticmethod
+    def test_pool_config_external_session():
+        """Test the pool config is applied to the ExternalSession adapter."""
+        session = ExternalSession(pool_config={'pool_maxsize': 25, 'tcp_keepalive': True})
+        adapter = session.get_adapter('https://')
+        assert isinstance(adapter, PoolAdapter)
+        assert adapter._pool_maxsize == 25  # pylint: disable=protected-access
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in adapter.socket_options
+        assert session.pool_utilization == []
+
+        # the pool settings are kept when the retry configuration is updated
+        session.retry(retries=5)
+        assert session.get_adapter('https://')._pool_maxsize == 25
@@ -0,0 +1,133 @@
+"""Test the TcEx Session ResponseCache Module."""
+# standard library
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# first-party
+from tcex.sessions import ExternalSession, ResponseCache
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Serve a feed with an ETag, failing after the first request to /error."""
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        body = f'feed {self.path}'.encode()
+        etag = f'"{self.path}"'
+        if self.path == '/error' and ('/error', None) in self.requests[:-1]:
+            self.send_response(503)
+            body = b''
+        elif self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            body = b''
+        else:
+            self.send_response(200)
+        if self.path == '/vary':
+            self.send_header('Vary', 'Accept')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Disable request logging."""
+
+
+class TestResponseCache:
+    """Test the TcEx Session ResponseCache Module."""
+
+    @staticmethod
+    def _get(cache: ResponseCache, paths: list, headers: list = None) -> list:
+        """Return the responses for the paths (sent with the headers) using the cache."""
+        FeedHandler.requests = []
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            session = ExternalSession()
+            session.response_cache = cache
+            return [
+                session.get(f'http://127.0.0.1:{server.server_address[1]}{path}', headers=h)
+                for path, h in zip(paths, headers or [None] * len(paths))
+            ]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_not_modified(self, tmp_path):
+        """Test the cached body is returned on a 304 response."""
+        cache = ResponseCache(str(tmp_path))
+        responses = self._get(cache, ['/feed', '/feed'])
+
+        assert FeedHandler.requests == [('/feed', None), ('/feed', '"/feed"')]
+        assert [r.status_code for r in responses] == [200, 200]
+        assert responses[1].content == b'feed /feed'
+        assert responses[1].from_cache is True
+        assert cache.stats['not_modified'] == 1
+
+        # the cached response can be iterated like a response from the server
+        assert list(responses[1].iter_lines()) == [b'feed /feed']
+        assert responses[1].raw.read() == b'feed /feed'
+
+        # the index is loaded from disk
+        assert ResponseCache(str(tmp_path)).stats['entries'] == 1
+
+    def test_policies(self, tmp_path):
+        """Test the per URL policies (max_age and stale_if_error)."""
+        cache = ResponseCache(
+            str(tmp_path),
+            policies={r'/fresh$': {'max_age': 60}, r'/error$': {'stale_if_error': 60}},
+        )
+        responses = self._get(cache, ['/fresh', '/fresh', '/error', '/error'])
+
+        # the fresh response is not revalidated and the stale response is returned on a 503
+        assert [p for p, _ in FeedHandler.requests] == ['/fresh', '/error', '/error']
+        assert [r.status_code for r in responses] == [200, 200, 200, 200]
+        assert responses[3].content == b'feed /error'
+        assert cache.stats['fresh_hits'] == 1
+        assert cache.stats['stale_hits'] == 1
+
+    def test_eviction(self, tmp_path):
+        """Test the least recently used entries are evicted."""
+        cache = ResponseCache(str(tmp_path), max_size=20)
+        self._get(cache, ['/a', '/b', '/a', '/c', '/a', '/b'])
+
+        # "feed /x" is 7 bytes, so /b is evicted when /c is stored and /c when /b is stored again
+        assert FeedHandler.requests[4:] == [('/a', '"/a"'), ('/b', None)]
+        assert cache.stats['evictions'] == 2
+        assert cache.stats['size'] == 14
+
+    def test_credentials(self, tmp_path):
+        """Test responses are not shared by requests with other credentials or Vary headers."""
+        cache = ResponseCache(str(tmp_path))
+        self._get(
+            cache,
+            ['/feed', '/feed', '/feed', '/vary', '/vary', '/vary'],
+            [
+                {'Authorization': 'Bearer 1'},
+                {'Authorization': 'Bearer 2'},
+                {'Authorization': 'Bearer 1'},
+                {'Accept': 'application/json'},
+                {'Accept': 'text/csv'},
+                {'Accept': 'text/csv'},
+            ],
+        )
+
+        assert FeedHandler.requests == [
+            ('/feed', None),
+            ('/feed', None),
+            ('/feed', '"/feed"'),
+            ('/vary', None),
+            ('/vary', None),
+            ('/vary', '"/vary"'),
+        ]
+
+        # the key includes the namespace and the credential headers and auth
+        key = cache.key('https://example.com/feed')
+        assert ResponseCache(str(tmp_path), namespace='app').key('https://example.com/feed') != key
+        assert cache.key('https://example.com/feed', {'X-Api-Key': 'key'}) != key
+        assert cache.key('https://example.com/feed', auth=('user', 'pass')) != key
+        assert cache.key('https://example.com/feed', {'Accept': 'text/csv'}) == key
@@ -0,0 +1,88 @@
+"""Test the TcEx Session RetryScheduler Module."""
+# standard library
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# first-party
+from tcex.sessions import ExternalSession
+from tcex.sessions.retry_scheduler import RetryScheduler
+
+
+class TooManyRequestsHandler(BaseHTTPRequestHandler):
+    """Respond with a 429 to every request."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        self.send_response(429)
+        self.send_header('Content-Length', '2')
+        self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(b'no')
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Disable request logging."""
+
+
+class TestRetryScheduler:
+    """Test the TcEx Session RetryScheduler Module."""
+
+    @staticmethod
+    def test_cooldown():
+        """Test a cooldown is shared by all schedulers and waited for."""
+        RetryScheduler.cooldown('cooldown.example.com', 0.1)
+        scheduler = RetryScheduler(jitter=0)
+        assert RetryScheduler().cooldown_remaining('cooldown.example.com') > 0
+
+        start = time.monotonic()
+        waited = scheduler.wait_for_cooldown('cooldown.example.com')
+        assert 0.05 < waited <= 0.1
+        assert time.monotonic() - start >= waited
+        assert scheduler.cooldown_remaining('cooldown.example.com') == 0
+        assert scheduler.wait_for_cooldown('cooldown.example.com') == 0
+        assert scheduler.stats['cooldown_wait_count'] == 1
+
+    @staticmethod
+    def test_schedule():
+        """Test the retry delays and the budget."""
+        scheduler = RetryScheduler(max_retries=3, base_delay=1, max_delay=5, deadline=20)
+
+        # the first retry uses the Retry-After value with a spread of up to 10%
+        assert 10 <= scheduler.schedule(0, 10, 0, 0) <= 11
+
+        # further retries use decorrelated jitter, but not less than the Retry-After value
+        delay = scheduler.schedule(1, 0, 2, 0)
+        assert 1 <= delay <= 5
+        assert scheduler.schedule(1, 8, 2, 0) >= 8
+
+        # no retry past the deadline or max_retries
+        assert scheduler.schedule(1, 10, 2, 15) is None
+        assert scheduler.schedule(3, 0, 2, 0) is None
+
+        stats = scheduler.stats
+        assert stats['retries'] == 3
+        assert stats['budget_exhausted'] == 2
+
+    @staticmethod
+    def test_session_retries():
+        """Test the ExternalSession retries a 429 until the budget is exhausted."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), TooManyRequestsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            session = ExternalSession()
+            session.too_many_requests_config(max_retries=2, base_delay=0.01, max_delay=0.02)
+            response = session.get(f'http://127.0.0.1:{server.server_address[1]}/items/1')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response.status_code == 429
+        assert session.retry_scheduler.stats['retries'] == 2
+        assert session.retry_scheduler.stats['budget_exhausted'] == 1
+
+        summary = session.metrics.summary()
+        assert summary[0]['count'] == 3
+        assert summary[0]['retries'] == 2
+        assert summary[0]['retry_wait_ms'] > 0
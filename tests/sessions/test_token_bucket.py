@@ -0,0 +1,98 @@
+"""Test the TcEx Session TokenBucket Module."""
+# standard library
+import threading
+import time
+from unittest.mock import MagicMock, PropertyMock, patch
+
+# third-party
+from requests import PreparedRequest, Response
+
+# first-party
+from tcex.sessions.token_bucket import TokenBucket, TokenBucketRateLimitHandler
+
+
+class TestTokenBucket:
+    """Test the TcEx Session TokenBucket Module."""
+
+    @staticmethod
+    def _response(url: str, headers: dict) -> Response:
+        """Return a Response for a request to the url with the headers."""
+        request = PreparedRequest()
+        request.prepare(method='GET', url=url)
+        response = Response()
+        type(response).ok = PropertyMock(True)
+        response.headers = headers
+        response.request = request
+        return response
+
+    @staticmethod
+    def test_fifo_pacing():
+        """Test concurrent waiters are released in order at the bucket rate."""
+        bucket = TokenBucket(rate=50, capacity=1)
+        released = []
+
+        def worker(index: int):
+            bucket.acquire()
+            released.append((index, time.monotonic()))
+
+        start = time.monotonic()
+        threads = []
+        for index in range(5):
+            thread = threading.Thread(target=worker, args=(index,))
+            thread.start()
+            threads.append(thread)
+            # give each thread time to make its reservation
+            time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+
+        assert [i for i, _ in released] == [0, 1, 2, 3, 4]
+        # the first token is available immediately, the next 4 are paced at 20ms
+        assert released[-1][1] - start >= 0.075
+        assert bucket.stats['wait_count'] == 4
+        assert bucket.stats['waiting'] == 0
+
+    @staticmethod
+    def test_pause():
+        """Test a paused bucket reserves tokens after the pause."""
+        bucket = TokenBucket(rate=10, capacity=5)
+        bucket.pause(2)
+        assert 2.09 < bucket.reserve() < 2.11
+        assert 2.19 < bucket.reserve() < 2.21
+
+    @staticmethod
+    def test_shared():
+        """Test the same bucket is returned for the same key."""
+        bucket = TokenBucket.shared('test-shared', rate=3)
+        assert TokenBucket.shared('test-shared', rate=100) is bucket
+        assert bucket.rate == 3
+        assert TokenBucket.shared('test-shared-other') is not bucket
+
+    def test_handler_learns_rate(self):
+        """Test the handler learns the rate from the rate limit headers."""
+        handler = TokenBucketRateLimitHandler(key='test-learn', rate=1, capacity=10)
+        response = self._response(
+            'https://api.example.com/v1/test',
+            {'X-RateLimit-Remaining': '100', 'X-RateLimit-Reset': '20'},
+        )
+        handler.post_send(response)
+
+        bucket = handler.bucket(response.request)
+        assert bucket.rate == 5
+        assert bucket.stats['tokens'] <= 10
+        assert handler.last_limit_remaining_value == 100
+
+    @patch('time.sleep', MagicMock(return_value=None))
+    def test_handler_shared_by_host(self):
+        """Test handlers without a key share a bucket per host and pause on exhaustion."""
+        handler_1 = TokenBucketRateLimitHandler()
+        handler_2 = TokenBucketRateLimitHandler()
+        response = self._response(
+            'https://shared.example.com/v1/test',
+            {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '30'},
+        )
+        handler_1.post_send(response)
+
+        assert handler_2.bucket(response.request) is handler_1.bucket(response.request)
+        handler_2.pre_send(response.request)
+        assert time.sleep.call_args[0][0] >= 30  # pylint: disable=no-member
@@ -0,0 +1,84 @@
+"""Test the TcEx Threat Intel Asyncio Module."""
+# standard library
+import asyncio
+import json
+
+# third-party
+from requests import PreparedRequest, Response
+
+# first-party
+from tcex.threat_intelligence.async_tcex_ti_tc_request import AsyncTiTcRequest
+
+
+class AsyncSession:
+    """An in-memory AsyncTcSession returning pages of tags."""
+
+    def __init__(self, tags: list):
+        """Initialize Class properties."""
+        self.requests = []
+        self.tags = tags
+
+    async def request(self, method: str, url: str, params: dict = None, **kwargs) -> Response:
+        """Return a page of tags or a status response."""
+        await asyncio.sleep(0)
+        params = dict(params or {})
+        self.requests.append((method, url, params, kwargs))
+
+        data = {}
+        if url.endswith('/tags') or '/tags/' in url:
+            start = params.get('resultStart', 0)
+            data = {'tag': self.tags[start : start + params.get('resultLimit', 10_000)]}
+
+        request = PreparedRequest()
+        request.prepare(method=method, url=f'https://api.example.com{url}', params=params)
+        response = Response()
+        response._content = json.dumps({'status': 'Success', 'data': data}).encode()
+        response.request = request
+        response.status_code = 200
+        response.url = request.url
+        return response
+
+
+class TestAsyncTiTcRequest:
+    """Test the TcEx Threat Intel Asyncio Module."""
+
+    @staticmethod
+    def test_async_ti_tc_request_pagination():
+        """Test methods that yield entities are async generators over all pages."""
+        tags = [{'name': f'tag-{i}'} for i in range(5)]
+        session = AsyncSession(tags)
+        ti_requests = AsyncTiTcRequest(session)
+        ti_requests.result_limit = 2
+
+        async def collect(iterator):
+            return [t async for t in iterator]
+
+        results = asyncio.run(collect(ti_requests.tags('indicators', 'addresses', '1.1.1.1')))
+        assert results == tags
+        assert [r[2]['resultStart'] for r in session.requests] == [0, 2, 4]
+        assert session.requests[0][1] == '/v2/indicators/addresses/1.1.1.1/tags'
+
+    @staticmethod
+    def test_async_ti_tc_request_responses():
+        """Test methods that return a Response are coroutines."""
+        session = AsyncSession([])
+        ti_requests = AsyncTiTcRequest(session)
+
+        async def run():
+            return await asyncio.gather(
+                ti_requests.single('indicators', 'addresses', '1.1.1.1', owner='Org'),
+                ti_requests.add_tag('indicators', 'addresses', '1.1.1.1', 'tag-1'),
+                ti_requests.owners('indicators', 'addresses', '1.1.1.1'),
+                ti_requests.set_whois('indicators', 'hosts', 'example.com', True),
+            )
+
+        responses = asyncio.run(run())
+        assert all(r.ok for r in responses)
+        assert [(r[0], r[1]) for r in session.requests] == [
+            ('GET', '/v2/indicators/addresses/1.1.1.1'),
+            ('POST', '/v2/indicators/addresses/1.1.1.1/tags/tag-1'),
+            ('GET', '/v2/indicators/addresses/1.1.1.1/owners'),
+            ('PUT', '/v2/indicators/hosts/example.com'),
+        ]
+        assert session.requests[0][2] == {'owner': 'Org', 'createActivityLog': 'false'}
+        assert session.requests[3][3] == {'json': {'whoisActive': True}}
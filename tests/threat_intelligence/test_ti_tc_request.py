@@ -0,0 +1,99 @@
+"""Test the TcEx Threat Intel TiTcRequest Module."""
+# standard library
+import json
+import random
+import threading
+import time
+
+# third-party
+from requests import PreparedRequest, Response
+
+# first-party
+from tcex.threat_intelligence.tcex_ti_tc_request import TiTcRequest
+
+
+class PagedSession:
+    """An in-memory TcSession returning pages of indicators with a resultCount."""
+
+    def __init__(self, indicators: list, added: list = None):
+        """Initialize Class properties."""
+        self.added = added or []
+        self.indicators = indicators
+        self.lock = threading.Lock()
+        self.starts = []
+
+    def get(self, url: str, params: dict = None) -> Response:
+        """Return a page of indicators after a random delay (so pages complete out of order)."""
+        time.sleep(random.uniform(0, 0.01))  # nosec
+        start = params.get('resultStart', 0)
+        with self.lock:
+            self.starts.append(start)
+            # indicators added after the first page was fetched
+            indicators = self.indicators + (self.added if len(self.starts) > 1 else [])
+
+        data = {
+            'resultCount': len(indicators),
+            'indicator': indicators[start : start + params.get('resultLimit', 10_000)],
+        }
+        request = PreparedRequest()
+        request.prepare(method='GET', url=f'https://api.example.com{url}', params=params)
+        response = Response()
+        response._content = json.dumps({'status': 'Success', 'data': data}).encode()
+        response.request = request
+        response.status_code = 200
+        response.url = request.url
+        return response
+
+
+class TestTiTcRequest:
+    """Test the TcEx Threat Intel TiTcRequest Module."""
+
+    @staticmethod
+    def test_iterate_parallel():
+        """Test the pages are fetched concurrently and yielded in order."""
+        indicators = [{'id': i} for i in range(95)]
+        session = PagedSession(indicators)
+        ti_requests = TiTcRequest(session, page_workers=4)
+        ti_requests.result_limit = 10
+
+        results = list(ti_requests._iterate('/v2/indicators', {}, 'indicator'))
+        assert results == indicators
+        assert sorted(session.starts) == list(range(0, 100, 10))
+
+    @staticmethod
+    def test_iterate_parallel_added():
+        """Test the pagination continues when entities are added during the pagination."""
+        indicators = [{'id': i} for i in range(20)]
+        added = [{'id': i} for i in range(20, 25)]
+        session = PagedSession(indicators, added)
+        ti_requests = TiTcRequest(session, page_workers=4)
+        ti_requests.result_limit = 10
+
+        results = list(ti_requests._iterate('/v2/indicators', {}, 'indicator'))
+        assert results == indicators + added
+        assert sorted(session.starts) == [0, 10, 20]
+
+    @staticmethod
+    def test_iterate_parallel_close():
+        """Test the pending pages are cancelled when the consumer stops iterating."""
+        indicators = [{'id': i} for i in range(1000)]
+        session = PagedSession(indicators)
+        ti_requests = TiTcRequest(session, page_workers=2)
+        ti_requests.result_limit = 10
+
+        iterator = ti_requests._iterate('/v2/indicators', {}, 'indicator')
+        assert [next(iterator) for _ in range(15)] == indicators[:15]
+        iterator.close()
+        # the first page and at most 2x page_workers pages ahead
+        assert len(session.starts) <= 6
+
+    @staticmethod
+    def test_iterate_sequential():
+        """Test the pages are fetched one at a time by default."""
+        indicators = [{'id': i} for i in range(25)]
+        session = PagedSession(indicators)
+        ti_requests = TiTcRequest(session)
+        ti_requests.result_limit = 10
+
+        assert list(ti_requests._iterate('/v2/indicators', {}, 'indicator')) == indicators
+        assert session.starts == [0, 10, 20]